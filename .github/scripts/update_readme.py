@@ -6,22 +6,17 @@ This script is meant to be run by GitHub Actions when txt files change.
 
 import os
 import subprocess
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
 
-# Map of file names to provider names
-PROVIDER_MAP = {
-    'openai.txt': 'OpenAI',
-    'anthropic.txt': 'Anthropic',
-    'gemini.txt': 'Gemini',
-    'grok.txt': 'Grok',
-    'mistral.txt': 'Mistral',
-    'deepseek.txt': 'DeepSeek',
-    'kimi.txt': 'Kimi',
-    'qwen.txt': 'Qwen',
-    'meta.txt': 'Meta',
-    'nvidia.txt': 'NVIDIA',
-    'zai.txt': 'Z.AI'
-}
+# The provider registry lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from provider_registry import list_providers
+
+# Map of file names to provider names, in README order
+PROVIDER_MAP = {provider.output_file: provider.display_name for provider in list_providers()}
 
 UPDATE_WINDOW_DAYS = 7
 
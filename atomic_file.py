@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Atomic file replacement shared by every writer of tracked or scraped files.
+
+Model lists, metadata, the JSON stores under ``evals/`` and the Prometheus
+textfile are all read by something else while a run may be rewriting them
+(git, the README workflow, node_exporter), so they are written to a temp
+file in the same directory and renamed over the target: readers see the
+old file or the new one, never a partial write.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from tracing import span
+
+
+def atomic_write(file_path, content: bytes) -> bool:
+    """Write bytes via temp file + rename so readers never see a partial file.
+
+    Returns False (and leaves the file untouched) when the content is
+    byte-identical to what is already on disk.
+    """
+    file_path = Path(file_path)
+    with span('write', file=file_path.name):
+        if file_path.exists() and file_path.read_bytes() == content:
+            return False
+
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return True
+
+
+def write_json(path, data) -> bool:
+    """Atomically replace ``path`` with ``data`` as stable, diff-friendly JSON."""
+    return atomic_write(path, (json.dumps(data, indent=2, sort_keys=True) + '\n').encode())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Backfill evaluations for listed models that have no eval file.
+
+Models added before evaluation existed, or whose evaluation crashed, are in
+the provider ``.txt`` files but have no ``evals/eval-<safe_name>.txt``. This
+script indexes the eval directory once, computes the missing set, records
+skips for non-chat models, and queues the rest in ``eval_queue`` in priority
+order (newest first when metadata has a created date). The queue is then
+drained through the rate-limited ``eval_engine`` with progress and ETA.
+
+With ``--shard i/N`` only this host's share of the missing models is handled
+(see ``sharding``); merge the hosts' ``evals/`` afterwards with
+``python sharding.py merge``.
+
+Usage:
+    python backfill.py [--dry-run] [--provider NAME] [--limit N] [--concurrency N]
+                       [--no-link] [--fingerprints] [--shard i/N]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import eval_queue
+import metrics
+import tracing
+from evaluate_model import EVAL_DIR, eval_filename, link_evaluation, skip_evaluation
+from model_classifier import EVAL_SKIP, classify_model
+from model_identity import IdentityIndex, link_deferred
+from model_metadata import read_metadata_file
+from provider_registry import list_providers
+from sharding import in_shard, parse_shard
+
+MODELS_DIR = Path(__file__).parent
+
+# Queue priority for backfill jobs sits below fresh nightly models (0 and up
+# are reserved for them) so a backfill never starves new-model evaluation.
+BACKFILL_PRIORITY_BASE = -1_000_000
+
+
+def index_eval_files(eval_dir=EVAL_DIR) -> set:
+    """Filenames present in the eval directory."""
+    if not eval_dir.exists():
+        return set()
+    return {path.name for path in eval_dir.iterdir() if path.is_file()}
+
+
+def read_listed_models(output_file) -> list:
+    """Models listed in a provider ``.txt`` file, in file order."""
+    file_path = MODELS_DIR / output_file
+    if not file_path.exists():
+        return []
+    with open(file_path, 'r') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def find_missing(providers=None, eval_dir=EVAL_DIR) -> list:
+    """Return ``[(chat_provider, model, record), ...]`` lacking an eval file.
+
+    ``record`` is the model's captured metadata (or None). Models listed by
+    several providers are reported once.
+    """
+    evaluated = index_eval_files(eval_dir)
+    missing, seen = [], set()
+    for provider in providers or list_providers():
+        metadata = read_metadata_file(provider.output_file)
+        for model in read_listed_models(provider.output_file):
+            filename = eval_filename(model)
+            if filename in evaluated or filename in seen:
+                continue
+            seen.add(filename)
+            missing.append((provider.chat_provider, model, metadata.get(model)))
+    return missing
+
+
+def prioritize(missing: list) -> list:
+    """Order missing models: known-newest first, then registry/file order."""
+    def created(entry):
+        return (entry[2] or {}).get('created')
+
+    dated = sorted((e for e in missing if created(e)), key=created, reverse=True)
+    undated = [e for e in missing if not created(e)]
+    return dated + undated
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
+def progress_reporter(total: int):
+    """Return a ``progress(provider, model)`` callback printing rate and ETA."""
+    start = time.time()
+    done = [0]
+
+    def report(provider, model):
+        done[0] += 1
+        elapsed = time.time() - start
+        rate = done[0] / elapsed if elapsed > 0 else 0
+        eta = (total - done[0]) / rate if rate else 0
+        print(f"[{done[0]}/{total}] {provider}/{model} "
+              f"({rate * 60:.1f}/min, elapsed {format_duration(elapsed)}, ETA {format_duration(eta)})")
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate listed models that have no eval file")
+    parser.add_argument('--dry-run', action='store_true', help="list what would be evaluated")
+    parser.add_argument('--provider', action='append', help="limit to these providers (repeatable)")
+    parser.add_argument('--limit', type=int, help="evaluate at most N models")
+    parser.add_argument('--concurrency', type=int, help="max evaluations in flight")
+    parser.add_argument('--no-link', action='store_true',
+                        help="evaluate aliases of already evaluated models instead of linking them")
+    parser.add_argument('--fingerprints', action='store_true',
+                        help="also treat models with identical stored responses as aliases")
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help="only handle shard i of N (stable hash of provider/model)")
+    args = parser.parse_args()
+
+    providers = [p for p in list_providers() if not args.provider or p.name in args.provider]
+    identity = None if args.no_link else IdentityIndex.build(fingerprints=args.fingerprints)
+
+    def shard_key(provider, model):
+        # Aliases share a shard so they can still be linked to one evaluation
+        return identity.group(model) if identity else f"{provider}/{model}"
+
+    missing = [entry for entry in prioritize(find_missing(providers))
+               if in_shard(shard_key(entry[0], entry[1]), args.shard)]
+    jobs, skipped, linked = [], 0, 0
+    for chat_provider, model, record in missing:
+        eval_type, reason = classify_model(model, record)
+        if eval_type == EVAL_SKIP:
+            skipped += 1
+            if not args.dry_run:
+                skip_evaluation(chat_provider, model, reason)
+            continue
+        if identity is not None:
+            found = identity.representative(model)
+            if found:
+                linked += 1
+                if not args.dry_run:
+                    link_evaluation(chat_provider, model, *found)
+                continue
+            if not identity.claim(chat_provider, model):
+                continue
+        jobs.append((chat_provider, model))
+    if args.limit is not None:
+        jobs = jobs[:args.limit]
+
+    deferred = len(identity.deferred) if identity else 0
+    if args.shard:
+        print(f"Shard {args.shard[0]}/{args.shard[1]}")
+    print(f"{len(missing)} model(s) without an eval file: "
+          f"{len(jobs)} to evaluate, {skipped} skipped as non-chat, "
+          f"{linked} linked to an alias, {deferred} waiting on an alias")
+    if args.dry_run:
+        for provider, model in jobs:
+            print(f"  {provider}/{model}")
+        return
+
+    conn = eval_queue.connect()
+    # Descending priorities preserve the order above when leasing; force
+    # re-queues jobs marked done whose eval file has since gone missing.
+    for index, job in enumerate(jobs):
+        eval_queue.enqueue(conn, [job], priority=BACKFILL_PRIORITY_BASE + len(jobs) - index,
+                           force=True)
+
+    pending = eval_queue.counts(conn).get('pending', 0)
+    result = eval_queue.drain(conn, concurrency=args.concurrency,
+                              progress=progress_reporter(pending))
+    print(f"Queue: {result}")
+    if identity is not None:
+        link_deferred(identity, conn)
+    tracing.finish()
+    metrics.write_textfile(job='backfill')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Endpoint format probing for providers that expose several chat APIs.
+
+OpenAI serves models through Chat Completions, Responses and the legacy
+Completions API, and ``evaluate_model.resolve_openai_provider`` can only
+guess which one a new model accepts from its name. When the guess is wrong
+the API answers HTTP 400/404 with an "unsupported endpoint" style message
+(``is_unsupported_endpoint``); the evaluation then retries with the
+provider's other registry entries (``chat.alternatives`` in
+``providers.json``) and remembers the one that worked, per model and model
+family, in ``evals/endpoint_formats.json``. Later runs try the remembered
+endpoint first.
+"""
+
+import re
+from pathlib import Path
+
+from fallback_memory import ModelMemory
+from provider_registry import chat_parent, get_provider
+
+STORE_FILE = Path(__file__).parent / "evals" / "endpoint_formats.json"
+
+# "Right model, wrong endpoint" -- as opposed to an unknown model, which
+# the same status codes also report
+UNSUPPORTED_ENDPOINT = re.compile(
+    r"not supported in the v1/|only supported in v1/|did you mean to use v1/"
+    r"|not a chat model|is a chat model|unsupported endpoint"
+    r"|not supported (?:by|on|with) (?:this|the \S+) (?:endpoint|api)",
+    re.IGNORECASE)
+
+FORMATS = ModelMemory(STORE_FILE)
+
+
+def is_unsupported_endpoint(error: str) -> bool:
+    """True when an API error says the model needs a different endpoint."""
+    return bool(error) and error.startswith(('HTTP 400', 'HTTP 404')) \
+        and bool(UNSUPPORTED_ENDPOINT.search(error))
+
+
+def candidates(provider: str, model: str, guess: str = None) -> list:
+    """
+    Registry entries to evaluate ``model`` through, best first: the endpoint
+    remembered for it, then ``guess``, then ``provider`` and its alternatives.
+    """
+    entry = get_provider(provider)
+    options = [provider] + list(entry.chat_alternatives if entry else ())
+    preferred = [FORMATS.lookup(provider, model), guess]
+    return list(dict.fromkeys(name for name in preferred + options if name in options))
+
+
+
+def queue_provider(provider: str) -> str:
+    """
+    The provider an eval through ``provider`` was queued and listed under:
+    ``openai_responses`` -> ``openai``. Eval files record the endpoint used.
+    """
+    return chat_parent(provider)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Concurrent evaluation engine.
+
+Runs many ``evaluate_model.run_evaluation_async`` calls in one process over a
+shared aiohttp session. Jobs are queued per provider and drained by that
+provider's own pool of workers (sized from ``concurrency`` in
+``providers.json``), so a slow provider never blocks the others; a global
+semaphore caps total in-flight evaluations, which bounds memory and open
+connections regardless of batch size.
+
+Usage:
+    python eval_engine.py <provider> <model> [<provider> <model> ...]
+"""
+
+import asyncio
+import sys
+from collections import defaultdict, deque
+
+import aiohttp
+
+from evaluate_model import run_evaluation_async
+from provider_registry import get_provider
+from rate_limit import key_usage_lines
+from tracing import span
+
+# Total evaluations in flight across all providers
+DEFAULT_CONCURRENCY = 16
+
+
+def provider_limit(provider: str) -> int:
+    """
+    Max concurrent evaluations for a provider: its registry ``concurrency``
+    per configured API key.
+    """
+    entry = get_provider(provider)
+    return max(entry.concurrency, 1) * max(len(entry.api_keys()), 1) if entry else 1
+
+
+async def evaluate_job(session, provider: str, model: str) -> tuple:
+    """Evaluate one job; returns ``(results, None)``, or ``(None, error)`` if it raised."""
+    try:
+        with span('eval', provider=provider, model=model):
+            return await run_evaluation_async(provider, model, session), None
+    except Exception as e:
+        print(f"    Error evaluating {model}: {e}")
+        return None, e
+
+
+async def run_evaluations(jobs, concurrency: int = DEFAULT_CONCURRENCY,
+                          on_result=None, on_error=None, collect: bool = True) -> list:
+    """
+    Evaluate ``(provider, model)`` jobs concurrently.
+
+    Returns the ``run_evaluation`` result dicts in completion order when
+    ``collect`` is true. ``on_result(provider, model, results)`` is called as
+    each evaluation finishes; pass ``collect=False`` with a callback to stream
+    results without keeping them in memory. Failures are printed and passed
+    to ``on_error(provider, model, error)``, then skipped.
+    """
+    queues = defaultdict(deque)
+    for provider, model in jobs:
+        queues[provider].append(model)
+
+    in_flight = asyncio.Semaphore(concurrency)
+    collected = []
+
+    async def worker(session, provider, queue):
+        # Workers of one provider share its deque; the event loop is
+        # single-threaded so each model is handed out exactly once.
+        while queue:
+            model = queue.popleft()
+            async with in_flight:
+                results, error = await evaluate_job(session, provider, model)
+            if error is not None:
+                if on_error:
+                    on_error(provider, model, error)
+                continue
+            if on_result:
+                on_result(provider, model, results)
+            if collect:
+                collected.append(results)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*(
+            worker(session, provider, queue)
+            for provider, queue in queues.items()
+            for _ in range(min(provider_limit(provider), len(queue)))
+        ))
+
+    for line in key_usage_lines():
+        print(line)
+    return collected
+
+
+def run_evaluations_sync(jobs, **kwargs) -> list:
+    """Synchronous wrapper around ``run_evaluations``."""
+    return asyncio.run(run_evaluations(jobs, **kwargs))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args or len(args) % 2:
+        print("Usage: python eval_engine.py <provider> <model> [<provider> <model> ...]")
+        sys.exit(1)
+    pairs = list(zip(args[::2], args[1::2]))
+    for results in run_evaluations_sync(pairs):
+        print(f"{results['provider']}/{results['model']}: "
+              f"path_valid={results['path_valid']} sum_matches={results['sum_matches']}")
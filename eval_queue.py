@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Persistent queue of pending model evaluations.
+
+New models are enqueued before they are evaluated, so a run that dies
+mid-evaluation leaves its unfinished jobs in ``eval_queue.sqlite3`` and the
+next run (or any other worker) picks them up. Jobs move through:
+
+    pending -> leased -> done
+                      -> pending  (retryable failure, attempts left)
+                      -> failed   (out of attempts)
+
+A lease has an expiry; a job whose worker crashed becomes leasable again
+once its lease lapses, or failed if it has no attempts left. Leasing happens inside ``BEGIN IMMEDIATE`` so several
+worker processes can drain the same queue in parallel. A job sent back to
+pending is not leasable before its ``not_before`` time, which backs off
+exponentially per attempt, so a rate-limited provider is not hit again
+straight away.
+
+Usage:
+    python eval_queue.py status
+    python eval_queue.py enqueue <provider> <model>
+    python eval_queue.py work [--concurrency N] [--worker-id ID]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+
+import aiohttp
+
+import metrics
+import tracing
+from eval_engine import DEFAULT_CONCURRENCY, evaluate_job, provider_limit
+from rate_limit import key_usage_lines
+
+MODELS_DIR = Path(__file__).parent
+QUEUE_FILE = MODELS_DIR / "eval_queue.sqlite3"
+
+# Long enough to cover three 300s fallback tiers plus execution
+DEFAULT_LEASE_SECONDS = 1800
+DEFAULT_MAX_ATTEMPTS = 3
+# Delay before a failed job's next attempt, doubled for each attempt made
+RETRY_BACKOFF_SECONDS = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    provider      TEXT NOT NULL,
+    model         TEXT NOT NULL,
+    state         TEXT NOT NULL DEFAULT 'pending',
+    priority      INTEGER NOT NULL DEFAULT 0,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL DEFAULT 3,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    not_before    REAL,
+    last_error    TEXT,
+    created_at    REAL NOT NULL,
+    updated_at    REAL NOT NULL,
+    PRIMARY KEY (provider, model)
+);
+CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, priority DESC, created_at);
+"""
+
+# api_error prefixes worth another attempt (transient provider trouble)
+RETRYABLE_ERRORS = ('Request timed out', 'HTTP 429', 'HTTP 500', 'HTTP 502',
+                    'HTTP 503', 'HTTP 504', 'JSON decode error', 'Cannot connect')
+
+
+def connect(path=QUEUE_FILE) -> sqlite3.Connection:
+    """Open (and create if needed) the queue database."""
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(SCHEMA)
+    columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+    if 'not_before' not in columns:
+        # Queues created before retry backoff
+        conn.execute('ALTER TABLE jobs ADD COLUMN not_before REAL')
+    return conn
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(conn, jobs, priority: int = 0, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+            force: bool = False) -> int:
+    """Add ``(provider, model)`` jobs; returns how many were newly queued.
+
+    Existing jobs are left alone unless ``force`` is set, which resets done
+    or failed jobs back to pending.
+    """
+    now = time.time()
+    added = 0
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        for provider, model in jobs:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO jobs (provider, model, priority, max_attempts, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (provider, model, priority, max_attempts, now, now))
+            if cursor.rowcount:
+                added += 1
+            elif force:
+                conn.execute(
+                    "UPDATE jobs SET state = 'pending', attempts = 0, lease_owner = NULL, "
+                    "lease_expires = NULL, not_before = NULL, priority = ?, updated_at = ? "
+                    "WHERE provider = ? AND model = ? AND state IN ('done', 'failed')",
+                    (priority, now, provider, model))
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    return added
+
+
+def lease(conn, worker_id: str, limit: int = 1,
+          lease_seconds: int = DEFAULT_LEASE_SECONDS, exclude=()) -> list:
+    """Atomically claim up to ``limit`` jobs; returns ``[(provider, model), ...]``.
+
+    Pending jobs past their ``not_before`` time and jobs whose lease has
+    expired are eligible, highest priority first, then oldest. Jobs for the
+    providers in ``exclude`` are left alone. An expired lease counts as a
+    failed attempt: a job that keeps killing its worker is moved to failed
+    once it is out of attempts instead of being retried forever.
+    """
+    now = time.time()
+    exclude = list(exclude)
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.execute(
+            "UPDATE jobs SET state = 'failed', lease_owner = NULL, lease_expires = NULL, "
+            "last_error = 'Lease expired (worker died?)', updated_at = ? "
+            "WHERE state = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+            (now, now))
+        rows = conn.execute(
+            "SELECT provider, model FROM jobs "
+            "WHERE ((state = 'pending' AND (not_before IS NULL OR not_before <= ?)) "
+            "OR (state = 'leased' AND lease_expires < ? AND attempts < max_attempts)) "
+            f"AND provider NOT IN ({', '.join('?' * len(exclude))}) "
+            "ORDER BY priority DESC, created_at LIMIT ?",
+            (now, now, *exclude, limit)).fetchall()
+        for row in rows:
+            conn.execute(
+                "UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE provider = ? AND model = ?",
+                (worker_id, now + lease_seconds, now, row['provider'], row['model']))
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    return [(row['provider'], row['model']) for row in rows]
+
+
+def complete(conn, provider: str, model: str, worker_id: str) -> bool:
+    """Mark a leased job done. Returns False if the lease was lost."""
+    cursor = conn.execute(
+        "UPDATE jobs SET state = 'done', lease_owner = NULL, lease_expires = NULL, "
+        "last_error = NULL, updated_at = ? "
+        "WHERE provider = ? AND model = ? AND state = 'leased' AND lease_owner = ?",
+        (time.time(), provider, model, worker_id))
+    return bool(cursor.rowcount)
+
+
+def fail(conn, provider: str, model: str, worker_id: str, error: str, backoff: float = None) -> str:
+    """Record a failed attempt; returns the job's new state.
+
+    The job goes back to pending while attempts remain, else to failed. A
+    retried job waits ``backoff`` (default ``RETRY_BACKOFF_SECONDS``)
+    seconds, doubled for each earlier attempt, before it can be leased again.
+    """
+    backoff = RETRY_BACKOFF_SECONDS if backoff is None else backoff
+    now = time.time()
+    conn.execute(
+        "UPDATE jobs SET state = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+        "not_before = ? + ? * (1 << MAX(attempts - 1, 0)), "
+        "lease_owner = NULL, lease_expires = NULL, last_error = ?, updated_at = ? "
+        "WHERE provider = ? AND model = ? AND state = 'leased' AND lease_owner = ?",
+        (now, backoff, str(error)[:500], now, provider, model, worker_id))
+    row = conn.execute('SELECT state FROM jobs WHERE provider = ? AND model = ?',
+                       (provider, model)).fetchone()
+    return row['state'] if row else None
+
+
+def mark_done(conn, jobs) -> int:
+    """Mark ``(provider, model)`` jobs evaluated elsewhere (e.g. on another
+    shard) as done, unless a worker holds them. Returns how many changed."""
+    changed = 0
+    for provider, model in jobs:
+        cursor = conn.execute(
+            "UPDATE jobs SET state = 'done', last_error = NULL, updated_at = ? "
+            "WHERE provider = ? AND model = ? AND state IN ('pending', 'failed')",
+            (time.time(), provider, model))
+        changed += cursor.rowcount
+    return changed
+
+
+def next_retry_in(conn) -> float:
+    """Seconds until the next backed-off job becomes leasable, or None."""
+    now = time.time()
+    row = conn.execute("SELECT MIN(not_before) AS at FROM jobs "
+                       "WHERE state = 'pending' AND not_before > ?", (now,)).fetchone()
+    return None if row['at'] is None else row['at'] - now
+
+
+def counts(conn) -> dict:
+    """Number of jobs in each state."""
+    return {row['state']: row['n'] for row in
+            conn.execute('SELECT state, COUNT(*) AS n FROM jobs GROUP BY state')}
+
+
+def is_retryable(results: dict) -> bool:
+    """True when an evaluation ended on a transient API error."""
+    error = results.get('api_error') or ''
+    return error.startswith(RETRYABLE_ERRORS)
+
+
+def drain(conn=None, worker_id=None, concurrency: int = None,
+          lease_seconds: int = DEFAULT_LEASE_SECONDS, progress=None) -> dict:
+    """Lease and evaluate jobs until the queue has nothing left to lease.
+
+    Jobs are leased one at a time whenever fewer than ``concurrency`` are in
+    flight (and their provider is below ``eval_engine.provider_limit``), so
+    one slow evaluation never holds up the rest. Retried jobs that are
+    still backing off are waited for. ``progress(provider, model)`` is
+    called after each finished job. Returns the final state counts.
+    """
+    conn = conn or connect()
+    worker_id = worker_id or default_worker_id()
+    concurrency = concurrency or DEFAULT_CONCURRENCY
+
+    def on_result(provider, model, results):
+        if is_retryable(results):
+            state = fail(conn, provider, model, worker_id, results['api_error'])
+            if state == 'pending':
+                metrics.EVAL_REQUEUES.inc(provider=provider)
+            print(f"    {provider}/{model}: transient error, job now {state}")
+        else:
+            complete(conn, provider, model, worker_id)
+
+    def on_error(provider, model, error):
+        fail(conn, provider, model, worker_id, error)
+
+    async def run():
+        in_flight = {}
+        busy = Counter()
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            while True:
+                while len(in_flight) < concurrency:
+                    full = [provider for provider, n in busy.items() if n >= provider_limit(provider)]
+                    jobs = lease(conn, worker_id, lease_seconds=lease_seconds, exclude=full)
+                    if not jobs:
+                        break
+                    provider, model = jobs[0]
+                    print(f"Leased {provider}/{model} as {worker_id}")
+                    busy[provider] += 1
+                    in_flight[asyncio.ensure_future(evaluate_job(session, provider, model))] = jobs[0]
+
+                wait = next_retry_in(conn)
+                if not in_flight:
+                    if wait is None:
+                        break
+                    await asyncio.sleep(wait)
+                    continue
+                done, _ = await asyncio.wait(in_flight, timeout=wait,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider, model = in_flight.pop(task)
+                    busy[provider] -= 1
+                    results, error = task.result()
+                    if error is not None:
+                        on_error(provider, model, error)
+                    else:
+                        on_result(provider, model, results)
+                    if progress:
+                        progress(provider, model)
+
+    asyncio.run(run())
+    for line in key_usage_lines():
+        print(line)
+    return counts(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Persistent evaluation job queue")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('status', help="show job counts per state")
+    enqueue_cmd = sub.add_parser('enqueue', help="queue a model for evaluation")
+    enqueue_cmd.add_argument('provider')
+    enqueue_cmd.add_argument('model')
+    enqueue_cmd.add_argument('--force', action='store_true', help="re-queue even if done")
+    work_cmd = sub.add_parser('work', help="drain the queue")
+    work_cmd.add_argument('--concurrency', type=int)
+    work_cmd.add_argument('--worker-id')
+    args = parser.parse_args()
+
+    conn = connect()
+    if args.command == 'enqueue':
+        added = enqueue(conn, [(args.provider, args.model)], force=args.force)
+        print(f"Queued {added} new job(s)")
+    elif args.command == 'work':
+        drain(conn, args.worker_id, args.concurrency)
+        tracing.finish()
+        metrics.write_textfile(job='eval_queue')
+    print(counts(conn))
+
+
+if __name__ == "__main__":
+    main()
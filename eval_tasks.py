@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Registry of evaluation tasks.
+
+A ``Task`` bundles everything needed to evaluate one algorithmic problem:
+the prompt, the entry-point function the model must define, the test cases
+(argument tuples, generated deterministically), a reference solution, a
+validator, and optional perf-scaling inputs whose run time is measured but
+not scored. ``evaluate_model`` runs every selected task against a model
+concurrently and reports a per-task score plus the mean across tasks.
+
+``solve_grid`` is the original (and default) task; further tasks are opted
+into with ``MODELS_EVAL_TASKS`` (comma-separated names) so the nightly run
+does not multiply its API spend by accident.
+"""
+
+import os
+import random
+from functools import lru_cache
+
+# Every prompt opens the same way so the Anthropic refusal fallback in
+# evaluate_model can reword it.
+PROMPT_OPENING = "Write a Python function with this exact signature:\n\n"
+PROMPT_CLOSING = "Reply with the complete solution in a single ```python code block."
+
+DEFAULT_TASKS = ('solve_grid',)
+
+
+class Task:
+    """One evaluation task; see the module docstring for the fields."""
+
+    __slots__ = ('name', 'entry_point', 'prompt', 'cases', 'reference', 'validate', 'perf_inputs')
+
+    def __init__(self, name, entry_point, prompt, cases, reference, validate, perf_inputs=None):
+        self.name = name
+        self.entry_point = entry_point
+        self.prompt = prompt
+        self.cases = cases
+        self.reference = reference
+        self.validate = validate
+        self.perf_inputs = perf_inputs or (lambda: [])
+
+    def __repr__(self):
+        return f"Task({self.name!r})"
+
+
+_TASKS = {}
+
+
+def register(task: Task) -> Task:
+    _TASKS[task.name] = task
+    return task
+
+
+def get_task(name: str) -> Task:
+    return _TASKS.get(name)
+
+
+def list_tasks() -> list:
+    return list(_TASKS.values())
+
+
+def selected_tasks() -> list:
+    """Tasks to run, from ``MODELS_EVAL_TASKS`` (default: ``solve_grid``)."""
+    names = [n.strip() for n in os.getenv('MODELS_EVAL_TASKS', '').split(',') if n.strip()]
+    tasks = [_TASKS[name] for name in names or DEFAULT_TASKS if name in _TASKS]
+    return tasks or [_TASKS[name] for name in DEFAULT_TASKS]
+
+
+def _random_grid(rng, n: int) -> list:
+    return [[rng.randint(0, 99) for _ in range(n)] for _ in range(n)]
+
+
+# --- solve_grid --------------------------------------------------------------
+
+# The evaluation prompt - a complex algorithmic challenge
+EVAL_PROMPT = PROMPT_OPENING + """def solve_grid(grid: list[list[int]]) -> tuple[int, str]:
+
+The function finds the path from top-left to bottom-right of an N×N
+grid that maximizes the sum. Rules:
+- Valid moves: right (R), down (D), diagonal down-right (X)
+- Every 3rd move (3, 6, 9...) MUST be diagonal if possible from current position
+- If diagonal is not possible on a required diagonal move, you may use R or D
+- Return (max_sum, path_string) e.g., (73, "RRXDDX")
+
+""" + PROMPT_CLOSING
+
+# Test grid for verification
+TEST_GRID = [
+    [1,  2,  3,  4],
+    [5,  6,  7,  8],
+    [9,  10, 11, 12],
+    [13, 14, 15, 16]
+]
+
+
+def solve_grid_reference(grid: list[list[int]]) -> tuple[int, str]:
+    """Reference solution: DP over (row, col, moves made mod 3)."""
+    n = len(grid)
+    steps = {'R': (0, 1), 'D': (1, 0), 'X': (1, 1)}
+
+    @lru_cache(maxsize=None)
+    def best(row, col, made):
+        if row == n - 1 and col == n - 1:
+            return 0, ''
+        diag_possible = row + 1 < n and col + 1 < n
+        moves = 'X' if (made + 1) % 3 == 0 and diag_possible else 'RDX'
+        options = []
+        for move in moves:
+            dr, dc = steps[move]
+            if row + dr < n and col + dc < n:
+                rest, path = best(row + dr, col + dc, (made + 1) % 3)
+                options.append((grid[row + dr][col + dc] + rest, move + path))
+        return max(options)
+
+    total, path = best(0, 0, 0)
+    best.cache_clear()
+    return grid[0][0] + total, path
+
+
+def validate_path(grid: list[list[int]], path: str) -> tuple[bool, int, str]:
+    """
+    Validate a path through the grid.
+    Returns (is_valid, calculated_sum, error_message).
+    """
+    n = len(grid)
+    row, col = 0, 0
+    total = grid[0][0]
+    move_count = 0
+
+    for i, move in enumerate(path):
+        move_count += 1
+        is_third_move = (move_count % 3 == 0)
+
+        # Calculate next position
+        if move == 'R':
+            new_row, new_col = row, col + 1
+        elif move == 'D':
+            new_row, new_col = row + 1, col
+        elif move == 'X':
+            new_row, new_col = row + 1, col + 1
+        else:
+            return False, total, f"Invalid move character: {move}"
+
+        # Check bounds
+        if new_row >= n or new_col >= n:
+            return False, total, f"Move {move} at step {i+1} goes out of bounds"
+
+        # Check 3rd move rule
+        if is_third_move:
+            # Check if diagonal was possible
+            diag_possible = (row + 1 < n and col + 1 < n)
+            if diag_possible and move != 'X':
+                return False, total, f"Move {move_count} must be diagonal (X) but was {move}"
+
+        row, col = new_row, new_col
+        total += grid[row][col]
+
+    # Check if we reached the end
+    if row != n - 1 or col != n - 1:
+        return False, total, f"Path ended at ({row}, {col}) instead of ({n-1}, {n-1})"
+
+    return True, total, None
+
+
+def solve_grid_cases() -> list:
+    rng = random.Random(7)
+    return [(TEST_GRID,)] + [(_random_grid(rng, n),) for n in (5, 6, 8)]
+
+
+def solve_grid_perf_inputs() -> list:
+    rng = random.Random(11)
+    return [(_random_grid(rng, n),) for n in (20, 50, 100)]
+
+
+def validate_solve_grid(args, result) -> tuple[bool, dict]:
+    """A case passes when the path is legal and the returned sum is its sum.
+
+    This matches the original single-grid check (optimality is not
+    required), so scores stay comparable with earlier evaluations.
+    """
+    grid, = args
+    detail = {'returned_sum': None, 'calculated_sum': None, 'sum_matches': False,
+              'path_valid': False, 'path_error': None}
+    if not (isinstance(result, (list, tuple)) and len(result) == 2):
+        detail['path_error'] = "Result is not a (sum, path) pair"
+        return False, detail
+    returned_sum, path = result
+    detail['returned_sum'] = returned_sum
+    if not isinstance(path, str):
+        detail['path_error'] = "Path is not a string"
+        return False, detail
+    is_valid, calc_sum, path_error = validate_path(grid, path)
+    detail.update(path_valid=is_valid, path_error=path_error, calculated_sum=calc_sum,
+                  sum_matches=(returned_sum == calc_sum))
+    return is_valid and detail['sum_matches'], detail
+
+
+register(Task(
+    name='solve_grid',
+    entry_point='solve_grid',
+    prompt=EVAL_PROMPT,
+    cases=solve_grid_cases,
+    reference=solve_grid_reference,
+    validate=validate_solve_grid,
+    perf_inputs=solve_grid_perf_inputs,
+))
+
+
+# --- edit_distance -----------------------------------------------------------
+
+EDIT_DISTANCE_PROMPT = PROMPT_OPENING + """def edit_distance(a: str, b: str) -> int:
+
+Return the minimum number of single-character insertions, deletions and
+substitutions needed to turn string a into string b.
+
+""" + PROMPT_CLOSING
+
+
+def edit_distance_reference(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def _random_word(rng, length: int) -> str:
+    return ''.join(rng.choice('acgt') for _ in range(length))
+
+
+def edit_distance_cases() -> list:
+    rng = random.Random(3)
+    fixed = [('kitten', 'sitting'), ('', 'abc'), ('same', 'same')]
+    return fixed + [(_random_word(rng, n), _random_word(rng, n + 3)) for n in (8, 20)]
+
+
+def edit_distance_perf_inputs() -> list:
+    rng = random.Random(5)
+    return [(_random_word(rng, n), _random_word(rng, n)) for n in (200, 800, 2000)]
+
+
+def validate_edit_distance(args, result) -> tuple[bool, dict]:
+    expected = edit_distance_reference(*args)
+    return result == expected, {'expected': expected, 'returned': result}
+
+
+register(Task(
+    name='edit_distance',
+    entry_point='edit_distance',
+    prompt=EDIT_DISTANCE_PROMPT,
+    cases=edit_distance_cases,
+    reference=edit_distance_reference,
+    validate=validate_edit_distance,
+    perf_inputs=edit_distance_perf_inputs,
+))
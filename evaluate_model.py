@@ -2,45 +2,40 @@
 """
 Model evaluation module.
 Runs a coding challenge prompt on new models and records results.
+
+Network calls and code execution are asyncio-based (aiohttp and asyncio
+subprocesses) so ``eval_engine`` can run many evaluations in one process;
+the plain functions (``call_model``, ``execute_code``, ``evaluate_model``,
+``run_evaluation``) are synchronous wrappers around their ``*_async`` twins.
 """
 
 import os
 import re
+import json
 import time
-import subprocess
-import tempfile
-import requests
+import asyncio
+import aiohttp
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
 from datetime import datetime, timezone
 from pathlib import Path
 from dotenv import load_dotenv
+import endpoint_probe
+import fallback_memory
+import latency_stats
+import metrics
+from eval_tasks import EVAL_PROMPT, TEST_GRID, selected_tasks, validate_path
+from provider_registry import get_provider
+import sandbox
+from rate_limit import report, throttle
+from static_checks import analyze, format_report
+from tracing import span
 
 load_dotenv()
 
 MODELS_DIR = Path(__file__).parent
 EVAL_DIR = MODELS_DIR / "evals"
 
-# The evaluation prompt - a complex algorithmic challenge
-EVAL_PROMPT = """Write a Python function with this exact signature:
-
-def solve_grid(grid: list[list[int]]) -> tuple[int, str]:
-
-The function finds the path from top-left to bottom-right of an N×N
-grid that maximizes the sum. Rules:
-- Valid moves: right (R), down (D), diagonal down-right (X)
-- Every 3rd move (3, 6, 9...) MUST be diagonal if possible from current position
-- If diagonal is not possible on a required diagonal move, you may use R or D
-- Return (max_sum, path_string) e.g., (73, "RRXDDX")
-
-Reply with the complete solution in a single ```python code block."""
-
-# Test grid for verification
-TEST_GRID = [
-    [1,  2,  3,  4],
-    [5,  6,  7,  8],
-    [9,  10, 11, 12],
-    [13, 14, 15, 16]
-]
-
 # Some Anthropic models (e.g. claude-fable-5) trip the server-side refusal
 # classifier on the bare eval prompt. Reframing the request via the system
 # field as an explicit benchmark reliably bypasses the classifier without
@@ -66,108 +61,29 @@ ANTHROPIC_REFUSAL_PROMPT_OPENING_REPLACEMENT = (
 
 
 def get_chat_endpoint(provider: str) -> dict:
-    """Get the chat completions endpoint config for a provider."""
-    endpoints = {
-        'openai': {
-            'url': 'https://api.openai.com/v1/chat/completions',
-            'headers': lambda: {
-                'Authorization': f"Bearer {os.getenv('OPENAI_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            'format': 'openai'
-        },
-        'openai_completion': {
-            'url': 'https://api.openai.com/v1/completions',
-            'headers': lambda: {
-                'Authorization': f"Bearer {os.getenv('OPENAI_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            'format': 'openai_completion'
-        },
-        'openai_responses': {
-            'url': 'https://api.openai.com/v1/responses',
-            'headers': lambda: {
-                'Authorization': f"Bearer {os.getenv('OPENAI_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            'format': 'openai_responses'
-        },
-        'anthropic': {
-            'url': 'https://api.anthropic.com/v1/messages',
-            'headers': lambda: {
-                'x-api-key': os.getenv('ANTHROPIC_API_KEY'),
-                'anthropic-version': '2023-06-01',
-                'Content-Type': 'application/json'
-            },
-            'format': 'anthropic'
-        },
-        'gemini': {
-            'url': lambda model: f"https://generativelanguage.googleapis.com/v1beta/models/{model.removeprefix('models/')}:generateContent?key={os.getenv('GEMINI_API_KEY')}",
-            'headers': lambda: {'Content-Type': 'application/json'},
-            'format': 'gemini'
-        },
-        'grok': {
-            'url': 'https://api.x.ai/v1/responses',
-            'headers': lambda: {
-                'Authorization': f"Bearer {os.getenv('GROK_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            'format': 'openai_responses'
-        },
-        'meta': {
-            'url': 'https://api.meta.ai/v1/responses',
-            'headers': lambda: {
-                'Authorization': f"Bearer {os.getenv('MODEL_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            'format': 'openai_responses'
-        },
-        'mistral': {
-            'url': 'https://api.mistral.ai/v1/chat/completions',
-            'headers': lambda: {
-                'Authorization': f"Bearer {os.getenv('MISTRAL_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            'format': 'openai'
-        },
-        'deepseek': {
-            'url': 'https://api.deepseek.com/chat/completions',
-            'headers': lambda: {
-                'Authorization': f"Bearer {os.getenv('DEEPSEEK_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            'format': 'openai'
-        },
-        'kimi': {
-            'url': 'https://api.moonshot.ai/v1/chat/completions',
-            'headers': lambda: {
-                'Authorization': f"Bearer {os.getenv('MOONSHOT_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            'format': 'openai'
-        },
-        'qwen': {
-            'url': 'https://dashscope-intl.aliyuncs.com/compatible-mode/v1/chat/completions',
-            'headers': lambda: {
-                'Authorization': f"Bearer {os.getenv('DASHSCOPE_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            'format': 'openai'
-        },
-        'openrouter': {
-            'url': 'https://openrouter.ai/api/v1/chat/completions',
-            'headers': lambda: {
-                'Authorization': f"Bearer {os.getenv('OPENROUTER_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            'format': 'openai'
-        }
-    }
-    return endpoints.get(provider)
+    """Get the chat completions endpoint config for a provider.
+
+    Endpoints come from the provider registry (``providers.json``) and are
+    built once per provider, so repeated lookups are cheap.
+    """
+    entry = get_provider(provider)
+    return entry.chat_endpoint() if entry else None
+
+
+# Reasoning levels for build_request_body: OpenAI-style formats send the
+# level as reasoning effort, Anthropic and Gemini as a thinking token budget.
+REASONING_LEVELS = ('low', 'medium', 'high')
+THINKING_BUDGETS = {'low': 2048, 'medium': 8192, 'high': 24576}
+REASONING_FORMATS = ('openai', 'openai_responses', 'anthropic', 'gemini')
 
 
-def build_request_body(provider: str, model: str, prompt: str) -> dict:
-    """Build the request body for a chat completion."""
+def build_request_body(provider: str, model: str, prompt: str, reasoning: str = None) -> dict:
+    """Build the request body for a chat completion.
+
+    ``reasoning`` (one of ``REASONING_LEVELS``) sets the reasoning effort or
+    thinking budget; None leaves the provider default. Formats outside
+    ``REASONING_FORMATS`` ignore it.
+    """
     endpoint = get_chat_endpoint(provider)
     if not endpoint:
         return None
@@ -175,11 +91,14 @@ def build_request_body(provider: str, model: str, prompt: str) -> dict:
     fmt = endpoint['format']
 
     if fmt == 'openai':
-        return {
+        body = {
             'model': model,
             'messages': [{'role': 'user', 'content': prompt}],
             'max_tokens': 32768  # Higher limit for reasoning models
         }
+        if reasoning:
+            body['reasoning_effort'] = reasoning
+        return body
     elif fmt == 'openai_completion':
         return {
             'model': model,
@@ -187,20 +106,29 @@ def build_request_body(provider: str, model: str, prompt: str) -> dict:
             'max_tokens': 32768
         }
     elif fmt == 'openai_responses':
-        return {
+        body = {
             'model': model,
             'input': [{'role': 'user', 'content': prompt}]
         }
+        if reasoning:
+            body['reasoning'] = {'effort': reasoning}
+        return body
     elif fmt == 'anthropic':
-        return {
+        body = {
             'model': model,
             'messages': [{'role': 'user', 'content': prompt}],
             'max_tokens': 32768
         }
+        if reasoning:
+            body['thinking'] = {'type': 'enabled', 'budget_tokens': THINKING_BUDGETS[reasoning]}
+        return body
     elif fmt == 'gemini':
-        return {
+        body = {
             'contents': [{'parts': [{'text': prompt}]}]
         }
+        if reasoning:
+            body['generationConfig'] = {'thinkingConfig': {'thinkingBudget': THINKING_BUDGETS[reasoning]}}
+        return body
     return None
 
 
@@ -265,46 +193,119 @@ def extract_response_text(provider: str, response_json: dict) -> str:
     return None
 
 
-def _post_and_extract(url: str, headers: dict, body: dict,
-                       provider: str) -> tuple[str, float, str, str]:
+def extract_usage(provider: str, response_json: dict) -> dict:
+    """
+    Token counts from provider-specific JSON as ``{'input_tokens',
+    'output_tokens', 'reasoning_tokens'}`` (missing counts are None).
+    """
+    endpoint = get_chat_endpoint(provider)
+    fmt = endpoint['format'] if endpoint else None
+    if fmt == 'gemini':
+        usage = response_json.get('usageMetadata') or {}
+        return {'input_tokens': usage.get('promptTokenCount'),
+                'output_tokens': usage.get('candidatesTokenCount'),
+                'reasoning_tokens': usage.get('thoughtsTokenCount')}
+
+    usage = response_json.get('usage') or {}
+    if fmt in ('openai', 'openai_completion'):
+        details = usage.get('completion_tokens_details') or {}
+        return {'input_tokens': usage.get('prompt_tokens'),
+                'output_tokens': usage.get('completion_tokens'),
+                'reasoning_tokens': details.get('reasoning_tokens')}
+    details = usage.get('output_tokens_details') or {}
+    # Anthropic counts thinking as output and does not break it out
+    return {'input_tokens': usage.get('input_tokens'),
+            'output_tokens': usage.get('output_tokens'),
+            'reasoning_tokens': details.get('reasoning_tokens')}
+
+
+# Per-request budget without latency history (see latency_stats); also
+# bounds how long one evaluation holds a slot
+REQUEST_TIMEOUT = latency_stats.CEILING
+TIMEOUT_ERROR = "Request timed out"
+
+# Stream eval calls and hang up once a complete solution has arrived
+# (formats without a stream parser below always wait for the full body).
+EARLY_STOP = os.getenv('MODELS_EVAL_EARLY_STOP', '').lower() in ('1', 'true', 'yes')
+STREAMING_FORMATS = ('openai', 'anthropic')
+
+# Providers whose eval calls are hedged: a duplicate request goes out once
+# the first has run longer than the provider's p95 latency ("*" = all).
+HEDGE_PROVIDERS = {name.strip() for name in os.getenv('MODELS_EVAL_HEDGE', '').split(',') if name.strip()}
+HEDGE_PERCENTILE = 95
+
+
+@asynccontextmanager
+async def client_session(session=None):
+    """Yield ``session``, or a fresh ``aiohttp.ClientSession`` closed on exit."""
+    if session is not None:
+        yield session
+        return
+    async with aiohttp.ClientSession() as new_session:
+        yield new_session
+
+
+def client_timeout(budget: dict = None) -> aiohttp.ClientTimeout:
+    """aiohttp timeout for a ``latency_stats.timeout_for`` budget."""
+    budget = budget or {'connect': latency_stats.CONNECT_TIMEOUT, 'read': REQUEST_TIMEOUT}
+    return aiohttp.ClientTimeout(total=budget['connect'] + budget['read'],
+                                 sock_connect=budget['connect'], sock_read=budget['read'])
+
+
+async def _post_and_extract_async(session, url: str, headers: dict, body: dict, provider: str,
+                                  timeout: dict = None, usage: dict = None) -> tuple[str, float, str, str]:
     """
     Issue a single POST and extract text. Returns
     (text, elapsed, error, stop_reason). stop_reason is the raw provider
-    value when present, else None.
+    value when present, else None. ``timeout`` is a connect/read budget
+    (see ``client_timeout``); ``usage``, if given, is filled with the
+    response's token counts (``extract_usage``).
 
     Retries once on transient JSON-decode failures (some providers
     occasionally return a truncated body under load).
     """
     start_time = time.time()
 
-    def _attempt():
+    async def _attempt():
         """Returns (text, error, stop_reason, retryable)."""
         try:
-            response = requests.post(url, headers=headers, json=body, timeout=300)
-        except requests.exceptions.Timeout:
-            return None, "Request timed out (5 min)", None, False
+            async with session.post(url, headers=headers, json=body,
+                                    timeout=client_timeout(timeout)) as response:
+                status = response.status
+                raw = await response.text()
+        except asyncio.TimeoutError:
+            metrics.HTTP_RESPONSES.inc(phase='eval', provider=provider, code='timeout')
+            return None, f"{TIMEOUT_ERROR} ({client_timeout(timeout).total:g}s)", None, False
         except Exception as e:
+            metrics.HTTP_RESPONSES.inc(phase='eval', provider=provider, code='error')
             return None, str(e), None, False
 
-        if response.status_code != 200:
-            return None, f"HTTP {response.status_code}: {response.text[:500]}", None, False
+        metrics.HTTP_RESPONSES.inc(phase='eval', provider=provider, code=status)
+        if status != 200:
+            return None, f"HTTP {status}: {raw[:500]}", None, False
 
         try:
-            response_json = response.json()
+            response_json = json.loads(raw)
         except ValueError as e:
             # Truncated/malformed body: worth retrying once.
             return None, f"JSON decode error: {e}", None, True
 
         text = extract_response_text(provider, response_json)
         stop_reason = response_json.get('stop_reason')
+        if usage is not None:
+            usage.update(extract_usage(provider, response_json))
         return text, None, stop_reason, False
 
-    text, err, stop_reason, retryable = _attempt()
+    text, err, stop_reason, retryable = await _attempt()
     if err and retryable:
-        text, err, stop_reason, _ = _attempt()
+        metrics.HTTP_RETRIES.inc(provider=provider, reason='json_decode')
+        text, err, stop_reason, _ = await _attempt()
 
-    elapsed = time.time() - start_time
+    return _call_result(text, time.time() - start_time, err, stop_reason)
 
+
+def _call_result(text, elapsed: float, err: str, stop_reason: str) -> tuple[str, float, str, str]:
+    """The ``(text, elapsed, error, stop_reason)`` tuple, with an error for empty text."""
     if err:
         return None, elapsed, err, stop_reason
 
@@ -318,14 +319,211 @@ def _post_and_extract(url: str, headers: dict, body: dict,
     return text, elapsed, None, stop_reason
 
 
-def call_model(provider: str, model: str,
-               prompt: str) -> tuple[str, float, str, dict]:
+def complete_solution(text: str, entry_point: str) -> bool:
+    """True once ``text`` holds a closed, compilable code block defining ``entry_point``."""
+    for lang, code in iter_code_blocks(text, unterminated=False):
+        if (lang in PYTHON_FENCE_LANGS or not lang) and f"def {entry_point}(" in code \
+                and compiles(code):
+            return True
+    return False
+
+
+def _stream_delta(fmt: str, event: dict) -> tuple[str, str, str]:
+    """(text, reasoning, stop_reason) carried by one server-sent event."""
+    if fmt == 'anthropic':
+        delta = event.get('delta') or {}
+        if event.get('type') == 'content_block_delta' and delta.get('type') == 'text_delta':
+            return delta.get('text', ''), '', None
+        if event.get('type') == 'message_delta':
+            return '', '', delta.get('stop_reason')
+        return '', '', None
+    choices = event.get('choices') or [{}]
+    delta = choices[0].get('delta') or {}
+    # Same reasoning-field fallbacks as extract_response_text
+    return delta.get('content') or '', delta.get('reasoning_content') or delta.get('reasoning') or '', None
+
+
+async def _stream_and_extract_async(session, url: str, headers: dict, body: dict, provider: str,
+                                    entry_point: str, early_stop: dict,
+                                    timeout: dict = None) -> tuple[str, float, str, str]:
+    """
+    Streaming variant of ``_post_and_extract_async`` that hangs up as soon
+    as the response holds a complete solution (``complete_solution``), so
+    the trailing explanation is never generated or waited for.
+
+    When that happens ``early_stop`` is filled with ``offset`` (characters
+    received) and ``seconds`` (time to the hang-up), and stop_reason is
+    ``"early_stop"``.
+    """
+    fmt = get_chat_endpoint(provider)['format']
+    start_time = time.time()
+    content, reasoning, stop_reason = [], [], None
+    try:
+        async with session.post(url, headers=headers, json=dict(body, stream=True),
+                                timeout=client_timeout(timeout)) as response:
+            metrics.HTTP_RESPONSES.inc(phase='eval', provider=provider, code=response.status)
+            if response.status != 200:
+                raw = await response.text()
+                return None, time.time() - start_time, f"HTTP {response.status}: {raw[:500]}", None
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b'data:'):
+                    continue
+                data = line[5:].strip()
+                if data == b'[DONE]':
+                    break
+                try:
+                    event = json.loads(data)
+                except ValueError:
+                    continue
+                if event.get('type') == 'error':
+                    return None, time.time() - start_time, f"Stream error: {event.get('error')}", None
+                text, thinking, reason = _stream_delta(fmt, event)
+                stop_reason = reason or stop_reason
+                if thinking:
+                    reasoning.append(thinking)
+                if text:
+                    content.append(text)
+                    # A closing fence always arrives in a chunk containing a backtick
+                    if '`' in text and complete_solution(''.join(content), entry_point):
+                        stop_reason = 'early_stop'
+                        early_stop.update(offset=len(''.join(content)),
+                                          seconds=round(time.time() - start_time, 2))
+                        response.close()
+                        break
+    except asyncio.TimeoutError:
+        metrics.HTTP_RESPONSES.inc(phase='eval', provider=provider, code='timeout')
+        return None, time.time() - start_time, f"{TIMEOUT_ERROR} ({client_timeout(timeout).total:g}s)", None
+    except Exception as e:
+        metrics.HTTP_RESPONSES.inc(phase='eval', provider=provider, code='error')
+        return None, time.time() - start_time, str(e), None
+
+    text = next((t for t in (''.join(content), ''.join(reasoning)) if t.strip()), None)
+    return _call_result(text, time.time() - start_time, None, stop_reason)
+
+
+def fallback_tiers(provider: str, model: str, prompt: str, body: dict) -> list:
+    """
+    Return the ordered ``[(fallback_name, body), ...]`` attempts for a call.
+
+    The first entry is the bare request (``fallback_name`` None). Anthropic
+    adds the system-frame retry and, when the prompt carries the triggering
+    opening line, the reframed-prompt retry; later tiers only run when the
+    previous one ended with ``stop_reason == "refusal"``.
+    """
+    tiers = [(None, body)]
+    if provider != 'anthropic':
+        return tiers
+
+    system_body = dict(body)
+    system_body['system'] = ANTHROPIC_REFUSAL_FALLBACK_SYSTEM
+    tiers.append(('anthropic_refusal_system', system_body))
+
+    if ANTHROPIC_REFUSAL_PROMPT_OPENING_ORIG in prompt:
+        reframed = prompt.replace(
+            ANTHROPIC_REFUSAL_PROMPT_OPENING_ORIG,
+            ANTHROPIC_REFUSAL_PROMPT_OPENING_REPLACEMENT,
+            1,
+        )
+        reframed_body = dict(system_body, messages=[{'role': 'user', 'content': reframed}])
+        tiers.append(('anthropic_refusal_prompt_reframe', reframed_body))
+
+    return tiers
+
+
+def timeout_budget(provider: str, model: str, reasoning: str = None) -> dict:
+    """
+    Connect/read budget for a call: from the latency history, except at an
+    explicit ``reasoning`` level, whose latency the history does not cover.
+    """
+    if reasoning:
+        return {'connect': latency_stats.CONNECT_TIMEOUT, 'read': latency_stats.CEILING}
+    return latency_stats.STORE.timeout_for(provider, model)
+
+
+def hedge_delay(provider: str, model: str) -> float:
+    """Seconds to wait before hedging a call, or None when it is not hedged."""
+    if provider not in HEDGE_PROVIDERS and '*' not in HEDGE_PROVIDERS:
+        return None
+    return latency_stats.STORE.quantile(provider, model, HEDGE_PERCENTILE)
+
+
+async def _hedged_async(attempt, api_key, provider: str, model: str, delay: float,
+                        hedge: dict) -> tuple[str, float, str, str]:
+    """
+    Run ``attempt(api_key)`` (a ``_post_and_extract_async``-style call); if
+    it has not finished after ``delay`` seconds, start an identical second
+    one (on whichever key ``throttle`` hands out next) and return whichever
+    answers first, cancelling the other.
+
+    ``hedge`` is filled with ``delay``, ``winner`` ("original", "hedge" or
+    None when neither answered) and, when the hedge won, ``saved``: the
+    estimated time saved, taking the p99 latency as what the original would
+    have needed. Elapsed time is measured from the first request.
+    """
+    start_time = time.time()
+    original = asyncio.ensure_future(attempt(api_key))
+    done, _ = await asyncio.wait({original}, timeout=delay)
+    if done:
+        metrics.EVAL_HEDGES.inc(provider=provider, outcome='not_hedged')
+        return original.result()
+
+    hedge_key = await throttle(provider)
+    hedge.update(delay=round(delay, 2), winner=None)
+    second = asyncio.ensure_future(attempt(hedge_key))
+    names = {original: 'original', second: 'hedge'}
+    pending, result = {original, second}, None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if result[0]:
+                    hedge['winner'] = names[task]
+                    break
+            if hedge['winner']:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    elapsed = time.time() - start_time
+    if hedge['winner'] == 'hedge':
+        p99 = latency_stats.STORE.quantile(provider, model, 99) or elapsed
+        hedge['saved'] = round(max(0.0, p99 - elapsed), 2)
+        metrics.EVAL_HEDGE_SAVED.inc(hedge['saved'], provider=provider)
+    metrics.EVAL_HEDGES.inc(provider=provider, outcome=hedge['winner'] or 'failed')
+    return (result[0], elapsed) + tuple(result[2:])
+
+
+async def call_model_async(provider: str, model: str, prompt: str, session=None,
+                           entry_point: str = None, timeout: dict = None, reasoning: str = None,
+                           usage: dict = None) -> tuple[str, float, str, dict]:
     """
     Call a model with a prompt and return
     (response_text, elapsed_time, error, meta).
 
-    ``meta`` is a dict with any extra diagnostics (currently
-    ``fallback_used``) or None when the first attempt succeeded cleanly.
+    ``meta`` is a dict with any extra diagnostics (``fallback_used``,
+    ``fallback_skipped`` when a remembered tier let earlier ones be skipped,
+    ``early_stop``) or None when the first attempt succeeded cleanly.
+
+    With ``MODELS_EVAL_EARLY_STOP`` set and an ``entry_point`` given, the
+    response is streamed and the connection closed once it contains a
+    complete code block defining ``entry_point``; ``early_stop`` then holds
+    the truncation offset and time to the hang-up.
+
+    ``timeout`` is the connect/read budget per attempt; by default it comes
+    from the model family's latency history (``latency_stats``), which every
+    answered or timed-out attempt is added to. Providers listed in
+    ``MODELS_EVAL_HEDGE`` get hedged attempts (``_hedged_async``), reported
+    as ``meta['hedge']``.
+
+    ``reasoning`` is passed to ``build_request_body``; ``usage``, if given,
+    is filled with the answering request's token counts (not available when
+    streaming). Calls at an explicit ``reasoning`` level (``reasoning_sweep``)
+    are neither hedged nor recorded in the latency history or fallback
+    memory, so a sweep cannot skew the budgets of normal evaluations.
 
     Fallback behaviour (anthropic-only): if the classifier refuses the bare
     prompt (``stop_reason == "refusal"``), retry once with a benchmark-framing
@@ -335,102 +533,165 @@ def call_model(provider: str, model: str,
     "Implement the following Python function:"). All other content in the
     user turn — signature, rules, expected return format, example — is
     preserved verbatim so results stay comparable.
+
+    The tier that answered is remembered per model and model family
+    (``fallback_memory``), and later calls for the same or a related model
+    start at that tier instead of repeating the refusals.
     """
     endpoint = get_chat_endpoint(provider)
     if not endpoint:
         return None, 0, f"Unknown provider: {provider}", None
 
     url = endpoint['url']
-    if callable(url):
-        url = url(model)
-
-    headers = endpoint['headers']()
-    body = build_request_body(provider, model, prompt)
+    body = build_request_body(provider, model, prompt, reasoning)
 
     if not body:
         return None, 0, "Failed to build request body", None
 
-    text, elapsed, error, stop_reason = _post_and_extract(url, headers, body, provider)
-
-    # Retry once for anthropic refusals with a system-level benchmark frame.
-    if provider == 'anthropic' and stop_reason == 'refusal':
-        retry_body = dict(body)
-        retry_body['system'] = ANTHROPIC_REFUSAL_FALLBACK_SYSTEM
-        r_text, r_elapsed, r_error, r_stop = _post_and_extract(
-            url, headers, retry_body, provider)
-        elapsed += r_elapsed
-        if r_text:
-            return r_text, elapsed, None, {'fallback_used': 'anthropic_refusal_system'}
-
-        # Second tier: swap the opening framing of the user prompt. Only fires
-        # when both the bare and system-framed calls returned stop_reason=refusal.
-        if r_stop == 'refusal' and ANTHROPIC_REFUSAL_PROMPT_OPENING_ORIG in prompt:
-            reframed = prompt.replace(
-                ANTHROPIC_REFUSAL_PROMPT_OPENING_ORIG,
-                ANTHROPIC_REFUSAL_PROMPT_OPENING_REPLACEMENT,
-                1,
-            )
-            reframed_body = build_request_body(provider, model, reframed)
-            reframed_body['system'] = ANTHROPIC_REFUSAL_FALLBACK_SYSTEM
-            f_text, f_elapsed, f_error, f_stop = _post_and_extract(
-                url, headers, reframed_body, provider)
-            elapsed += f_elapsed
-            if f_text:
-                return f_text, elapsed, None, {'fallback_used': 'anthropic_refusal_prompt_reframe'}
-            return None, elapsed, f_error, {'fallback_used': 'anthropic_refusal_prompt_reframe', 'fallback_failed': True}
-
-        # First-tier retry failed for a non-refusal reason; report as-is.
-        return None, elapsed, r_error, {'fallback_used': 'anthropic_refusal_system', 'fallback_failed': True}
-
-    return text, elapsed, error, None
-
-
-def extract_code(response: str) -> tuple[str, str]:
+    tiers = fallback_tiers(provider, model, prompt, body)
+    skipped = fallback_memory.STORE.start_index(provider, model, tiers)
+    stream = EARLY_STOP and entry_point and endpoint['format'] in STREAMING_FORMATS
+    record = not reasoning
+    timeout = timeout or timeout_budget(provider, model, reasoning)
+    delay = hedge_delay(provider, model) if record else None
+    early_stop, hedge = {}, {}
+    elapsed = 0
+
+    async def send(tier_body, api_key):
+        """One request with ``api_key`` from the provider's key pool."""
+        request_url = url(model, api_key) if callable(url) else url
+        headers = endpoint['headers'](api_key)
+        if stream:
+            result = await _stream_and_extract_async(session, request_url, headers, tier_body,
+                                                     provider, entry_point, early_stop, timeout)
+        else:
+            result = await _post_and_extract_async(session, request_url, headers, tier_body,
+                                                   provider, timeout, usage)
+        report(provider, api_key, result[2])
+        return result
+
+    async with client_session(session) as session:
+        for index, (fallback, tier_body) in enumerate(tiers[skipped:], skipped):
+            api_key = await throttle(provider)
+            attempt = partial(send, tier_body)
+            with span('eval.api_call', provider=provider, model=model, fallback=fallback):
+                if delay:
+                    text, t_elapsed, error, stop_reason = await _hedged_async(
+                        attempt, api_key, provider, model, delay, hedge)
+                else:
+                    text, t_elapsed, error, stop_reason = await attempt(api_key)
+            elapsed += t_elapsed
+            # A truncated response is no measure of the full latency
+            if record and not early_stop and (text or error.startswith(TIMEOUT_ERROR)):
+                latency_stats.STORE.observe(provider, model, t_elapsed)
+            if fallback:
+                metrics.EVAL_FALLBACKS.inc(provider=provider, fallback=fallback,
+                                           outcome='success' if text else 'failed')
+            if text:
+                if record and len(tiers) > 1:
+                    fallback_memory.STORE.record(provider, model, fallback)
+                meta = {'fallback_used': fallback} if fallback else {}
+                if fallback and skipped:
+                    meta['fallback_skipped'] = skipped
+                if early_stop:
+                    meta['early_stop'] = early_stop
+                if hedge:
+                    meta['hedge'] = hedge
+                return text, elapsed, None, meta or None
+            # Only a classifier refusal escalates to the next tier.
+            if stop_reason != 'refusal' or index == len(tiers) - 1:
+                break
+
+    if fallback:
+        return None, elapsed, error, {'fallback_used': fallback, 'fallback_failed': True}
+    return None, elapsed, error, None
+
+
+def call_model(provider: str, model: str,
+               prompt: str) -> tuple[str, float, str, dict]:
+    """Synchronous wrapper around ``call_model_async``."""
+    return asyncio.run(call_model_async(provider, model, prompt))
+
+
+PYTHON_FENCE_LANGS = ('python', 'python3', 'py')
+
+
+def iter_code_blocks(response: str, unterminated: bool = True):
+    """
+    Yield ``(language, code)`` for every fenced block, in order, in one pass.
+
+    Fences may be indented and carry any info string; an unterminated final
+    block (truncated response) is still yielded unless ``unterminated`` is
+    False.
+    """
+    lang, block = None, None
+    for line in response.splitlines():
+        stripped = line.strip()
+        if not stripped.startswith('```'):
+            if block is not None:
+                block.append(line)
+            continue
+        if block is None:
+            info = stripped[3:].strip().split()
+            lang, block = (info[0].lower() if info else ''), []
+        else:
+            yield lang, '\n'.join(block).strip()
+            lang, block = None, None
+    if block and unterminated:
+        yield lang, '\n'.join(block).strip()
+
+
+@lru_cache(maxsize=256)
+def compiles(code: str) -> bool:
+    """True when ``code`` is syntactically valid Python (cached)."""
+    try:
+        compile(code, '<string>', 'exec')
+        return True
+    except (SyntaxError, ValueError):
+        return False
+
+
+def extract_code(response: str, entry_point: str = 'solve_grid') -> tuple[str, str]:
     """
     Extract Python code from a model response.
     Returns (code, extraction_method).
 
-    Compiling successfully is preferred; when every candidate has a syntax
-    error, we still return the best (last-tried) candidate paired with a
-    ``*_syntax_error`` method suffix so downstream reporting can distinguish
-    "no code block found" from "model emitted broken Python".
+    Every fenced block defining ``entry_point`` is a candidate. A block
+    that compiles beats one that does not, a ``python``-tagged block beats an
+    untagged one, and a later block beats an earlier one (reasoning models
+    tend to refine their answer as they go). When every candidate has a
+    syntax error, the best one is still returned with a ``*_syntax_error``
+    method suffix so downstream reporting can distinguish "no code block
+    found" from "model emitted broken Python".
     """
     if not response:
         return None, "no_response"
+    definition = f"def {entry_point}"
 
-    last_uncompilable = None  # (code, method)
-
-    # Method 1: Try direct parse (response is just code)
-    if "def solve_grid" in response and not response.strip().startswith("```"):
+    # Bare code with no fences at all
+    if "```" not in response and definition in response:
         code = response.strip()
-        try:
-            compile(code, '<string>', 'exec')
+        if compiles(code):
             return code, "direct"
-        except SyntaxError:
-            last_uncompilable = (code, "direct_syntax_error")
-
-    # Method 2: Extract from ```python blocks
-    match = re.search(r'```python\s*(.*?)\s*```', response, re.DOTALL)
-    if match and "def solve_grid" in match.group(1):
-        code = match.group(1).strip()
-        try:
-            compile(code, '<string>', 'exec')
-            return code, "markdown_python"
-        except SyntaxError:
-            last_uncompilable = (code, "markdown_python_syntax_error")
-
-    # Method 3: Extract from ``` blocks (no language)
-    match = re.search(r'```\s*(.*?)\s*```', response, re.DOTALL)
-    if match and "def solve_grid" in match.group(1):
-        code = match.group(1).strip()
-        try:
-            compile(code, '<string>', 'exec')
-            return code, "markdown_generic"
-        except SyntaxError:
-            last_uncompilable = (code, "markdown_generic_syntax_error")
-
-    # Method 4: Find function definition and extract
-    match = re.search(r'(def solve_grid\s*\([^)]*\)[^:]*:.*?)(?=\n(?:def |class |if __name__|$)|\Z)',
+        best = (code, "direct_syntax_error")
+    else:
+        best = None
+
+    ranked = []
+    for position, (lang, code) in enumerate(iter_code_blocks(response)):
+        if definition not in code:
+            continue
+        is_python = lang in PYTHON_FENCE_LANGS
+        ranked.append(((compiles(code), is_python, position), code,
+                       "markdown_python" if is_python else "markdown_generic"))
+    if ranked:
+        (ok, _, _), code, method = max(ranked, key=lambda candidate: candidate[0])
+        if ok:
+            return code, method
+        best = (code, f"{method}_syntax_error")
+
+    # Find the function definition in unfenced prose and extract it
+    match = re.search(rf'({re.escape(definition)}\s*\([^)]*\)[^:]*:.*?)(?=\n(?:def |class |if __name__|$)|\Z)',
                       response, re.DOTALL)
     if match:
         code = match.group(1).strip()
@@ -438,133 +699,112 @@ def extract_code(response: str) -> tuple[str, str]:
         imports = re.findall(r'^(?:from .+ import .+|import .+)$', response, re.MULTILINE)
         if imports:
             code = '\n'.join(imports) + '\n\n' + code
-        try:
-            compile(code, '<string>', 'exec')
+        if compiles(code):
             return code, "function_extract"
-        except SyntaxError:
-            last_uncompilable = (code, "function_extract_syntax_error")
+        best = best or (code, "function_extract_syntax_error")
 
-    if last_uncompilable is not None:
-        return last_uncompilable
+    return best or (None, "extraction_failed")
 
-    return None, "extraction_failed"
 
+def build_test_script(code: str, cases: list, entry_point: str = 'solve_grid') -> str:
+    """Wrap extracted code in a script that prints a JSON result line.
 
-def validate_path(grid: list[list[int]], path: str) -> tuple[bool, int, str]:
-    """
-    Validate a path through the grid.
-    Returns (is_valid, calculated_sum, error_message).
+    ``entry_point`` is called once per argument tuple in ``cases``; each
+    outcome records the result (or exception) and its wall time.
     """
-    n = len(grid)
-    row, col = 0, 0
-    total = grid[0][0]
-    move_count = 0
+    return f'''
+import sys
+import json
+import time
+import resource
+{sandbox.IMPORT_GUARD}
+{code}
 
-    for i, move in enumerate(path):
-        move_count += 1
-        is_third_move = (move_count % 3 == 0)
+__cases = json.loads({json.dumps(cases)!r})
+__outcomes = []
+for __args in __cases:
+    __start = time.perf_counter()
+    try:
+        __outcome = {{"result": {entry_point}(*__args)}}
+    except Exception as e:
+        __outcome = {{"error": str(e) or type(e).__name__}}
+    __outcome["seconds"] = round(time.perf_counter() - __start, 4)
+    __outcomes.append(__outcome)
+print(json.dumps({{"success": True, "outcomes": __outcomes, "usage": {sandbox.USAGE_EXPR}}}, default=repr))
+'''
 
-        # Calculate next position
-        if move == 'R':
-            new_row, new_col = row, col + 1
-        elif move == 'D':
-            new_row, new_col = row + 1, col
-        elif move == 'X':
-            new_row, new_col = row + 1, col + 1
-        else:
-            return False, total, f"Invalid move character: {move}"
 
-        # Check bounds
-        if new_row >= n or new_col >= n:
-            return False, total, f"Move {move} at step {i+1} goes out of bounds"
+def parse_execution_output(returncode: int, stdout: str, stderr: str,
+                           usage: dict = None) -> tuple[list, str]:
+    """Turn a finished test script's output into (outcomes, error).
 
-        # Check 3rd move rule
-        if is_third_move:
-            # Check if diagonal was possible
-            diag_possible = (row + 1 < n and col + 1 < n)
-            if diag_possible and move != 'X':
-                return False, total, f"Move {move_count} must be diagonal (X) but was {move}"
+    When ``usage`` is a dict it is filled with the script's self-reported
+    ``peak_rss_mb`` and ``cpu_seconds``.
+    """
+    if returncode != 0:
+        killed = sandbox.signal_error(returncode)
+        if killed:
+            return None, f"Execution error: {killed}"
+        return None, f"Execution error: {stderr[:500]}"
+
+    # Model code sometimes prints extra lines (examples, debug output)
+    # before our wrapper's JSON line. Scan from the end for the first
+    # valid JSON object with the expected schema.
+    lines = [l for l in stdout.splitlines() if l.strip()]
+    output = None
+    for line in reversed(lines):
+        try:
+            candidate = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(candidate, dict) and 'outcomes' in candidate:
+            output = candidate
+            break
 
-        row, col = new_row, new_col
-        total += grid[row][col]
+    if output is None:
+        return None, f"Invalid output: {stdout[:500]}"
 
-    # Check if we reached the end
-    if row != n - 1 or col != n - 1:
-        return False, total, f"Path ended at ({row}, {col}) instead of ({n-1}, {n-1})"
+    if usage is not None and isinstance(output.get('usage'), dict):
+        usage['peak_rss_mb'] = round(output['usage']['peak_rss_kb'] / 1024, 1)
+        usage['cpu_seconds'] = output['usage']['cpu_seconds']
 
-    return True, total, None
+    return output['outcomes'], None
 
 
-def execute_code(code: str, grid: list[list[int]], timeout: int = 10) -> tuple[any, str]:
+async def execute_cases_async(code: str, entry_point: str, cases: list,
+                              timeout: int = 10, usage: dict = None) -> tuple[list, str]:
     """
-    Execute the extracted code and return (result, error).
-    Runs in a subprocess for safety.
+    Run ``entry_point`` over ``cases`` and return (outcomes, error).
+    Runs in a resource-limited subprocess (see ``sandbox.py``); ``usage``
+    is filled as in ``parse_execution_output``.
     """
-    test_script = f'''
-import sys
-import json
-
-{code}
-
-grid = {grid}
-try:
-    result = solve_grid(grid)
-    print(json.dumps({{"success": True, "result": result}}))
-except Exception as e:
-    print(json.dumps({{"success": False, "error": str(e)}}))
-'''
-
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-        f.write(test_script)
-        temp_file = f.name
-
+    script = build_test_script(code, cases, entry_point)
     try:
-        result = subprocess.run(
-            ['python3', temp_file],
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
+        returncode, stdout, stderr = await sandbox.run_script(script, timeout)
+    except asyncio.TimeoutError:
+        return None, f"Execution timed out ({timeout}s)"
+    except Exception as e:
+        return None, str(e)
+    return parse_execution_output(returncode, stdout, stderr, usage)
 
-        if result.returncode != 0:
-            return None, f"Execution error: {result.stderr[:500]}"
-
-        import json
-        # Model code sometimes prints extra lines (examples, debug output)
-        # before our wrapper's JSON line. Scan from the end for the first
-        # valid JSON object with the expected schema.
-        lines = [l for l in result.stdout.splitlines() if l.strip()]
-        output = None
-        for line in reversed(lines):
-            try:
-                candidate = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if isinstance(candidate, dict) and 'success' in candidate:
-                output = candidate
-                break
 
-        if output is None:
-            return None, f"Invalid output: {result.stdout[:500]}"
+async def execute_code_async(code: str, grid: list[list[int]],
+                             timeout: int = 10, usage: dict = None) -> tuple[any, str]:
+    """Execute ``solve_grid`` on one grid and return (result, error)."""
+    outcomes, error = await execute_cases_async(code, 'solve_grid', [[grid]], timeout, usage)
+    if error:
+        return None, error
+    return outcomes[0].get('result'), outcomes[0].get('error')
 
-        if output.get('success'):
-            return output['result'], None
-        return None, output.get('error', 'Unknown error')
 
-    except subprocess.TimeoutExpired:
-        return None, f"Execution timed out ({timeout}s)"
-    except Exception as e:
-        return None, str(e)
-    finally:
-        os.unlink(temp_file)
+def execute_code(code: str, grid: list[list[int]], timeout: int = 10) -> tuple[any, str]:
+    """Synchronous wrapper around ``execute_code_async``."""
+    return asyncio.run(execute_code_async(code, grid, timeout))
 
 
-def evaluate_model(provider: str, model: str) -> dict:
-    """
-    Run the full evaluation on a model.
-    Returns a dict with all evaluation results.
-    """
-    results = {
+def new_results(provider: str, model: str) -> dict:
+    """Return an empty results dict for ``provider``/``model``."""
+    return {
         'provider': provider,
         'model': model,
         'timestamp': datetime.now(timezone.utc).isoformat(),
@@ -573,6 +813,10 @@ def evaluate_model(provider: str, model: str) -> dict:
         'response_time': 0,
         'api_error': None,
         'extraction_method': None,
+        'extraction_time': None,
+        'static_analysis': None,
+        'peak_rss_mb': None,
+        'cpu_seconds': None,
         'extracted_code': None,
         'syntax_valid': False,
         'execution_result': None,
@@ -583,14 +827,56 @@ def evaluate_model(provider: str, model: str) -> dict:
         'calculated_sum': None,
         'sum_matches': False,
         'fallback_used': None,
+        'fallback_skipped': 0,
+        'early_stop': None,
+        'timeout_budget': None,
+        'hedge': None,
+        'endpoint_probe': None,
+        'reasoning': None,
+        'usage': None,
+        'skip_reason': None,
+        'task': 'solve_grid',
+        'cases_passed': 0,
+        'cases_total': 0,
+        'score': 0.0,
+        'perf': [],
+        'task_results': [],
     }
 
+
+async def evaluate_task_async(task, provider: str, model: str, session=None,
+                              reasoning: str = None) -> dict:
+    """
+    Run one task (see ``eval_tasks``) against a model, optionally at a
+    ``reasoning`` level (see ``build_request_body``).
+    Returns a results dict; for ``solve_grid`` the path/sum fields describe
+    the first case (``TEST_GRID``).
+    """
+    results = new_results(provider, model)
+    results['task'] = task.name
+    results['prompt'] = task.prompt
+    results['reasoning'] = reasoning
+
     # Step 1: Call the model
-    print(f"  Calling {provider}/{model}...")
-    response, elapsed, error, meta = call_model(provider, model, EVAL_PROMPT)
+    print(f"  Calling {provider}/{model} ({task.name})...")
+    results['timeout_budget'] = timeout_budget(provider, model, reasoning)
+    usage = {}
+    response, elapsed, error, meta = await call_model_async(provider, model, task.prompt, session,
+                                                            entry_point=task.entry_point,
+                                                            timeout=results['timeout_budget'],
+                                                            reasoning=reasoning, usage=usage)
     results['response_time'] = round(elapsed, 2)
+    if any(count is not None for count in usage.values()):
+        results['usage'] = usage
+    if meta and meta.get('early_stop'):
+        results['early_stop'] = dict(meta['early_stop'])
+        print(f"  Early stop after {meta['early_stop']['offset']} chars")
+    if meta and meta.get('hedge'):
+        results['hedge'] = meta['hedge']
+        print(f"  Hedged after {meta['hedge']['delay']}s, {meta['hedge']['winner']} won")
     if meta and meta.get('fallback_used'):
         results['fallback_used'] = meta['fallback_used']
+        results['fallback_skipped'] = meta.get('fallback_skipped', 0)
         print(f"  Fallback used: {meta['fallback_used']}")
 
     if error:
@@ -601,7 +887,10 @@ def evaluate_model(provider: str, model: str) -> dict:
 
     # Step 2: Extract code
     print(f"  Extracting code...")
-    code, method = extract_code(response)
+    extract_start = time.perf_counter()
+    with span('eval.extract', model=model, task=task.name):
+        code, method = extract_code(response, task.entry_point)
+    results['extraction_time'] = round((time.perf_counter() - extract_start) * 1000, 2)
     results['extraction_method'] = method
 
     if not code:
@@ -618,40 +907,148 @@ def evaluate_model(provider: str, model: str) -> dict:
 
     results['syntax_valid'] = True
 
+    # Reject hopeless candidates without spawning a process
+    cases = task.cases()
+    with span('eval.static_check', model=model, task=task.name):
+        report = analyze(code, task.entry_point, arity=len(cases[0]))
+    results['static_analysis'] = format_report(report)
+    if report['fatal']:
+        print(f"  Static check failed: {report['fatal']}")
+        results['execution_error'] = f"Static check failed: {report['fatal']}"
+        return results
+
     # Step 3: Execute code
     print(f"  Executing code...")
-    result, exec_error = execute_code(code, TEST_GRID)
+    results['cases_total'] = len(cases)
+    usage = {}
+    with span('eval.execute', model=model, task=task.name):
+        outcomes, exec_error = await execute_cases_async(code, task.entry_point, cases, usage=usage)
+    results['peak_rss_mb'] = usage.get('peak_rss_mb')
+    results['cpu_seconds'] = usage.get('cpu_seconds')
 
     if exec_error:
         results['execution_error'] = exec_error
         return results
 
-    results['execution_result'] = result
+    first = outcomes[0]
+    if 'error' in first:
+        results['execution_error'] = first['error']
+    else:
+        results['execution_result'] = first['result']
 
-    # Step 4: Validate result
-    if isinstance(result, (list, tuple)) and len(result) == 2:
-        returned_sum, path = result
-        results['returned_sum'] = returned_sum
+    # Step 4: Validate results
+    print(f"  Validating results...")
+    with span('eval.validate', model=model, task=task.name):
+        for index, (args, outcome) in enumerate(zip(cases, outcomes)):
+            if 'error' in outcome:
+                continue
+            passed, detail = task.validate(args, outcome['result'])
+            results['cases_passed'] += passed
+            if index == 0 and task.name == 'solve_grid' and detail['returned_sum'] is not None:
+                results.update((key, detail[key]) for key in
+                               ('returned_sum', 'calculated_sum', 'sum_matches', 'path_valid', 'path_error'))
+    results['score'] = round(results['cases_passed'] / len(cases), 3)
+
+    # Step 5: Time the perf-scaling inputs (reported, not scored)
+    perf_inputs = task.perf_inputs()
+    if perf_inputs:
+        with span('eval.perf', model=model, task=task.name):
+            perf_outcomes, perf_error = await execute_cases_async(code, task.entry_point, perf_inputs)
+        for args, outcome in zip(perf_inputs, perf_outcomes or [{'error': perf_error}] * len(perf_inputs)):
+            results['perf'].append({'size': len(args[0]), 'seconds': outcome.get('seconds'),
+                                    'error': outcome.get('error')})
+
+    return results
 
-        if isinstance(path, str):
-            print(f"  Validating path...")
-            is_valid, calc_sum, path_error = validate_path(TEST_GRID, path)
-            results['path_valid'] = is_valid
-            results['path_error'] = path_error
-            results['calculated_sum'] = calc_sum
-            results['sum_matches'] = (returned_sum == calc_sum)
 
+async def evaluate_model_async(provider: str, model: str, session=None,
+                               reasoning: str = None) -> dict:
+    """
+    Run the full evaluation on a model: every selected task, concurrently.
+    Returns the first task's results dict, with the others under
+    ``task_results`` and the mean task score as ``score``.
+    """
+    tasks = selected_tasks()
+    # Read before this run overwrites the file
+    baseline = previous_response_time(model)
+    async with client_session(session) as session:
+        all_results = await asyncio.gather(*(
+            evaluate_task_async(task, provider, model, session, reasoning) for task in tasks))
+    results = all_results[0]
+    results['task_results'] = list(all_results[1:])
+    results['task_score'] = results['score']
+    results['score'] = round(sum(r['score'] for r in all_results) / len(all_results), 3)
+    if results['early_stop']:
+        if baseline:
+            results['early_stop'].update(baseline=baseline,
+                                         saved=round(baseline - results['response_time'], 2))
+        else:
+            # First evaluation: estimate from the family's (or provider's) median
+            estimate = latency_stats.STORE.quantile(provider, model, 50)
+            if estimate:
+                results['early_stop'].update(estimated_baseline=estimate,
+                                             saved=round(estimate - results['response_time'], 2))
     return results
 
 
+def evaluate_model(provider: str, model: str) -> dict:
+    """Synchronous wrapper around ``evaluate_model_async``."""
+    return asyncio.run(evaluate_model_async(provider, model))
+
+
+def previous_response_time(model: str) -> float:
+    """
+    Full (not early-stopped) response time from the model's previous eval
+    file, or None. Used to estimate what an early stop saved.
+    """
+    try:
+        header = (EVAL_DIR / eval_filename(model)).read_text().split('\n=== RAW RESPONSE ===', 1)[0]
+    except OSError:
+        return None
+    times = dict(re.findall(r'^(Baseline response time|Response time): ([\d.]+)s$', header, re.M))
+    if '\nEarly stop: ' in header:
+        value = times.get('Baseline response time')
+    else:
+        value = times.get('Response time')
+    return float(value) if value else None
+
+
+def eval_filename(model: str) -> str:
+    """Name of the eval file ``save_evaluation`` writes for a model."""
+    # Sanitize model name for filename
+    safe_name = re.sub(r'[^a-zA-Z0-9._-]', '_', model)
+    return f"eval-{safe_name}.txt"
+
+
+def format_task_line(results: dict) -> str:
+    """``name: passed/total cases (score), perf size=seconds ...``"""
+    score = results.get('task_score', results['score'])
+    line = (f"{results['task']}: {results['cases_passed']}/{results['cases_total']} cases "
+            f"(score {score:.2f})")
+    if results.get('perf'):
+        timings = ', '.join(
+            f"n={p['size']}: " + (p['error'] or f"{p['seconds']}s") for p in results['perf'])
+        line += f"; perf {timings}"
+    return line
+
+
+def format_usage(usage: dict) -> str:
+    """``Tokens: 812 in, 4210 out (3100 reasoning)``; unknown counts shown as ``?``."""
+    def count(key):
+        return '?' if usage.get(key) is None else str(usage[key])
+
+    line = f"Tokens: {count('input_tokens')} in, {count('output_tokens')} out"
+    if usage.get('reasoning_tokens') is not None:
+        line += f" ({usage['reasoning_tokens']} reasoning)"
+    return line
+
+
 def save_evaluation(results: dict) -> str:
     """Save evaluation results to a file."""
     # Create evals directory if needed
     EVAL_DIR.mkdir(exist_ok=True)
 
-    # Sanitize model name for filename
-    safe_name = re.sub(r'[^a-zA-Z0-9._-]', '_', results['model'])
-    filename = f"eval-{safe_name}.txt"
+    filename = eval_filename(results['model'])
     filepath = EVAL_DIR / filename
 
     # Build output
@@ -662,13 +1059,55 @@ def save_evaluation(results: dict) -> str:
         "",
         "=== TIMING ===",
         f"Response time: {results['response_time']}s",
-        "",
     ]
+    budget = results.get('timeout_budget')
+    if budget:
+        lines.append(f"Timeout budget: connect {budget['connect']}s, read {budget['read']}s")
+    usage = results.get('usage')
+    if usage:
+        lines.append(format_usage(usage))
+    hedge = results.get('hedge')
+    if hedge:
+        line = f"Hedged: after {hedge['delay']}s, {hedge['winner'] or 'neither'} answered first"
+        if 'saved' in hedge:
+            line += f", ~{hedge['saved']}s saved"
+        lines.append(line)
+    early_stop = results.get('early_stop')
+    if early_stop:
+        lines.append(f"Early stop: truncated at {early_stop['offset']} chars")
+        if early_stop.get('baseline'):
+            # Carried forward so later runs compare against a full response
+            lines.append(f"Baseline response time: {early_stop['baseline']}s")
+            lines.append(f"Time saved: ~{early_stop['saved']}s")
+        elif early_stop.get('estimated_baseline'):
+            lines.append(f"Estimated full response time: {early_stop['estimated_baseline']}s "
+                         f"(median of recent {results['provider']} calls)")
+            lines.append(f"Time saved: ~{early_stop['saved']}s (estimated)")
+        else:
+            lines.append("Time saved: unknown (no earlier eval or latency history)")
+    lines.append("")
+
+    if results.get('skip_reason'):
+        lines.extend([
+            "=== SKIPPED ===",
+            f"Reason: {results['skip_reason']}",
+            "",
+        ])
 
     if results.get('fallback_used'):
         lines.extend([
             "=== FALLBACK ===",
             f"Fallback used: {results['fallback_used']}",
+        ])
+        if results.get('fallback_skipped'):
+            lines.append(f"Started at remembered tier (skipped {results['fallback_skipped']})")
+        lines.append("")
+
+    if results.get('endpoint_probe'):
+        lines.extend([
+            "=== ENDPOINT ===",
+            f"Unsupported: {', '.join(results['endpoint_probe'])}",
+            f"Using: {results['provider']}",
             "",
         ])
 
@@ -676,12 +1115,22 @@ def save_evaluation(results: dict) -> str:
         "=== CODE EXTRACTION ===",
         f"Method: {results['extraction_method']}",
         f"Syntax valid: {'YES' if results['syntax_valid'] else 'NO'}",
+    ])
+    if results.get('extraction_time') is not None:
+        lines.append(f"Extraction time: {results['extraction_time']}ms")
+    if results.get('static_analysis'):
+        lines.append(f"Static checks: {results['static_analysis']}")
+    lines.extend([
         "",
         "=== EXECUTION ===",
     ])
 
+    if results.get('peak_rss_mb') is not None:
+        lines.append(f"Resources: {results['peak_rss_mb']} MB peak RSS, {results['cpu_seconds']}s CPU")
     if results['api_error']:
         lines.append(f"API Error: {results['api_error']}")
+    elif results.get('skip_reason'):
+        lines.append("Skipped: model not evaluated")
     elif results['execution_error']:
         lines.append(f"Execution Error: {results['execution_error']}")
     else:
@@ -694,6 +1143,13 @@ def save_evaluation(results: dict) -> str:
         if results['path_error']:
             lines.append(f"Path error: {results['path_error']}")
 
+    if results.get('cases_total'):
+        lines.extend(["", "=== TASKS ==="])
+        for task_results in [results] + results.get('task_results', []):
+            lines.append(format_task_line(task_results))
+        if results.get('task_results'):
+            lines.append(f"Aggregate score: {results['score']:.2f}")
+
     lines.extend([
         "",
         "=== RAW RESPONSE ===",
@@ -703,6 +1159,23 @@ def save_evaluation(results: dict) -> str:
         results['extracted_code'] or "(no code extracted)",
     ])
 
+    for task_results in results.get('task_results', []):
+        error = task_results['api_error'] or task_results['execution_error']
+        lines.extend([
+            "",
+            f"=== TASK {task_results['task']} ===",
+            f"Response time: {task_results['response_time']}s",
+            f"Method: {task_results['extraction_method']}",
+        ])
+        if error:
+            lines.append(f"Error: {error}")
+        lines.extend([
+            "--- RAW RESPONSE ---",
+            task_results['response'] or "(no response)",
+            "--- EXTRACTED CODE ---",
+            task_results['extracted_code'] or "(no code extracted)",
+        ])
+
     with open(filepath, 'w') as f:
         f.write('\n'.join(lines))
 
@@ -731,21 +1204,102 @@ def resolve_openai_provider(model: str) -> str:
     return 'openai'
 
 
-def run_evaluation(provider: str, model: str) -> dict:
-    """Main entry point: evaluate a model and save results."""
+async def run_evaluation_async(provider: str, model: str, session=None) -> dict:
+    """
+    Main entry point: evaluate a model and save results.
+
+    Providers with alternative endpoints (see ``endpoint_probe``) start with
+    the endpoint remembered for the model, else the name-based guess, and
+    move on to the next one when the API says the model needs a different
+    endpoint.
+    """
     # Auto-detect the correct endpoint for generic 'openai' provider
-    if provider == 'openai':
-        resolved = resolve_openai_provider(model)
-        if resolved != provider:
-            print(f"  Auto-detected provider: {provider} -> {resolved}")
-            provider = resolved
-
-    print(f"Evaluating {provider}/{model}...")
-    results = evaluate_model(provider, model)
+    guess = resolve_openai_provider(model) if provider == 'openai' else provider
+    probed = []
+    for candidate in endpoint_probe.candidates(provider, model, guess):
+        if candidate != provider:
+            print(f"  {'Probing' if probed else 'Auto-detected'} provider: {provider} -> {candidate}")
+        print(f"Evaluating {candidate}/{model}...")
+        results = await evaluate_model_async(candidate, model, session)
+        if not endpoint_probe.is_unsupported_endpoint(results['api_error']):
+            break
+        probed.append(candidate)
+    if probed and not endpoint_probe.is_unsupported_endpoint(results['api_error']):
+        endpoint_probe.FORMATS.record(provider, model, candidate)
+        results['endpoint_probe'] = probed
+
+    save_evaluation(results)
+    record_metrics(results)
+    return results
+
+
+def eval_outcome(results: dict) -> str:
+    """Coarse outcome label: pass, fail, api_error or skipped."""
+    if results.get('skip_reason'):
+        return 'skipped'
+    if results.get('api_error'):
+        return 'api_error'
+    if results.get('path_valid') and results.get('sum_matches'):
+        return 'pass'
+    return 'fail'
+
+
+def record_metrics(results: dict):
+    """Count an evaluation's outcome and observe its latency and resource use."""
+    provider = results['provider']
+    metrics.EVAL_RESULTS.inc(provider=provider, outcome=eval_outcome(results))
+    if results.get('response_time'):
+        metrics.EVAL_SECONDS.observe(results['response_time'], provider=provider)
+    if results.get('peak_rss_mb') is not None:
+        metrics.EXEC_PEAK_RSS.observe(results['peak_rss_mb'] * 1024 * 1024, provider=provider)
+        metrics.EXEC_CPU_SECONDS.observe(results['cpu_seconds'], provider=provider)
+
+
+def run_evaluation(provider: str, model: str) -> dict:
+    """Synchronous wrapper around ``run_evaluation_async``."""
+    return asyncio.run(run_evaluation_async(provider, model))
+
+
+def skip_evaluation(provider: str, model: str, reason: str) -> dict:
+    """Record that a model was deliberately not evaluated, and why."""
+    print(f"Skipping {provider}/{model}: {reason}")
+    results = new_results(provider, model)
+    results['skip_reason'] = reason
     save_evaluation(results)
+    record_metrics(results)
     return results
 
 
+def link_evaluation(provider: str, model: str, representative: str, source_file: str) -> str:
+    """
+    Record ``model`` as an alias of an already evaluated ``representative``.
+
+    The alias's eval file carries a ``=== LINKED ===`` section and a copy of
+    the representative's results, so readers of eval files see the result
+    without another paid evaluation.
+    """
+    print(f"Linking {provider}/{model} to existing evaluation of {representative}")
+    source = (EVAL_DIR / source_file).read_text()
+    body = source[source.index("=== TIMING ==="):]
+    lines = [
+        f"Model: {model}",
+        f"Provider: {provider}",
+        f"Evaluated: {datetime.now(timezone.utc).isoformat()}",
+        "",
+        "=== LINKED ===",
+        f"Linked to: {representative}",
+        f"Source: {source_file}",
+        "",
+        body,
+    ]
+    filepath = EVAL_DIR / eval_filename(model)
+    with open(filepath, 'w') as f:
+        f.write('\n'.join(lines))
+    metrics.EVAL_RESULTS.inc(provider=provider, outcome='linked')
+    print(f"  Saved to {filepath.name}")
+    return str(filepath)
+
+
 if __name__ == "__main__":
     # Test with a sample model
     import sys
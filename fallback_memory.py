@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Remembered refusal-fallback tiers.
+
+``evaluate_model.call_model_async`` tries the bare prompt first and only
+escalates to the Anthropic refusal fallbacks after a refusal, so a model
+that always needs the reframed prompt pays for every tier on every
+evaluation. ``FallbackStore`` records which tier last produced an answer
+for each model and for its family (``claude-opus-5`` and
+``claude-opus-4-5-20251101`` are both ``claude-opus``), and evaluations of
+the same or a related model start from that tier.
+
+A remembered tier only holds for ``MAX_AGE_DAYS`` after it was last
+recorded. After that the next evaluation starts at the bare prompt again,
+so a provider that has stopped refusing is noticed; if the bare prompt
+answers, the model and its family are recorded at tier 0 from then on.
+
+The store lives in ``evals/fallback_tiers.json`` so it is committed with the
+evaluation results and survives between nightly runs.
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+
+from atomic_file import write_json
+
+STORE_FILE = Path(__file__).parent / "evals" / "fallback_tiers.json"
+
+# How long a remembered fallback tier is trusted before the bare prompt is retried
+MAX_AGE_DAYS = 14
+
+DATE_SUFFIX = re.compile(r'-(?:\d{8}|\d{4}-\d{2}-\d{2})$')
+VERSION_SUFFIX = re.compile(r'(?:-\d+)+$')
+
+
+def model_family(model: str) -> str:
+    """``claude-opus-4-5-20251101`` -> ``claude-opus``: the name without its version."""
+    name = model.strip().lower().rsplit('/', 1)[-1].replace('_', '-').replace('.', '-')
+    if name.endswith('-latest'):
+        name = name[:-len('-latest')]
+    name = DATE_SUFFIX.sub('', name)
+    return VERSION_SUFFIX.sub('', name) or name
+
+
+class ModelMemory:
+    """``provider/model`` and ``provider/family`` -> last value recorded for them."""
+
+    SECTIONS = ('models', 'families')
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._data = None
+
+    def _load(self) -> dict:
+        if self._data is None:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            self._data = {section: data.get(section, {}) for section in self.SECTIONS}
+        return self._data
+
+    @staticmethod
+    def _keys(provider: str, model: str) -> tuple:
+        return ('models', f"{provider}/{model}"), ('families', f"{provider}/{model_family(model)}")
+
+    def _find(self, provider: str, model: str):
+        """``(section, key)`` holding the model's value, or None."""
+        data = self._load()
+        for section, key in self._keys(provider, model):
+            if key in data[section]:
+                return section, key
+        return None
+
+    def lookup(self, provider: str, model: str):
+        """The model's own value, else its family's, else None."""
+        found = self._find(provider, model)
+        return self._load()[found[0]][found[1]] if found else None
+
+    def record(self, provider: str, model: str, value):
+        """Remember ``value`` for ``model`` and its family."""
+        data = self._load()
+        keys = self._keys(provider, model)
+        if all(key in data[section] and data[section][key] == value for section, key in keys):
+            return
+        for section, key in keys:
+            data[section][key] = value
+        self._save()
+
+    def _save(self):
+        write_json(self.path, self._data)
+
+
+class FallbackStore(ModelMemory):
+    """
+    Last successful tier name (None = bare prompt) per model and family,
+    with the Unix time each key was last recorded under ``recorded``.
+    """
+
+    SECTIONS = ModelMemory.SECTIONS + ('recorded',)
+
+    def __init__(self, path=STORE_FILE):
+        super().__init__(path)
+
+    def record(self, provider: str, model: str, value):
+        """Remember ``value`` for ``model`` and its family, restarting their age."""
+        data = self._load()
+        now = round(time.time())
+        for section, key in self._keys(provider, model):
+            data[section][key] = value
+            data['recorded'][key] = now
+        self._save()
+
+    def start_index(self, provider: str, model: str, tiers: list) -> int:
+        """
+        Index into ``fallback_tiers(...)`` of the remembered tier; 0 if none
+        is remembered or it is older than ``MAX_AGE_DAYS``.
+        """
+        found = self._find(provider, model)
+        if not found:
+            return 0
+        data = self._load()
+        if time.time() - data['recorded'].get(found[1], 0) > MAX_AGE_DAYS * 86400:
+            return 0
+        names = [name for name, _ in tiers]
+        learned = data[found[0]][found[1]]
+        return names.index(learned) if learned in names else 0
+
+
+STORE = FallbackStore()
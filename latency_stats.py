@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Rolling per-provider latency history and the request timeouts derived from it.
+
+Every eval call's latency is recorded under its provider and model family
+(``fallback_memory.model_family``), keeping the most recent ``WINDOW``
+samples in ``evals/latency_stats.json`` so the history survives between
+nightly runs. ``timeout_for`` turns that history into a budget: the read
+timeout is the family's p99 (or the provider's, when the family has too
+few samples) times ``FACTOR``, clamped to ``[FLOOR, CEILING]``. Connecting
+gets its own short timeout, so an unreachable endpoint fails fast no matter
+how slow its models are.
+
+A timed-out call is recorded at its full budget, so a provider that has
+become slower pushes its p99 -- and the next budget -- up rather than
+timing out forever.
+"""
+
+import json
+import math
+from pathlib import Path
+
+from atomic_file import write_json
+from fallback_memory import model_family
+
+STORE_FILE = Path(__file__).parent / "evals" / "latency_stats.json"
+
+WINDOW = 50         # samples kept per key
+MIN_SAMPLES = 5     # fewer than this and the key's percentiles are not trusted
+FACTOR = 2.0
+FLOOR = 30          # seconds
+CEILING = 300       # the old fixed budget
+CONNECT_TIMEOUT = 10
+
+
+def percentile(samples: list, q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0-100) of a non-empty list."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class LatencyStats:
+    """``provider`` and ``provider/family`` -> recent latencies in seconds."""
+
+    def __init__(self, path=STORE_FILE):
+        self.path = Path(path)
+        self._data = None
+
+    def _load(self) -> dict:
+        if self._data is None:
+            try:
+                with open(self.path) as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def _keys(self, provider: str, model: str) -> tuple:
+        return f"{provider}/{model_family(model)}", provider
+
+    def samples(self, provider: str, model: str) -> list:
+        """The family's samples when there are enough, else the provider's."""
+        data = self._load()
+        for key in self._keys(provider, model):
+            if len(data.get(key, ())) >= MIN_SAMPLES:
+                return data[key]
+        return []
+
+    def quantile(self, provider: str, model: str, q: float) -> float:
+        """``q``-th percentile latency, or None without enough history."""
+        samples = self.samples(provider, model)
+        return percentile(samples, q) if samples else None
+
+    def observe(self, provider: str, model: str, seconds: float):
+        data = self._load()
+        for key in self._keys(provider, model):
+            data[key] = (data.get(key, []) + [round(seconds, 2)])[-WINDOW:]
+        write_json(self.path, data)
+
+    def timeout_for(self, provider: str, model: str) -> dict:
+        """``{'connect': s, 'read': s}`` budget for the next call."""
+        p99 = self.quantile(provider, model, 99)
+        read = CEILING if p99 is None else min(CEILING, max(FLOOR, math.ceil(p99 * FACTOR)))
+        return {'connect': CONNECT_TIMEOUT, 'read': read}
+
+
+STORE = LatencyStats()
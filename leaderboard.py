@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Build a leaderboard from the evaluation results in ``evals/``.
+
+Each ``eval-*.txt`` written by ``evaluate_model.save_evaluation`` is parsed
+into one row (status, response time, task score, ...). Models are ranked per
+provider by correctness first and latency second, and the fastest passing
+models overall get their own table. The report is written as Markdown
+(``LEADERBOARD.md``) and optionally HTML.
+
+Parsed rows are cached in ``.leaderboard_cache.json`` keyed by file name and
+content hash, so a run only re-parses evals that changed since the last one
+(file mtimes are checked first to avoid even hashing unchanged files).
+
+Usage:
+    python leaderboard.py [--output LEADERBOARD.md] [--html leaderboard.html] [--top N]
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+from pathlib import Path
+
+from provider_registry import get_provider, listing_provider
+
+MODELS_DIR = Path(__file__).parent
+EVAL_DIR = MODELS_DIR / "evals"
+CACHE_FILE = MODELS_DIR / ".leaderboard_cache.json"
+OUTPUT_FILE = MODELS_DIR / "LEADERBOARD.md"
+
+# Bumped whenever parse_eval changes, invalidating every cached row
+PARSER_VERSION = 2
+
+STATUS_ORDER = {'pass': 0, 'fail': 1, 'error': 2, 'api_error': 3, 'skipped': 4}
+STATUS_LABELS = {'pass': "✅ pass", 'fail': "❌ fail", 'error': "💥 error",
+                 'api_error': "⚠️ API error", 'skipped': "⏭️ skipped"}
+
+TASK_LINE = re.compile(r'^(\w+): (\d+)/(\d+) cases \(score ([\d.]+)\)')
+
+
+def parse_eval(text: str) -> dict:
+    """Turn one eval file's contents into a leaderboard row."""
+    # Everything after the raw response is model output, not metadata
+    header = text.split('\n=== RAW RESPONSE ===', 1)[0]
+    fields = {}
+    tasks = {}
+    for line in header.splitlines():
+        match = TASK_LINE.match(line)
+        if match:
+            tasks[match.group(1)] = float(match.group(4))
+            continue
+        key, sep, value = line.partition(': ')
+        if sep and key not in fields:
+            fields[key] = value.strip()
+
+    if 'Reason' in fields:
+        status = 'skipped'
+    elif 'API Error' in fields:
+        status = 'api_error'
+    elif 'Execution Error' in fields:
+        status = 'error'
+    elif fields.get('Path valid') == 'YES' and fields.get('Sum matches') == 'YES':
+        status = 'pass'
+    else:
+        status = 'fail'
+
+    try:
+        response_time = float(fields.get('Response time', '').rstrip('s'))
+    except ValueError:
+        response_time = None
+
+    score = fields.get('Aggregate score')
+    if score is None and tasks:
+        score = next(iter(tasks.values()))
+
+    return {
+        'model': fields.get('Model'),
+        'provider': fields.get('Provider'),
+        'evaluated': (fields.get('Evaluated') or '')[:10],
+        'status': status,
+        'response_time': response_time,
+        'score': float(score) if score is not None else None,
+        'fallback': fields.get('Fallback used'),
+        'detail': fields.get('API Error') or fields.get('Execution Error') or fields.get('Reason'),
+        'linked_to': fields.get('Linked to'),
+    }
+
+
+def load_cache(path=CACHE_FILE) -> dict:
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache['files'] if cache.get('version') == PARSER_VERSION else {}
+
+
+def save_cache(entries: dict, path=CACHE_FILE):
+    with open(path, 'w') as f:
+        json.dump({'version': PARSER_VERSION, 'files': entries}, f)
+
+
+def collect_rows(eval_dir=EVAL_DIR, cache: dict = None) -> tuple[list, dict, int]:
+    """
+    Return (rows, new_cache, parsed_count) for every eval file.
+
+    A cached row is reused when the file's size and mtime are unchanged, or
+    when its content hash still matches (e.g. after a fresh checkout).
+    """
+    cache = cache or {}
+    entries, rows, parsed = {}, [], 0
+    for path in sorted(eval_dir.glob('eval-*.txt')):
+        stat = path.stat()
+        entry = cache.get(path.name)
+        if not (entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns):
+            data = path.read_bytes()
+            digest = hashlib.sha1(data).hexdigest()
+            if not (entry and entry['sha1'] == digest):
+                entry = {'sha1': digest, 'row': parse_eval(data.decode(errors='replace'))}
+                parsed += 1
+            entry = dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        entries[path.name] = entry
+        rows.append(entry['row'])
+    return rows, entries, parsed
+
+
+def rank_key(row: dict):
+    """Correctness first, then task score, then latency."""
+    latency = row['response_time'] if row['response_time'] is not None else float('inf')
+    return STATUS_ORDER[row['status']], -(row['score'] or 0), latency, row['model'] or ''
+
+
+def provider_label(name: str) -> str:
+    provider = get_provider(name)
+    return provider.display_name if provider else name
+
+
+def row_provider(row: dict) -> str:
+    """Registry provider whose model list the row's model is on (not the chat endpoint)."""
+    return listing_provider(row['provider'], row['model']) if row['provider'] else 'unknown'
+
+
+def group_by_provider(rows: list) -> dict:
+    groups = {}
+    for row in rows:
+        groups.setdefault(row_provider(row), []).append(row)
+    return {name: sorted(group, key=rank_key) for name, group in sorted(groups.items())}
+
+
+def fastest_passing(rows: list, top: int) -> list:
+    passing = [r for r in rows if r['status'] == 'pass' and r['response_time'] is not None
+               and not r.get('linked_to')]
+    return sorted(passing, key=rank_key)[:top]
+
+
+def format_seconds(value) -> str:
+    return f"{value:.1f}s" if value is not None else "–"
+
+
+def _table_rows(rows: list, with_provider: bool = False) -> list:
+    table = []
+    for rank, row in enumerate(rows, 1):
+        model = row['model']
+        if row.get('linked_to'):
+            model += f" (= {row['linked_to']})"
+        cells = [str(rank), model]
+        if with_provider:
+            cells.append(provider_label(row_provider(row)))
+        cells += [STATUS_LABELS[row['status']], format_seconds(row['response_time']),
+                  f"{row['score']:.2f}" if row['score'] is not None else "–", row['evaluated']]
+        table.append(cells)
+    return table
+
+
+def _columns(with_provider: bool = False) -> list:
+    return ['#', 'Model'] + (['Provider'] if with_provider else []) + \
+        ['Result', 'Response time', 'Score', 'Evaluated']
+
+
+def summary_counts(rows: list) -> dict:
+    counts = {status: 0 for status in STATUS_ORDER}
+    for row in rows:
+        counts[row['status']] += 1
+    return counts
+
+
+def render_markdown(rows: list, top: int = 20) -> str:
+    def table(columns, body):
+        lines = ['| ' + ' | '.join(columns) + ' |', '|' + '---|' * len(columns)]
+        lines += ['| ' + ' | '.join(cell.replace('|', '\\|') for cell in cells) + ' |'
+                  for cells in body]
+        return lines
+
+    counts = summary_counts(rows)
+    lines = [
+        "# Model Evaluation Leaderboard",
+        "",
+        "Generated by `leaderboard.py` from the files in `evals/`. Models are ranked "
+        "by correctness first, then response time.",
+        "",
+        f"**{len(rows)} evaluations:** " + ', '.join(
+            f"{counts[status]} {STATUS_LABELS[status].split(' ', 1)[1]}" for status in STATUS_ORDER),
+        "",
+        f"## Fastest Passing Models (top {top})",
+        "",
+    ]
+    lines += table(_columns(True), _table_rows(fastest_passing(rows, top), with_provider=True))
+    for provider, group in group_by_provider(rows).items():
+        lines += ["", f"## {provider_label(provider)} (`{provider}`)", ""]
+        lines += table(_columns(), _table_rows(group))
+    return '\n'.join(lines) + '\n'
+
+
+def render_html(rows: list, top: int = 20) -> str:
+    def table(columns, body):
+        head = ''.join(f"<th>{html.escape(c)}</th>" for c in columns)
+        trs = ''.join('<tr>' + ''.join(f"<td>{html.escape(c)}</td>" for c in cells) + '</tr>'
+                      for cells in body)
+        return f"<table><thead><tr>{head}</tr></thead><tbody>{trs}</tbody></table>"
+
+    parts = ["<!DOCTYPE html><html><head><meta charset=\"utf-8\">",
+             "<title>Model Evaluation Leaderboard</title></head><body>",
+             "<h1>Model Evaluation Leaderboard</h1>",
+             f"<h2>Fastest Passing Models (top {top})</h2>",
+             table(_columns(True), _table_rows(fastest_passing(rows, top), with_provider=True))]
+    for provider, group in group_by_provider(rows).items():
+        parts.append(f"<h2>{html.escape(provider_label(provider))}</h2>")
+        parts.append(table(_columns(), _table_rows(group)))
+    parts.append("</body></html>")
+    return '\n'.join(parts) + '\n'
+
+
+def write_if_changed(path, content: str) -> bool:
+    path = Path(path)
+    if path.exists() and path.read_text() == content:
+        return False
+    path.write_text(content)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the model evaluation leaderboard")
+    parser.add_argument('--output', default=str(OUTPUT_FILE), help="Markdown output path")
+    parser.add_argument('--html', help="also write an HTML report to this path")
+    parser.add_argument('--top', type=int, default=20, help="size of the fastest-passing table")
+    args = parser.parse_args()
+
+    rows, entries, parsed = collect_rows(EVAL_DIR, load_cache())
+    save_cache(entries)
+    print(f"{len(rows)} evaluation(s), {parsed} parsed, {len(rows) - parsed} from cache")
+
+    if write_if_changed(args.output, render_markdown(rows, args.top)):
+        print(f"Wrote {os.path.relpath(args.output)}")
+    if args.html and write_if_changed(args.html, render_html(rows, args.top)):
+        print(f"Wrote {os.path.relpath(args.html)}")
+
+
+if __name__ == "__main__":
+    main()
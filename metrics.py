@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Prometheus-style metrics for the nightly run.
+
+Counters, gauges and histograms are kept in-process and written once at the
+end of a run in the text exposition format, ready for node_exporter's
+textfile collector. Set ``MODELS_METRICS_FILE`` (e.g. in ``.env``) to the
+``.prom`` path to enable the export; recording is always cheap and safe from
+worker threads.
+
+update_models, backfill and the queue drain each write their own file
+(``models.prom`` -> ``models-backfill.prom``, see ``textfile_path``) with a
+``job`` label on every sample, so one job never overwrites another's
+metrics and the collector never sees the same series twice.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+from atomic_file import atomic_write
+
+_lock = threading.Lock()
+_registry = []
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+def _format_value(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base for a named metric with per-label-set values."""
+
+    kind = 'untyped'
+    __slots__ = ('name', 'help', 'values')
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values = {}
+
+    @staticmethod
+    def _key(labels: dict) -> tuple:
+        return tuple(sorted(labels.items()))
+
+    def samples(self):
+        """Yield ``(suffix, labels, value)`` tuples for rendering."""
+        for key, value in sorted(self.values.items()):
+            yield '', key, value
+
+    def render(self, **extra) -> list:
+        """Text exposition lines, with ``extra`` labels added to every sample."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            labels = dict(labels, **extra).items() if extra else labels
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+    __slots__ = ()
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+    __slots__ = ()
+
+    def set(self, value, **labels):
+        with _lock:
+            self.values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+    __slots__ = ('buckets',)
+
+    def __init__(self, name: str, help: str, buckets):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with _lock:
+            counts, total = self.values.get(key, ([0] * len(self.buckets), 0.0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self.values[key] = (counts, total + value)
+
+    def samples(self):
+        for key, (counts, total) in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, counts):
+                yield '_bucket', key + (('le', _format_value(bound)),), count
+            yield '_sum', key, total
+            yield '_count', key, counts[-1]
+
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+
+def counter(name: str, help: str) -> Counter:
+    return _register(Counter(name, help))
+
+
+def gauge(name: str, help: str) -> Gauge:
+    return _register(Gauge(name, help))
+
+
+def histogram(name: str, help: str, buckets) -> Histogram:
+    return _register(Histogram(name, help, buckets))
+
+
+# Model list fetch
+FETCH_SECONDS = histogram(
+    'models_fetch_duration_seconds', "Wall time to fetch one provider's model list",
+    (0.25, 0.5, 1, 2.5, 5, 10, 30, 60))
+MODELS_LISTED = gauge('models_listed', "Models in the provider list after this run")
+MODELS_ADDED = counter('models_added_total', "Models newly listed by a provider")
+MODELS_REMOVED = counter('models_removed_total', "Models no longer listed by a provider")
+
+# HTTP traffic (phase is "fetch" or "eval"; code is the status or "error")
+HTTP_RESPONSES = counter('models_http_responses_total', "HTTP responses by status code")
+HTTP_RETRIES = counter('models_http_retries_total', "HTTP requests retried, by reason")
+
+# API key pools
+API_KEY_REQUESTS = counter('models_api_key_requests_total',
+                           "Eval requests sent, by key pool (auth env var) and key")
+API_KEY_RATE_LIMITED = counter('models_api_key_rate_limited_total',
+                               "HTTP 429s that put a key on cooldown, by key pool and key")
+
+# Evaluations
+EVAL_SECONDS = histogram(
+    'models_eval_duration_seconds', "Model response time during evaluation",
+    (1, 5, 10, 30, 60, 120, 300, 600))
+EVAL_RESULTS = counter('models_eval_results_total',
+                       "Evaluations by outcome (pass, fail, api_error, skipped, linked)")
+EVAL_FALLBACKS = counter('models_eval_fallbacks_total',
+                         "Refusal fallback tiers used, by whether they produced a response")
+EVAL_REQUEUES = counter('models_eval_requeues_total',
+                        "Queued evaluations returned to pending after a transient error")
+EVAL_HEDGES = counter('models_eval_hedges_total',
+                      "Hedge-eligible eval calls by outcome (not_hedged, original, hedge, failed)")
+EVAL_HEDGE_SAVED = counter('models_eval_hedge_saved_seconds_total',
+                           "Estimated seconds saved by hedges that won (p99 minus actual)")
+
+# Sandbox execution of extracted solutions
+EXEC_PEAK_RSS = histogram(
+    'models_exec_peak_rss_bytes', "Peak resident memory of a solution run",
+    (16 << 20, 32 << 20, 64 << 20, 128 << 20, 256 << 20, 512 << 20, 1 << 30))
+EXEC_CPU_SECONDS = histogram(
+    'models_exec_cpu_seconds', "CPU time used by a solution run",
+    (0.05, 0.1, 0.5, 1, 2.5, 5, 10))
+
+LAST_RUN = gauge('models_last_run_timestamp_seconds', "Unix time the run finished")
+
+
+def render(**extra) -> str:
+    """All registered metrics in the text exposition format."""
+    with _lock:
+        lines = [line for metric in _registry if metric.values for line in metric.render(**extra)]
+    return '\n'.join(lines) + '\n'
+
+
+def textfile_path(path, job: str) -> Path:
+    """``models.prom`` -> ``models-<job>.prom``: one file per job."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}-{job}{path.suffix}")
+
+
+def write_textfile(path=None, job: str = 'update_models'):
+    """
+    Atomically write ``job``'s metrics file (see ``textfile_path``); no-op
+    unless a path is configured. Returns the path written.
+    """
+    path = path or os.getenv('MODELS_METRICS_FILE')
+    if not path:
+        return None
+    LAST_RUN.set(round(time.time()), job=job)
+    path = textfile_path(path, job)
+    # The textfile collector may read at any moment, so never expose a
+    # half-written file.
+    atomic_write(path, render(job=job).encode())
+    print(f"Metrics written to {path}")
+    return path
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Route models to an evaluation type before spending an API call on them.
+
+The nightly run used to send the coding prompt to every new ID, including
+embedding, speech, image and video models that can never answer it. The
+classifier combines captured metadata (see ``model_metadata``) with name
+rules and returns ``(eval_type, reason)``:
+
+- ``'coding'``: run the coding evaluation
+- ``'skip'``: do not call the model; ``reason`` says why
+"""
+
+import re
+
+EVAL_CODING = 'coding'
+EVAL_SKIP = 'skip'
+
+# Name rules, checked in order against the lowercased model ID with any
+# ``models/`` or vendor prefix removed. Kept deliberately narrow: several
+# "-image" chat models (e.g. gemini-3-pro-image) answer the coding prompt
+# fine, so only families that are known to be non-chat are listed.
+NAME_RULES = [
+    ('embedding', re.compile(r'embed')),
+    ('moderation', re.compile(r'moderation')),
+    ('ocr', re.compile(r'(^|[-_])ocr([-_]|$)')),
+    ('text-to-speech', re.compile(r'(^|[-_])tts([-_]|$)')),
+    ('speech-to-text', re.compile(r'(^|[-_])(asr|transcribe|whisper)([-_]|$)')),
+    ('realtime audio', re.compile(r'realtime|native-audio|(^|[-_])live([-_]|$)|livetranslate')),
+    ('music generation', re.compile(r'^lyria')),
+    ('image generation', re.compile(r'^imagen|^gpt-image|^grok-(\d+-)?imagine-image|^grok-\d+-image|'
+                                    r'^qwen-image|^wan[\d.]*-image|image-generation')),
+    ('video generation', re.compile(r'^veo-|imagine-video|video-generation')),
+]
+
+# Gemini ``supportedGenerationMethods``: a model listing methods but none of
+# the generate ones is embedding/predict/live only.
+GEMINI_METHODS = {'generateContent', 'generateMessage', 'generateText', 'countTokens',
+                  'embedContent', 'batchEmbedContents', 'embedText', 'predict',
+                  'predictLongRunning', 'bidiGenerateContent', 'createCachedContent',
+                  'batchGenerateContent', 'generateAnswer'}
+GENERATE_METHODS = {'generateContent', 'generateMessage', 'generateText'}
+
+
+def _base_name(model):
+    """Lowercase ID without ``models/`` or ``vendor/`` prefixes."""
+    return model.lower().rsplit('/', 1)[-1]
+
+
+def classify_from_metadata(record):
+    """Classify from a normalized metadata record, or return None if unsure."""
+    if not record:
+        return None
+
+    outputs = record.get('output_modalities')
+    if outputs and 'text' not in outputs:
+        return EVAL_SKIP, f"metadata: no text output (outputs: {', '.join(outputs)})"
+
+    capabilities = set(record.get('capabilities') or ())
+    if capabilities & GEMINI_METHODS and not capabilities & GENERATE_METHODS:
+        return EVAL_SKIP, f"metadata: no generateContent support (methods: {', '.join(sorted(capabilities))})"
+
+    return None
+
+
+def classify_from_name(model):
+    """Classify from name rules, or return None when no rule matches."""
+    base = _base_name(model)
+    for category, pattern in NAME_RULES:
+        if pattern.search(base):
+            return EVAL_SKIP, f"name: {category} model"
+    return None
+
+
+def classify_model(model, record=None):
+    """Return ``(eval_type, reason)`` for a model ID and optional metadata."""
+    decision = classify_from_metadata(record) or classify_from_name(model)
+    if decision:
+        return decision
+    return EVAL_CODING, "default: chat-capable"
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Cross-provider model identity.
+
+The same underlying model is often listed several times: under a vendor
+prefix (``z-ai/glm-5.3``, ``ZHIPU/GLM-5.3``), with Gemini's ``models/``
+prefix, or as a ``-latest`` alias. ``canonical_name`` folds these
+spellings together, and ``IdentityIndex`` maps each canonical name to one
+evaluated representative so aliases can be linked to its result instead of
+paying for another evaluation.
+
+Dated snapshots (``-20250929``, ``-2025-09-29``) keep their date: two
+snapshots are different models even when they share a name, so
+``gpt-4o-2024-05-13`` never stands in for ``gpt-4o-2024-11-20``. An undated
+alias (``gpt-4o``, ``gpt-4o-latest``) resolves to the newest evaluated
+snapshot, but never the other way round: the undated eval may have been
+run against any earlier snapshot, so a new snapshot is always evaluated.
+
+Optionally the index also groups models whose stored eval responses are
+byte-for-byte identical after whitespace normalization (``fingerprints``),
+which catches aliases the name rules miss.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+import eval_queue
+from evaluate_model import link_evaluation
+from leaderboard import parse_eval
+
+EVAL_DIR = Path(__file__).parent / "evals"
+
+DATE_SUFFIX = re.compile(r'-(?:\d{8}|\d{4}-\d{2}-\d{2})$')
+ALIAS_SUFFIXES = ('-latest',)
+
+# An eval only stands in for its aliases when the model actually answered
+USABLE_STATUSES = ('pass', 'fail', 'error')
+
+
+def canonical_name(model: str) -> str:
+    """Normalize a provider model ID to a provider-independent name (date kept)."""
+    name = model.strip().lower()
+    # Vendor or resource prefixes: "models/", "z-ai/", "zhipu/"
+    name = name.rsplit('/', 1)[-1]
+    name = name.replace('_', '-')
+    # "glm-5.3" and "glm-5-3" are the same version
+    name = re.sub(r'(?<=\d)\.(?=\d)', '-', name)
+    for suffix in ALIAS_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name
+
+
+def undated_name(canonical: str) -> str:
+    """``gpt-4o-2024-08-06`` -> ``gpt-4o``; undated names are returned as is."""
+    return DATE_SUFFIX.sub('', canonical)
+
+
+def response_fingerprint(text: str) -> str:
+    """Hash of a response with whitespace collapsed, or None if empty."""
+    if not text or not text.strip():
+        return None
+    return hashlib.sha1(' '.join(text.split()).encode()).hexdigest()
+
+
+def _raw_response(text: str) -> str:
+    body = text.split('\n=== RAW RESPONSE ===\n', 1)
+    if len(body) < 2:
+        return None
+    return body[1].split('\n\n=== EXTRACTED CODE ===', 1)[0]
+
+
+class IdentityIndex:
+    """Canonical name -> evaluated representative, built from ``evals/``."""
+
+    def __init__(self):
+        self.representatives = {}   # canonical -> (model, eval filename)
+        self.aliases = {}           # canonical -> canonical it was merged into
+        self.claimed = {}           # canonical -> model being evaluated this run
+        self.deferred = []          # (provider, model) waiting on a claimed model
+
+    @classmethod
+    def build(cls, eval_dir=EVAL_DIR, fingerprints: bool = False) -> 'IdentityIndex':
+        index = cls()
+        by_fingerprint = {}
+        for path in sorted(Path(eval_dir).glob('eval-*.txt')):
+            text = path.read_text(errors='replace')
+            row = parse_eval(text)
+            if not row['model'] or row.get('linked_to') or row['status'] not in USABLE_STATUSES:
+                continue
+            canonical = canonical_name(row['model'])
+            index.representatives.setdefault(canonical, (row['model'], path.name))
+            if fingerprints:
+                fingerprint = response_fingerprint(_raw_response(text))
+                if fingerprint:
+                    first = by_fingerprint.setdefault(fingerprint, canonical)
+                    if first != canonical:
+                        index.aliases.setdefault(canonical, first)
+        return index
+
+    def group(self, model: str) -> str:
+        """
+        Undated name every possible alias of ``model`` shares -- coarse
+        enough that distinct snapshots share it too, so only use it to keep
+        aliases together (e.g. on one shard), never to link them.
+        """
+        canonical = canonical_name(model)
+        return undated_name(self.aliases.get(canonical, canonical))
+
+    def _related(self, canonical: str, names) -> list:
+        """
+        Keys among ``names`` that may stand in for ``canonical``, best first:
+        itself, its fingerprint alias, then (for an undated name only) its
+        snapshots, newest first.
+        """
+        keys = [canonical, self.aliases.get(canonical)]
+        if undated_name(canonical) == canonical:
+            keys += sorted((name for name in names
+                            if name != canonical and undated_name(name) == canonical), reverse=True)
+        return [key for key in keys if key in names]
+
+    def representative(self, model: str):
+        """``(model, eval filename)`` another model's result stands for, or None."""
+        for key in self._related(canonical_name(model), self.representatives):
+            found = self.representatives[key]
+            if found[0] != model:
+                return found
+        return None
+
+    def claim(self, provider: str, model: str) -> bool:
+        """
+        Reserve ``model`` as its group's representative for this run.
+
+        Returns False (and defers the model) when an alias of it has already
+        been claimed, so only one of them is evaluated.
+        """
+        canonical = canonical_name(model)
+        if any(self.claimed[key] != model for key in self._related(canonical, self.claimed)):
+            self.deferred.append((provider, model))
+            return False
+        self.claimed[canonical] = model
+        return True
+
+    def refresh(self, eval_dir=EVAL_DIR):
+        """Pick up results written since the index was built."""
+        fresh = IdentityIndex.build(eval_dir)
+        for canonical, found in fresh.representatives.items():
+            self.representatives.setdefault(canonical, found)
+
+
+def link_deferred(identity, conn):
+    """Link aliases deferred this run, or queue them if their group got no result."""
+    if identity is None or not identity.deferred:
+        return
+    identity.refresh()
+    retry = []
+    for provider, model in identity.deferred:
+        found = identity.representative(model)
+        if found:
+            link_evaluation(provider, model, *found)
+        else:
+            retry.append((provider, model))
+    if retry:
+        # Left for the next run's drain
+        eval_queue.enqueue(conn, retry)
+        print(f"Queued {len(retry)} alias(es) whose group has no usable result yet")
+
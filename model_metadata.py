@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Normalized model metadata captured from provider model-list responses.
+
+Each provider returns a different shape (OpenRouter ``context_length`` and
+``pricing``, Gemini ``inputTokenLimit`` and ``supportedGenerationMethods``,
+Anthropic ``created_at`` ...). ``normalize_record`` maps them onto one schema
+so capability filtering can happen locally without re-querying APIs:
+
+    id, name, created, context_window, max_output_tokens,
+    input_modalities, output_modalities, pricing, capabilities
+
+Fields a provider does not report are omitted. Records are stored one per
+line in ``<provider>.meta.jsonl`` next to the provider's ``.txt`` file.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+MODELS_DIR = Path(__file__).parent
+
+# Source keys per normalized field, tried in order
+CONTEXT_WINDOW_KEYS = ('context_length', 'context_window', 'inputTokenLimit',
+                       'max_context_length', 'max_input_tokens')
+MAX_OUTPUT_KEYS = ('max_output_tokens', 'outputTokenLimit', 'max_completion_tokens',
+                   'max_tokens')
+NAME_KEYS = ('display_name', 'displayName', 'name')
+
+
+def metadata_file_for(output_file):
+    """Return the metadata filename stored next to a provider ``.txt`` file."""
+    return Path(output_file).with_suffix('.meta.jsonl').name
+
+
+def _first(item, keys):
+    """Return the first non-empty value found under ``keys``."""
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def _normalize_created(value):
+    """Convert epoch seconds or ISO strings to an ISO date string."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc).strftime('%Y-%m-%d')
+    if isinstance(value, str):
+        return value[:10]
+    return None
+
+
+def _normalize_pricing(item):
+    """OpenRouter-style per-token USD pricing; other shapes are not comparable."""
+    pricing = item.get('pricing')
+    if not isinstance(pricing, dict):
+        return None
+    normalized = {}
+    for key in ('prompt', 'completion', 'image', 'request'):
+        value = pricing.get(key)
+        if value in (None, ''):
+            continue
+        try:
+            normalized[key] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return normalized or None
+
+
+def _normalize_capabilities(item):
+    """Collect capability flags (Mistral dict, Gemini generation methods)."""
+    capabilities = item.get('capabilities')
+    if isinstance(capabilities, dict):
+        return sorted(k for k, v in capabilities.items() if v is True)
+    if isinstance(capabilities, list):
+        return sorted(str(c) for c in capabilities)
+    methods = item.get('supportedGenerationMethods')
+    if isinstance(methods, list):
+        return sorted(methods)
+    return None
+
+
+def _normalize_modalities(item):
+    """Return (input_modalities, output_modalities)."""
+    architecture = item.get('architecture') if isinstance(item.get('architecture'), dict) else {}
+    inputs = item.get('input_modalities') or architecture.get('input_modalities')
+    outputs = item.get('output_modalities') or architecture.get('output_modalities')
+    if not inputs:
+        capabilities = item.get('capabilities')
+        if isinstance(capabilities, dict) and capabilities.get('vision'):
+            inputs = ['text', 'image']
+    return (sorted(inputs) if inputs else None,
+            sorted(outputs) if outputs else None)
+
+
+def normalize_record(item, id_field):
+    """Map one raw provider model object onto the normalized schema."""
+    record = {'id': item.get(id_field)}
+
+    name = _first({k: v for k, v in item.items() if k != id_field}, NAME_KEYS)
+    top_provider = item.get('top_provider') if isinstance(item.get('top_provider'), dict) else {}
+    inputs, outputs = _normalize_modalities(item)
+
+    record.update({
+        'name': name if isinstance(name, str) else None,
+        'created': _normalize_created(item.get('created', item.get('created_at'))),
+        'context_window': _first(item, CONTEXT_WINDOW_KEYS),
+        'max_output_tokens': _first(item, MAX_OUTPUT_KEYS) or top_provider.get('max_completion_tokens'),
+        'input_modalities': inputs,
+        'output_modalities': outputs,
+        'pricing': _normalize_pricing(item),
+        'capabilities': _normalize_capabilities(item),
+    })
+    return {k: v for k, v in record.items() if v is not None}
+
+
+def format_metadata(records):
+    """Serialize ``{model_id: record}`` as compact JSON lines sorted by id."""
+    lines = [
+        json.dumps(records[model_id], separators=(',', ':'), sort_keys=True)
+        for model_id in sorted(records)
+    ]
+    return ''.join(f"{line}\n" for line in lines)
+
+
+def read_metadata_file(output_file):
+    """Load ``{model_id: record}`` for a provider ``.txt`` file, if captured."""
+    file_path = MODELS_DIR / metadata_file_for(output_file)
+    if not file_path.exists():
+        return {}
+    records = {}
+    with open(file_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get('id'):
+                records[record['id']] = record
+    return records
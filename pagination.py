@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Pagination strategies for provider model-list endpoints.
+
+A ``PROVIDERS`` entry selects a strategy with a ``pagination`` dict, e.g.
+``{'strategy': 'page_token', 'page_size': 1000}``. Every strategy takes a
+``get(url, params)`` callable returning a ``requests.Response`` and returns
+the decoded JSON pages along with the total payload size:
+
+- ``none``: a single request (the default)
+- ``page_token``: Gemini style, ``nextPageToken`` -> ``pageToken``
+- ``after_id``: Anthropic style, ``has_more`` + ``last_id`` -> ``after_id``
+- ``offset``: ``limit``/``offset`` paging; pages are fetched concurrently
+  in windows of ``concurrency`` until a short page comes back
+
+Errors propagate so a partially fetched catalog is never mistaken for a
+complete one.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from tracing import span
+
+DEFAULT_MAX_PAGES = 100
+
+
+def _get_json(get, url, params):
+    """Fetch one page and return (data, payload_bytes)."""
+    with span('fetch.request', url=url):
+        response = get(url, params)
+        response.raise_for_status()
+    with span('fetch.json_decode', url=url):
+        data = response.json()
+    return data, len(response.content)
+
+
+def paginate_none(get, url, options):
+    """Single request, no pagination."""
+    data, size = _get_json(get, url, {})
+    return [data], size
+
+
+def paginate_page_token(get, url, options):
+    """Follow ``nextPageToken`` until the provider stops returning one."""
+    params = {options.get('size_param', 'pageSize'): options.get('page_size', 1000)}
+    pages, total_size = [], 0
+    for _ in range(options.get('max_pages', DEFAULT_MAX_PAGES)):
+        data, size = _get_json(get, url, params)
+        pages.append(data)
+        total_size += size
+        token = data.get('nextPageToken') if isinstance(data, dict) else None
+        if not token:
+            return pages, total_size
+        params = dict(params, pageToken=token)
+    raise RuntimeError(f"Gave up after {len(pages)} pages from {url}")
+
+
+def paginate_after_id(get, url, options):
+    """Follow ``has_more``/``last_id`` cursors (Anthropic list endpoints)."""
+    params = {'limit': options.get('page_size', 1000)}
+    pages, total_size = [], 0
+    for _ in range(options.get('max_pages', DEFAULT_MAX_PAGES)):
+        data, size = _get_json(get, url, params)
+        pages.append(data)
+        total_size += size
+        if not isinstance(data, dict) or not data.get('has_more') or not data.get('last_id'):
+            return pages, total_size
+        params = dict(params, after_id=data['last_id'])
+    raise RuntimeError(f"Gave up after {len(pages)} pages from {url}")
+
+
+def paginate_offset(get, url, options):
+    """Fetch ``limit``/``offset`` pages concurrently until a short page.
+
+    Offsets are independent, so each window of ``concurrency`` pages is
+    requested in parallel; the first page shorter than ``page_size`` (as
+    measured along ``items_key``) ends the walk.
+    """
+    page_size = options.get('page_size', 100)
+    concurrency = options.get('concurrency', 4)
+    items_key = options.get('items_key', 'data')
+    max_pages = options.get('max_pages', DEFAULT_MAX_PAGES)
+
+    def fetch(index):
+        return _get_json(get, url, {'limit': page_size, 'offset': index * page_size})
+
+    pages, total_size = [], 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for window_start in range(0, max_pages, concurrency):
+            window = range(window_start, min(window_start + concurrency, max_pages))
+            for data, size in executor.map(fetch, window):
+                pages.append(data)
+                total_size += size
+                items = data.get(items_key) if isinstance(data, dict) else None
+                if not items or len(items) < page_size:
+                    return pages, total_size
+    raise RuntimeError(f"Gave up after {len(pages)} pages from {url}")
+
+
+STRATEGIES = {
+    'none': paginate_none,
+    'page_token': paginate_page_token,
+    'after_id': paginate_after_id,
+    'offset': paginate_offset,
+}
+
+
+def fetch_pages(get, url, pagination=None):
+    """Fetch every page of ``url`` using the configured strategy."""
+    options = pagination or {}
+    strategy = STRATEGIES[options.get('strategy', 'none')]
+    return strategy(get, url, options)
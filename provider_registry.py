@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Provider registry shared by update_models, evaluate_model and update_readme.
+
+Everything known about a provider - model-list URLs, chat URL and request
+format, auth, pagination, rate limits and concurrency - lives in
+``providers.json`` and is loaded once into ``Provider`` objects. Entries with
+a ``list`` section are polled for model lists; entries with a ``chat``
+section can be evaluated against; list-only entries name the chat entry to
+use via ``chat_provider`` (e.g. OpenRouter vendor slices).
+
+Only the standard library is used so the README workflow can import this
+without installing requirements.
+"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+REGISTRY_FILE = Path(__file__).parent / "providers.json"
+
+
+class Provider:
+    """One ``providers.json`` entry."""
+
+    __slots__ = (
+        'name', 'display_name', 'auth', 'list_urls', 'json_path', 'output_file',
+        'filter_prefix', 'exclude_variant_suffix', 'pagination', 'chat_url',
+        'chat_format', 'strip_model_prefix', 'chat_alternatives', 'chat_provider', 'concurrency',
+        'rate_limit', '_chat_endpoint',
+    )
+
+    def __init__(self, name: str, entry: dict, defaults: dict):
+        listing = entry.get('list') or {}
+        chat = entry.get('chat') or {}
+
+        self.name = name
+        self.display_name = entry.get('display_name', name)
+        self.auth = entry.get('auth') or {}
+        self.list_urls = tuple(listing.get('urls', ()))
+        self.json_path = tuple(listing.get('json_path', ()))
+        self.output_file = listing.get('output_file')
+        self.filter_prefix = listing.get('filter_prefix')
+        self.exclude_variant_suffix = listing.get('exclude_variant_suffix', False)
+        self.pagination = listing.get('pagination')
+        self.chat_url = chat.get('url')
+        self.chat_format = chat.get('format')
+        self.strip_model_prefix = chat.get('strip_model_prefix')
+        # Other chat entries (same auth, different endpoint) to probe when a
+        # model rejects this endpoint
+        self.chat_alternatives = tuple(chat.get('alternatives', ()))
+        self.chat_provider = entry.get('chat_provider') or (name if chat else None)
+        self.concurrency = entry.get('concurrency', defaults.get('concurrency', 1))
+        self.rate_limit = entry.get('rate_limit', defaults.get('rate_limit', {}))
+        self._chat_endpoint = None
+
+    def __repr__(self):
+        return f"Provider({self.name!r})"
+
+    @property
+    def lists_models(self) -> bool:
+        return bool(self.list_urls and self.output_file)
+
+    @property
+    def requests_per_minute(self):
+        return self.rate_limit.get('requests_per_minute')
+
+    def api_keys(self) -> list:
+        """
+        Every configured API key, in order: the auth env var split on commas,
+        then one key per line of the file named by ``<env>_FILE`` (blank and
+        ``#`` lines skipped). Duplicates are dropped.
+        """
+        env = self.auth.get('env')
+        if not env:
+            return []
+        keys = [key.strip() for key in os.getenv(env, '').split(',') if key.strip()]
+        key_file = os.getenv(f"{env}_FILE")
+        if key_file:
+            with open(key_file) as f:
+                keys += [line.strip() for line in f
+                         if line.strip() and not line.lstrip().startswith('#')]
+        return list(dict.fromkeys(keys))
+
+    def api_key(self):
+        """The provider's first API key from the environment, or None."""
+        keys = self.api_keys()
+        return keys[0] if keys else None
+
+    def auth_headers(self, api_key=None) -> dict:
+        """Headers carrying the API key (none for query-string auth)."""
+        key = api_key if api_key is not None else self.api_key()
+        scheme = self.auth.get('scheme', 'bearer')
+        headers = dict(self.auth.get('extra_headers', {}))
+        if scheme == 'bearer':
+            headers['Authorization'] = f"Bearer {key}"
+        elif scheme == 'header':
+            headers[self.auth['header']] = key
+        return headers
+
+    def auth_params(self, api_key=None) -> dict:
+        """Query parameters carrying the API key (query-string auth only)."""
+        if self.auth.get('scheme') != 'query':
+            return {}
+        key = api_key if api_key is not None else self.api_key()
+        return {self.auth.get('param', 'key'): key}
+
+    def chat_url_for(self, model: str, api_key=None) -> str:
+        """Resolve the chat URL for a model, including query-string auth."""
+        if self.strip_model_prefix:
+            model = model.removeprefix(self.strip_model_prefix)
+        url = self.chat_url.format(model=model)
+        params = self.auth_params(api_key)
+        if params:
+            url += '?' + '&'.join(f"{k}={v}" for k, v in params.items())
+        return url
+
+    def list_config(self) -> dict:
+        """Model-list settings in the shape ``update_models.fetch_models`` reads."""
+        config = {
+            'urls': list(self.list_urls),
+            'headers': self.auth_headers,
+            'params': self.auth_params,
+            'json_path': list(self.json_path),
+            'output_file': self.output_file,
+        }
+        if self.filter_prefix:
+            config['filter_prefix'] = self.filter_prefix
+        if self.exclude_variant_suffix:
+            config['exclude_variant_suffix'] = True
+        if self.pagination:
+            config['pagination'] = self.pagination
+        if self.chat_provider and self.chat_provider != self.name:
+            config['chat_provider'] = self.chat_provider
+        return config
+
+    def chat_endpoint(self):
+        """Chat settings in the shape ``evaluate_model`` reads, built once.
+
+        ``url`` is a string, or a callable taking the model name (and an
+        optional API key) when the URL embeds the model or query-string auth.
+        ``headers`` likewise takes an optional key; both default to the
+        first configured key.
+        """
+        if not self.chat_url:
+            return None
+        if self._chat_endpoint is None:
+            if '{model}' in self.chat_url or self.auth.get('scheme') == 'query':
+                url = self.chat_url_for
+            else:
+                url = self.chat_url
+            self._chat_endpoint = {
+                'url': url,
+                'headers': lambda api_key=None: {**self.auth_headers(api_key),
+                                                 'Content-Type': 'application/json'},
+                'format': self.chat_format,
+            }
+        return self._chat_endpoint
+
+
+@lru_cache(maxsize=None)
+def load_registry(path=REGISTRY_FILE) -> dict:
+    """Load ``providers.json`` into ``{name: Provider}`` (cached per path)."""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    defaults = data.get('defaults', {})
+    return {name: Provider(name, entry, defaults) for name, entry in data['providers'].items()}
+
+
+def get_provider(name: str):
+    """Return the ``Provider`` called ``name``, or None."""
+    return load_registry().get(name)
+
+
+def list_providers() -> list:
+    """Providers whose model lists are polled, in registry order."""
+    return [p for p in load_registry().values() if p.lists_models]
+
+
+def chat_parent(name: str) -> str:
+    """
+    The entry that lists ``name`` among its ``chat.alternatives``
+    (``openai_responses`` -> ``openai``), else ``name`` itself.
+    """
+    for entry in load_registry().values():
+        if name in entry.chat_alternatives:
+            return entry.name
+    return name
+
+
+def listing_provider(name: str, model: str) -> str:
+    """
+    The model-list entry a model evaluated through chat entry ``name`` comes
+    from: ``openai_responses`` -> ``openai``, and ``openrouter`` with
+    ``nvidia/...`` -> ``nvidia`` (matched on ``filter_prefix``). Falls back
+    to the chat entry when no list entry claims the model.
+    """
+    name = chat_parent(name)
+    listers = [p for p in list_providers() if p.chat_provider == name]
+    for entry in listers:
+        if entry.filter_prefix and (model or '').startswith(entry.filter_prefix):
+            return entry.name
+    for entry in listers:
+        if entry.name == name or not entry.filter_prefix:
+            return entry.name
+    return name
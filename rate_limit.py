@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Per-provider request pacing and API key rotation for the evaluation HTTP layer.
+
+Each provider's ``rate_limit.requests_per_minute`` from ``providers.json``
+becomes a minimum spacing between request start times. Slots are reserved
+synchronously and waited out with ``asyncio.sleep``, so the limiter holds no
+loop-bound primitives and can be shared across ``asyncio.run`` calls.
+
+API keys (see ``Provider.api_keys``) are pooled per auth env var, not per
+provider: ``openai``, ``openai_responses`` and ``openai_completion`` all send
+``OPENAI_API_KEY``, so they share one ``KeyPool`` and one budget per key, and
+a 429 on one endpoint cools the key down for all of them. The pool paces
+each key at the highest ``requests_per_minute`` of the providers sharing it;
+a provider with a lower limit (an OpenRouter vendor slice, say) is also
+held to its own. Requests go to the key with the earliest free slot, and a
+key that draws an HTTP 429 sits out ``COOLDOWN_SECONDS`` while the others
+carry on.
+"""
+
+import asyncio
+import time
+
+import metrics
+from provider_registry import get_provider, load_registry
+
+# How long a key is skipped after an HTTP 429
+COOLDOWN_SECONDS = 60
+
+
+class RateLimiter:
+    """Spaces calls to ``acquire`` at least ``60 / requests_per_minute`` apart."""
+
+    __slots__ = ('interval', 'next_free')
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.next_free = 0.0
+
+    def reserve(self) -> float:
+        """Claim the next slot; returns how long the caller must wait."""
+        now = time.monotonic()
+        start = max(now, self.next_free)
+        self.next_free = start + self.interval
+        return start - now
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ApiKey:
+    """One key of a pool, with its own pacing and usage counters."""
+
+    __slots__ = ('value', 'limiter', 'cooldown_until', 'requests', 'rate_limited')
+
+    def __init__(self, value: str, requests_per_minute):
+        self.value = value
+        self.limiter = RateLimiter(requests_per_minute)
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.rate_limited = 0
+
+    @property
+    def label(self) -> str:
+        """Enough of the key to tell pool members apart in logs."""
+        return f"...{self.value[-4:]}"
+
+    def available_at(self, now: float) -> float:
+        return max(now, self.cooldown_until, self.limiter.next_free)
+
+
+class KeyPool:
+    """The API keys behind one auth env var; with none configured it is a plain limiter."""
+
+    __slots__ = ('name', 'keys', 'limiter')
+
+    def __init__(self, name: str, keys: list, requests_per_minute):
+        self.name = name
+        self.keys = [ApiKey(key, requests_per_minute) for key in keys]
+        self.limiter = RateLimiter(requests_per_minute)
+
+    async def acquire(self):
+        """Wait for the next free slot; returns the key to use (None = default)."""
+        if not self.keys:
+            await self.limiter.acquire()
+            return None
+        now = time.monotonic()
+        key = min(self.keys, key=lambda k: (k.available_at(now), k.requests))
+        key.limiter.next_free = max(key.limiter.next_free, key.cooldown_until)
+        key.requests += 1
+        metrics.API_KEY_REQUESTS.inc(pool=self.name, key=key.label)
+        await key.limiter.acquire()
+        return key.value
+
+    def report(self, api_key: str, error: str = None):
+        """Note a request's outcome; an HTTP 429 puts its key on cooldown."""
+        if not (error and error.startswith('HTTP 429')):
+            return
+        for key in self.keys:
+            if key.value == api_key:
+                key.rate_limited += 1
+                key.cooldown_until = time.monotonic() + COOLDOWN_SECONDS
+                metrics.API_KEY_RATE_LIMITED.inc(pool=self.name, key=key.label)
+
+    def usage(self) -> list:
+        """``[(label, requests, share of pool requests, 429s), ...]``."""
+        total = sum(key.requests for key in self.keys) or 1
+        return [(key.label, key.requests, key.requests / total, key.rate_limited)
+                for key in self.keys]
+
+
+_pools = {}
+_provider_limiters = {}
+
+
+def pool_name(provider: str) -> str:
+    """The auth env var ``provider`` sends its key from (its own name without one)."""
+    entry = get_provider(provider)
+    return (entry.auth.get('env') if entry else None) or provider
+
+
+def pool_for(provider: str) -> KeyPool:
+    """Return the key pool shared by every provider using ``provider``'s keys."""
+    name = pool_name(provider)
+    if name not in _pools:
+        entry = get_provider(provider)
+        limits = [other.requests_per_minute for other in load_registry().values()
+                  if pool_name(other.name) == name]
+        rpm = None if None in limits or not limits else max(limits)
+        _pools[name] = KeyPool(name, entry.api_keys() if entry else [], rpm)
+    return _pools[name]
+
+
+def _provider_limiter(provider: str):
+    """A limiter for a provider held to a lower rate than its pool, else None."""
+    if provider not in _provider_limiters:
+        entry = get_provider(provider)
+        rpm = entry.requests_per_minute if entry else None
+        pool = pool_for(provider)
+        stricter = rpm and (not pool.limiter.interval or 60.0 / rpm > pool.limiter.interval)
+        _provider_limiters[provider] = RateLimiter(rpm) if stricter else None
+    return _provider_limiters[provider]
+
+
+async def throttle(provider: str):
+    """
+    Wait until ``provider`` may start another request. Returns the API key
+    to send it with, or None for the provider's default.
+    """
+    limiter = _provider_limiter(provider)
+    if limiter:
+        await limiter.acquire()
+    return await pool_for(provider).acquire()
+
+
+def report(provider: str, api_key: str, error: str = None):
+    """Feed a request's outcome back to the key pool ``provider`` draws from."""
+    if api_key is not None:
+        pool_for(provider).report(api_key, error)
+
+
+def key_usage_lines() -> list:
+    """Per-key utilization for every pool with more than one key."""
+    lines = []
+    for name, pool in sorted(_pools.items()):
+        if len(pool.keys) < 2:
+            continue
+        lines.append(f"API key usage for {name}:")
+        for label, requests, share, limited in pool.usage():
+            lines.append(f"  {label}: {requests} requests ({share:.0%}), {limited} rate-limited")
+    return lines
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Compare one model across reasoning-effort / thinking-budget levels.
+
+Runs the normal evaluation (every selected task) once per level --
+the provider default plus each of ``evaluate_model.REASONING_LEVELS`` --
+concurrently, and writes one Markdown report with response time, token
+usage and correctness side by side, so routing can pick the cheapest level
+that still passes. The model's regular eval file is left untouched.
+
+Usage:
+    python reasoning_sweep.py <provider> <model> [--levels low,medium,high] [--output PATH]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+import endpoint_probe
+from evaluate_model import (EVAL_DIR, REASONING_FORMATS, REASONING_LEVELS, client_session,
+                            eval_filename, eval_outcome, evaluate_model_async,
+                            get_chat_endpoint, resolve_openai_provider)
+
+DEFAULT_LEVEL = 'default'
+
+
+def parse_levels(text: str) -> list:
+    """``"default,low,high"`` -> ``[None, 'low', 'high']`` (None = provider default)."""
+    levels = []
+    for name in (part.strip() for part in text.split(',')):
+        if name == DEFAULT_LEVEL:
+            levels.append(None)
+        elif name in REASONING_LEVELS:
+            levels.append(name)
+        elif name:
+            raise argparse.ArgumentTypeError(
+                f"unknown level {name!r} (choose from {DEFAULT_LEVEL}, {', '.join(REASONING_LEVELS)})")
+    return levels
+
+
+def report_filename(model: str) -> str:
+    return 'sweep-' + eval_filename(model)[len('eval-'):-len('.txt')] + '.md'
+
+
+async def sweep_async(provider: str, model: str, levels, session=None) -> list:
+    """Evaluate ``model`` at every level concurrently; returns ``[(level, results), ...]``."""
+    async with client_session(session) as session:
+        all_results = await asyncio.gather(*(
+            evaluate_model_async(provider, model, session, reasoning=level) for level in levels))
+    return list(zip(levels, all_results))
+
+
+def _cell(value, suffix='') -> str:
+    return '–' if value is None else f"{value}{suffix}"
+
+
+def render_report(provider: str, model: str, rows: list) -> str:
+    lines = [
+        f"# Reasoning sweep: {model}",
+        "",
+        f"Provider: `{provider}`. Generated by `reasoning_sweep.py`; "
+        f"\"{DEFAULT_LEVEL}\" sends no reasoning setting.",
+        "",
+        "| Level | Result | Score | Response time | Input tokens | Output tokens | Reasoning tokens |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for level, results in rows:
+        usage = results.get('usage') or {}
+        outcome = eval_outcome(results)
+        if results.get('api_error'):
+            outcome += f" ({results['api_error'][:60]})"
+        lines.append('| ' + ' | '.join([
+            level or DEFAULT_LEVEL, outcome.replace('|', '\\|'), f"{results['score']:.2f}",
+            _cell(results['response_time'], 's'), _cell(usage.get('input_tokens')),
+            _cell(usage.get('output_tokens')), _cell(usage.get('reasoning_tokens')),
+        ]) + ' |')
+
+    passing = [(results['response_time'], level or DEFAULT_LEVEL) for level, results in rows
+               if eval_outcome(results) == 'pass']
+    lines += ["", f"Fastest passing level: {min(passing)[1]}" if passing else "No level passed."]
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate a model across reasoning levels")
+    parser.add_argument('provider')
+    parser.add_argument('model')
+    parser.add_argument('--levels', type=parse_levels,
+                        default=[None, *REASONING_LEVELS],
+                        help=f"comma-separated levels (default: {DEFAULT_LEVEL},{','.join(REASONING_LEVELS)})")
+    parser.add_argument('--output', help="report path (default: evals/sweep-<model>.md)")
+    args = parser.parse_args()
+
+    provider = args.provider
+    if provider == 'openai':
+        provider = endpoint_probe.candidates(provider, args.model, resolve_openai_provider(args.model))[0]
+    endpoint = get_chat_endpoint(provider)
+    if not endpoint or endpoint['format'] not in REASONING_FORMATS:
+        print(f"{provider} has no reasoning setting to sweep")
+        sys.exit(1)
+
+    rows = asyncio.run(sweep_async(provider, args.model, args.levels))
+    output = args.output or EVAL_DIR / report_filename(args.model)
+    with open(output, 'w') as f:
+        f.write(render_report(provider, args.model, rows))
+    print(f"Wrote {os.path.relpath(output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Resource-limited execution of model-written Python.
+
+``run_script`` runs a script in a fresh interpreter inside a throwaway
+working directory with:
+
+- ``RLIMIT_AS`` (address space), ``RLIMIT_CPU`` and ``RLIMIT_FSIZE`` caps, so a
+  runaway allocation, busy loop or disk fill is stopped by the kernel;
+- ``RLIMIT_NPROC`` at zero, so the script cannot fork (ignored when running
+  as root, where only the other limits apply);
+- a scrubbed environment, so API keys from ``.env`` never reach model code.
+
+``IMPORT_GUARD`` is a prelude for the script itself that restricts what the
+solution may import to ``ALLOWED_IMPORTS``. It is a guard against accidents
+rather than a security boundary; the rlimits are what protect the host.
+"""
+
+import asyncio
+import os
+import signal
+import tempfile
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+MEMORY_LIMIT_BYTES = 1 << 30
+FILE_SIZE_LIMIT_BYTES = 16 << 20
+
+# Top-level modules a solution may import
+ALLOWED_IMPORTS = frozenset({
+    'array', 'bisect', 'collections', 'copy', 'dataclasses', 'decimal', 'enum',
+    'fractions', 'functools', 'heapq', 'itertools', 'json', 'math', 'operator',
+    're', 'statistics', 'string', 'sys', 'typing', '__future__',
+})
+
+# Installed after the wrapper's own imports; only imports issued by the
+# solution (module ``__main__``) are checked, so the stdlib's internal
+# imports are unaffected.
+IMPORT_GUARD = f'''
+import builtins as __sandbox_builtins
+__sandbox_allowed = {sorted(ALLOWED_IMPORTS)!r}
+__sandbox_import = __sandbox_builtins.__import__
+
+def __sandbox_guarded_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level == 0 and (globals or {{}}).get('__name__') == '__main__' \\
+            and name.split('.')[0] not in __sandbox_allowed:
+        raise ImportError(f"import of {{name!r}} is not allowed in the sandbox")
+    return __sandbox_import(name, globals, locals, fromlist, level)
+
+__sandbox_builtins.__import__ = __sandbox_guarded_import
+'''
+
+# Expression evaluated inside the script to self-report resource usage
+USAGE_EXPR = (
+    '{"peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, '
+    '"cpu_seconds": round(sum(resource.getrusage(resource.RUSAGE_SELF)[:2]), 3)}'
+)
+
+SIGNAL_ERRORS = {
+    getattr(signal, 'SIGXCPU', None): "CPU time limit exceeded",
+    getattr(signal, 'SIGXFSZ', None): "File size limit exceeded",
+    signal.SIGKILL: "Killed",
+}
+
+
+def limit_resources(cpu_seconds: int, memory_bytes: int = MEMORY_LIMIT_BYTES):
+    """Return a ``preexec_fn`` applying the sandbox rlimits in the child."""
+    def apply():
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (FILE_SIZE_LIMIT_BYTES, FILE_SIZE_LIMIT_BYTES))
+        resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    return apply if resource else None
+
+
+def signal_error(returncode: int) -> str:
+    """Describe a child killed by a signal, or None."""
+    if returncode is None or returncode >= 0:
+        return None
+    return SIGNAL_ERRORS.get(-returncode, f"Killed by signal {-returncode}")
+
+
+async def run_script(script: str, timeout: int) -> tuple[int, str, str]:
+    """
+    Run ``script`` in the sandbox and return (returncode, stdout, stderr).
+
+    Raises ``asyncio.TimeoutError`` after ``timeout`` seconds of wall time
+    (the child is killed first).
+    """
+    with tempfile.TemporaryDirectory(prefix='models-sandbox-') as workdir:
+        script_path = os.path.join(workdir, 'solution.py')
+        with open(script_path, 'w') as f:
+            f.write(script)
+
+        env = {'PATH': os.environ.get('PATH', ''), 'HOME': workdir, 'LANG': 'C.UTF-8'}
+        proc = await asyncio.create_subprocess_exec(
+            'python3', '-I', script_path,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=workdir,
+            env=env,
+            # The wall-clock timeout normally fires first; the CPU cap is a
+            # backstop for anything that outlives it.
+            preexec_fn=limit_resources(timeout + 1),
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return proc.returncode, stdout.decode(errors='replace'), stderr.decode(errors='replace')
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Split evaluation batches across machines and merge their results.
+
+``backfill.py --shard i/N`` keeps only the jobs whose stable hash of
+``provider/model`` falls in shard ``i`` (1-based) of ``N``, so N hosts --
+each behind its own per-IP rate limits -- can work through one backlog
+without coordinating. Every host computes the same split because the hash
+is SHA-1, not Python's per-process salted ``hash``. When aliases are being
+linked, backfill hashes the model's identity group instead, so all aliases
+of a model land on the same host and only one of them is evaluated.
+
+Afterwards each host's ``evals/`` directory is copied back and merged:
+
+    python sharding.py merge host1/evals host2/evals ...
+
+Eval files missing locally are copied in. When both sides have a file, a
+real evaluation beats a linked or skipped placeholder, and otherwise the
+later ``Evaluated:`` timestamp wins. The shards' latency histories,
+remembered fallback tiers and probed endpoint formats are folded into the
+local stores, and jobs the shards finished are marked done in the local
+``eval_queue``.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import endpoint_probe
+import eval_queue
+import fallback_memory
+import latency_stats
+from atomic_file import write_json
+from leaderboard import parse_eval
+
+EVAL_DIR = Path(__file__).parent / "evals"
+
+EVALUATED = re.compile(r'^Evaluated: (.*)$', re.M)
+
+
+def parse_shard(text: str) -> tuple:
+    """``"2/4"`` -> ``(2, 4)``; used as an argparse ``type``."""
+    index, sep, count = text.partition('/')
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        index = count = 0
+    if not sep or count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"expected i/N with 1 <= i <= N, got {text!r}")
+    return index, count
+
+
+def shard_of(key: str, count: int) -> int:
+    """1-based shard that ``key`` (normally ``provider/model``) belongs to out of ``count``."""
+    digest = hashlib.sha1(key.encode()).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
+
+
+def in_shard(key: str, shard) -> bool:
+    """True when there is no ``shard`` or ``key`` belongs to it."""
+    return shard is None or shard_of(key, shard[1]) == shard[0]
+
+
+def _rank(text: str) -> tuple:
+    row = parse_eval(text)
+    real = not row['linked_to'] and row['status'] != 'skipped'
+    evaluated = EVALUATED.search(text)
+    return real, evaluated.group(1) if evaluated else ''
+
+
+def merge_evals(sources, eval_dir=EVAL_DIR) -> dict:
+    """
+    Merge eval files from each shard directory in ``sources`` into
+    ``eval_dir``. Returns counts (``added``, ``replaced``, ``kept``) and the
+    ``(provider, model)`` jobs whose file came from a shard as ``jobs``,
+    keyed by the provider they were queued under.
+    """
+    eval_dir = Path(eval_dir)
+    eval_dir.mkdir(exist_ok=True)
+    summary = {'added': 0, 'replaced': 0, 'kept': 0, 'jobs': []}
+    for source in sources:
+        for path in sorted(Path(source).glob('eval-*.txt')):
+            incoming = path.read_text(errors='replace')
+            target = eval_dir / path.name
+            if target.exists():
+                current = target.read_text(errors='replace')
+                if current == incoming or _rank(current) >= _rank(incoming):
+                    summary['kept'] += 1
+                    continue
+                summary['replaced'] += 1
+            else:
+                summary['added'] += 1
+            target.write_text(incoming)
+            row = parse_eval(incoming)
+            if row['provider'] and row['model']:
+                summary['jobs'].append((endpoint_probe.queue_provider(row['provider']), row['model']))
+    return summary
+
+
+def _load_json(path: Path) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _append_new(local: list, incoming: list) -> list:
+    """``local`` plus the samples ``incoming`` gained since it was copied from it."""
+    for overlap in range(min(len(local), len(incoming)), 0, -1):
+        if local[-overlap:] == incoming[:overlap]:
+            return local + incoming[overlap:]
+    return local + incoming
+
+
+def merge_stores(sources, eval_dir=EVAL_DIR):
+    """
+    Fold the shards' latency histories, fallback tiers and probed endpoint
+    formats into the local stores.
+    """
+    eval_dir = Path(eval_dir)
+    latency_path = eval_dir / latency_stats.STORE_FILE.name
+    latency = _load_json(latency_path)
+    # ModelMemory stores: the shard's value wins per model and family
+    memories = {path: _load_json(path) for path in (eval_dir / fallback_memory.STORE_FILE.name,
+                                                    eval_dir / endpoint_probe.STORE_FILE.name)}
+    for source in sources:
+        for key, samples in _load_json(Path(source) / latency_path.name).items():
+            latency[key] = _append_new(latency.get(key, []), samples)[-latency_stats.WINDOW:]
+        for path, memory in memories.items():
+            for section, entries in _load_json(Path(source) / path.name).items():
+                memory.setdefault(section, {}).update(entries)
+    if latency:
+        write_json(latency_path, latency)
+    for path, memory in memories.items():
+        if memory:
+            write_json(path, memory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge sharded evaluation results")
+    sub = parser.add_subparsers(dest='command', required=True)
+    merge_cmd = sub.add_parser('merge', help="merge shard eval directories into evals/")
+    merge_cmd.add_argument('sources', nargs='+', help="a shard's evals/ directory")
+    args = parser.parse_args()
+
+    summary = merge_evals(args.sources)
+    merge_stores(args.sources)
+    conn = eval_queue.connect()
+    done = eval_queue.mark_done(conn, summary['jobs'])
+    print(f"Merged {len(args.sources)} shard(s): {summary['added']} added, "
+          f"{summary['replaced']} replaced, {summary['kept']} kept; {done} queued job(s) marked done")
+
+
+if __name__ == "__main__":
+    main()
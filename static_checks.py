@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+AST pre-pass over extracted solutions.
+
+``analyze`` inspects code returned by ``evaluate_model.extract_code`` before
+it is executed. Candidates that cannot possibly produce an answer -- no
+module-level entry point taking the task's arguments, reads from stdin,
+network or process imports, an unconditional ``while True`` with no way
+out -- are rejected without spawning a subprocess. Loop nesting and recursion are reported as
+informational findings.
+"""
+
+import ast
+
+ENTRY_POINT = 'solve_grid'
+
+# Top-level modules a solution has no business importing
+FORBIDDEN_IMPORTS = {
+    'socket', 'ssl', 'http', 'urllib', 'urllib2', 'urllib3', 'requests', 'httpx',
+    'aiohttp', 'ftplib', 'smtplib', 'telnetlib', 'subprocess', 'multiprocessing',
+    'pty', 'ctypes',
+}
+
+# Calls that block on or escape to the outside world
+FORBIDDEN_CALLS = {'input', 'breakpoint', 'exec', 'eval', '__import__'}
+FORBIDDEN_ATTR_CALLS = {('os', 'system'), ('os', 'popen'), ('os', 'fork'),
+                        ('sys', 'exit'), ('os', '_exit')}
+
+
+def _loop_depth(node, depth=0) -> int:
+    deepest = depth
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            # Nested functions start their own nesting
+            deepest = max(deepest, _loop_depth(child, 0))
+        elif isinstance(child, (ast.For, ast.AsyncFor, ast.While, ast.comprehension)):
+            deepest = max(deepest, _loop_depth(child, depth + 1))
+        else:
+            deepest = max(deepest, _loop_depth(child, depth))
+    return deepest
+
+
+def _escapes(loop: ast.While) -> bool:
+    """True when a ``while`` body can leave the loop (break/return/raise)."""
+    stack = list(loop.body)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.Return, ast.Raise)):
+            return True
+        if isinstance(node, ast.Break):
+            return True
+        if isinstance(node, (ast.For, ast.AsyncFor, ast.While)):
+            # A break in an inner loop only leaves that loop
+            stack.extend(child for child in ast.walk(node)
+                         if isinstance(child, (ast.Return, ast.Raise)))
+            continue
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            continue
+        stack.extend(ast.iter_child_nodes(node))
+    return False
+
+
+def _is_always_true(test) -> bool:
+    return isinstance(test, ast.Constant) and bool(test.value)
+
+
+def _recursive_functions(tree) -> list:
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if any(isinstance(call, ast.Call) and isinstance(call.func, ast.Name)
+                   and call.func.id == node.name for call in ast.walk(node)):
+                names.append(node.name)
+    return names
+
+
+def _check_signature(tree, entry_point: str, arity: int) -> str:
+    """Problem with the entry point's definition, or None."""
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == entry_point:
+            args = node.args
+            positional = args.posonlyargs + args.args
+            required = len(positional) - len(args.defaults)
+            if required > arity:
+                return f"{entry_point} requires {required} arguments"
+            if len(positional) < arity and not args.vararg:
+                return f"{entry_point} takes {len(positional) or 'no'} arguments"
+            return None
+        if isinstance(node, ast.AsyncFunctionDef) and node.name == entry_point:
+            return f"{entry_point} is async"
+    return f"{entry_point} not defined at module level"
+
+
+def analyze(code: str, entry_point: str = ENTRY_POINT, arity: int = 1) -> dict:
+    """
+    Statically check a candidate solution whose ``entry_point`` will be
+    called with ``arity`` positional arguments.
+
+    Returns ``{'fatal': reason or None, 'findings': [...], 'loop_depth': n,
+    'recursive': [names]}``. ``fatal`` is the first problem that makes the
+    candidate hopeless; every problem found is listed in ``findings``.
+    """
+    report = {'fatal': None, 'findings': [], 'loop_depth': 0, 'recursive': []}
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError) as e:
+        report['fatal'] = f"unparseable: {e}"
+        report['findings'].append(report['fatal'])
+        return report
+
+    problems = []
+    signature_problem = _check_signature(tree, entry_point, arity)
+    if signature_problem:
+        problems.append(signature_problem)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            modules = [node.module or '']
+        else:
+            modules = []
+        for module in modules:
+            if module.split('.')[0] in FORBIDDEN_IMPORTS:
+                problems.append(f"forbidden import: {module}")
+
+        if isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Name) and func.id in FORBIDDEN_CALLS:
+                problems.append(f"forbidden call: {func.id}()")
+            elif (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+                  and (func.value.id, func.attr) in FORBIDDEN_ATTR_CALLS):
+                problems.append(f"forbidden call: {func.value.id}.{func.attr}()")
+
+        if isinstance(node, ast.While) and _is_always_true(node.test) and not _escapes(node):
+            problems.append(f"infinite loop at line {node.lineno}")
+
+    report['loop_depth'] = _loop_depth(tree)
+    report['recursive'] = _recursive_functions(tree)
+    report['findings'] = problems + [f"loop nesting depth {report['loop_depth']}"]
+    if report['recursive']:
+        report['findings'].append(f"recursive: {', '.join(report['recursive'])}")
+    if problems:
+        report['fatal'] = problems[0]
+    return report
+
+
+def format_report(report: dict) -> str:
+    """One-line summary for eval files."""
+    status = f"REJECTED ({report['fatal']})" if report['fatal'] else "OK"
+    return f"{status}; " + '; '.join(report['findings'])
@@ -0,0 +1,43 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import backfill
+import provider_registry
+
+
+class FindMissingTest(unittest.TestCase):
+    def test_find_missing_uses_eval_filename_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "evals").mkdir()
+            (root / "evals" / "eval-models_gemini-3-pro.txt").write_text("")
+            (root / "gemini.txt").write_text("models/gemini-3-pro\nmodels/gemini-4\n")
+
+            with mock.patch.object(backfill, "MODELS_DIR", root), \
+                    mock.patch.object(backfill, "read_metadata_file", return_value={}):
+                missing = backfill.find_missing(
+                    [provider_registry.get_provider("gemini")], eval_dir=root / "evals")
+
+        self.assertEqual(missing, [("gemini", "models/gemini-4", None)])
+
+    def test_prioritize_puts_newest_dated_models_first(self):
+        missing = [
+            ("openai", "undated-a", None),
+            ("openai", "old", {"created": "2025-01-01"}),
+            ("openai", "undated-b", {}),
+            ("openai", "new", {"created": "2026-06-01"}),
+        ]
+
+        ordered = [model for _, model, _ in backfill.prioritize(missing)]
+
+        self.assertEqual(ordered, ["new", "old", "undated-a", "undated-b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
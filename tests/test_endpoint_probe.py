@@ -0,0 +1,79 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import endpoint_probe
+import evaluate_model
+import fallback_memory
+
+WRONG_ENDPOINT = ('HTTP 404: {"error": {"message": "This is not a chat model and thus not '
+                  'supported in the v1/chat/completions endpoint. Did you mean to use v1/completions?"}}')
+
+
+class EndpointProbeTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.formats = fallback_memory.ModelMemory(Path(tmp.name) / "endpoint_formats.json")
+        patcher = mock.patch.object(endpoint_probe, "FORMATS", self.formats)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_only_endpoint_mismatches_are_unsupported(self):
+        self.assertTrue(endpoint_probe.is_unsupported_endpoint(WRONG_ENDPOINT))
+        self.assertTrue(endpoint_probe.is_unsupported_endpoint(
+            "HTTP 400: This model is only supported in v1/responses and not in v1/chat/completions."))
+        self.assertFalse(endpoint_probe.is_unsupported_endpoint(
+            "HTTP 404: The model `gpt-5.4` does not exist or you do not have access to it."))
+        self.assertFalse(endpoint_probe.is_unsupported_endpoint("HTTP 500: not a chat model"))
+        self.assertFalse(endpoint_probe.is_unsupported_endpoint(None))
+
+    def test_candidates_put_remembered_endpoint_first(self):
+        self.assertEqual(endpoint_probe.candidates("openai", "gpt-9", "openai_responses"),
+                         ["openai_responses", "openai", "openai_completion"])
+        self.formats.record("openai", "gpt-9", "openai_completion")
+        self.assertEqual(endpoint_probe.candidates("openai", "gpt-10", "openai_responses"),
+                         ["openai_completion", "openai_responses", "openai"])
+        self.assertEqual(endpoint_probe.candidates("qwen", "qwen3-max", "qwen"), ["qwen"])
+
+    async def run_evaluation(self, accepts):
+        calls = []
+
+        async def fake_evaluate(provider, model, session=None):
+            calls.append(provider)
+            results = evaluate_model.new_results(provider, model)
+            if provider != accepts:
+                results['api_error'] = WRONG_ENDPOINT
+            return results
+
+        with mock.patch.object(evaluate_model, "evaluate_model_async", fake_evaluate), \
+                mock.patch.object(evaluate_model, "save_evaluation"), \
+                mock.patch.object(evaluate_model, "record_metrics"):
+            results = await evaluate_model.run_evaluation_async("openai", "babbage-9")
+        return results, calls
+
+    async def test_wrong_guess_is_probed_and_remembered(self):
+        results, calls = await self.run_evaluation("openai_completion")
+
+        self.assertEqual(calls, ["openai", "openai_responses", "openai_completion"])
+        self.assertEqual(results['endpoint_probe'], ["openai", "openai_responses"])
+        self.assertIsNone(results['api_error'])
+
+        _, calls = await self.run_evaluation("openai_completion")
+        self.assertEqual(calls, ["openai_completion"])
+
+    async def test_no_endpoint_works(self):
+        results, calls = await self.run_evaluation(None)
+
+        self.assertEqual(len(calls), 3)
+        self.assertIsNone(results['endpoint_probe'])
+        self.assertIsNone(self.formats.lookup("openai", "babbage-9"))
+
+
+if __name__ == "__main__":
+    unittest.main()
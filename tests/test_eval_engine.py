@@ -0,0 +1,57 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import eval_engine
+
+
+class RunEvaluationsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrency_is_bounded_per_provider_and_globally(self):
+        running = {"total": 0, "peak": 0}
+        per_provider = {}
+
+        async def fake_run(provider, model, session=None):
+            running["total"] += 1
+            per_provider[provider] = per_provider.get(provider, 0) + 1
+            running["peak"] = max(running["peak"], running["total"])
+            self.assertLessEqual(per_provider[provider], eval_engine.provider_limit(provider))
+            await asyncio.sleep(0.01)
+            running["total"] -= 1
+            per_provider[provider] -= 1
+            return {"provider": provider, "model": model}
+
+        jobs = [("mistral", f"m{i}") for i in range(10)] + [("openai", f"o{i}") for i in range(10)]
+        with mock.patch.object(eval_engine, "run_evaluation_async", fake_run):
+            results = await eval_engine.run_evaluations(jobs, concurrency=5)
+
+        self.assertEqual(sorted(r["model"] for r in results), sorted(m for _, m in jobs))
+        self.assertLessEqual(running["peak"], 5)
+
+    async def test_failures_are_skipped_and_streamed_results_not_collected(self):
+        seen = []
+        errors = []
+
+        async def fake_run(provider, model, session=None):
+            if model == "bad":
+                raise RuntimeError("boom")
+            return {"provider": provider, "model": model}
+
+        with mock.patch.object(eval_engine, "run_evaluation_async", fake_run):
+            results = await eval_engine.run_evaluations(
+                [("openai", "good"), ("openai", "bad")],
+                on_result=lambda provider, model, results: seen.append(model),
+                on_error=lambda provider, model, error: errors.append((model, str(error))),
+                collect=False)
+
+        self.assertEqual(results, [])
+        self.assertEqual(seen, ["good"])
+        self.assertEqual(errors, [("bad", "boom")])
+
+
+if __name__ == "__main__":
+    unittest.main()
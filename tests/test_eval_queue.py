@@ -0,0 +1,115 @@
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import eval_queue
+
+
+class EvalQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "queue.sqlite3"
+        self.conn = eval_queue.connect(self.path)
+        self.addCleanup(self.conn.close)
+
+    def test_enqueue_is_idempotent(self):
+        self.assertEqual(eval_queue.enqueue(self.conn, [("openai", "a"), ("openai", "b")]), 2)
+        self.assertEqual(eval_queue.enqueue(self.conn, [("openai", "a")]), 0)
+        self.assertEqual(eval_queue.counts(self.conn), {"pending": 2})
+
+    def test_leases_are_exclusive_across_connections(self):
+        eval_queue.enqueue(self.conn, [("openai", "a"), ("openai", "b"), ("openai", "c")])
+        other = eval_queue.connect(self.path)
+        self.addCleanup(other.close)
+
+        first = eval_queue.lease(self.conn, "w1", limit=2)
+        second = eval_queue.lease(other, "w2", limit=2)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse(set(first) & set(second))
+
+    def test_expired_lease_is_reclaimed(self):
+        eval_queue.enqueue(self.conn, [("openai", "a")])
+        eval_queue.lease(self.conn, "crashed", lease_seconds=-1)
+
+        self.assertEqual(eval_queue.lease(self.conn, "w2"), [("openai", "a")])
+        self.assertFalse(eval_queue.complete(self.conn, "openai", "a", "crashed"))
+        self.assertTrue(eval_queue.complete(self.conn, "openai", "a", "w2"))
+        self.assertEqual(eval_queue.counts(self.conn), {"done": 1})
+
+    def test_expired_lease_out_of_attempts_fails(self):
+        eval_queue.enqueue(self.conn, [("openai", "a")], max_attempts=2)
+        eval_queue.lease(self.conn, "crashed", lease_seconds=-1)
+        eval_queue.lease(self.conn, "crashed again", lease_seconds=-1)
+
+        self.assertEqual(eval_queue.lease(self.conn, "w"), [])
+        self.assertEqual(eval_queue.counts(self.conn), {"failed": 1})
+
+    def test_failures_retry_until_out_of_attempts(self):
+        eval_queue.enqueue(self.conn, [("openai", "a")], max_attempts=2)
+
+        eval_queue.lease(self.conn, "w")
+        self.assertEqual(eval_queue.fail(self.conn, "openai", "a", "w", "HTTP 503", backoff=0), "pending")
+        eval_queue.lease(self.conn, "w")
+        self.assertEqual(eval_queue.fail(self.conn, "openai", "a", "w", "HTTP 503", backoff=0), "failed")
+        self.assertEqual(eval_queue.lease(self.conn, "w"), [])
+
+    def test_retries_back_off_exponentially(self):
+        eval_queue.enqueue(self.conn, [("openai", "a")], max_attempts=3)
+
+        eval_queue.lease(self.conn, "w")
+        eval_queue.fail(self.conn, "openai", "a", "w", "HTTP 429")
+        self.assertEqual(eval_queue.lease(self.conn, "w"), [])
+        self.assertAlmostEqual(eval_queue.next_retry_in(self.conn), eval_queue.RETRY_BACKOFF_SECONDS, delta=1)
+
+        self.conn.execute("UPDATE jobs SET not_before = 0")
+        eval_queue.lease(self.conn, "w")
+        eval_queue.fail(self.conn, "openai", "a", "w", "HTTP 429")
+        self.assertAlmostEqual(eval_queue.next_retry_in(self.conn), 2 * eval_queue.RETRY_BACKOFF_SECONDS,
+                               delta=1)
+
+    def test_lease_skips_excluded_providers(self):
+        eval_queue.enqueue(self.conn, [("kimi", "a"), ("qwen", "b")])
+
+        self.assertEqual(eval_queue.lease(self.conn, "w", limit=2, exclude=["kimi"]), [("qwen", "b")])
+
+    def test_drain_completes_and_retries(self):
+        eval_queue.enqueue(self.conn, [("openai", "ok"), ("openai", "flaky")], max_attempts=2)
+        calls = []
+
+        async def fake_job(session, provider, model):
+            calls.append(model)
+            return {"api_error": "HTTP 503: busy" if model == "flaky" else None}, None
+
+        with mock.patch.object(eval_queue, "evaluate_job", fake_job), \
+                mock.patch.object(eval_queue, "RETRY_BACKOFF_SECONDS", 0.05):
+            result = eval_queue.drain(self.conn, worker_id="w", concurrency=4)
+
+        self.assertEqual(result, {"done": 1, "failed": 1})
+        self.assertEqual(sorted(calls), ["flaky", "flaky", "ok"])
+
+    def test_drain_refills_slots_as_jobs_finish(self):
+        eval_queue.enqueue(self.conn, [("openai", "slow"), ("openai", "a"), ("openai", "b")])
+        order = []
+
+        async def fake_job(session, provider, model):
+            await asyncio.sleep(0.2 if model == "slow" else 0.01)
+            order.append(model)
+            return {}, None
+
+        with mock.patch.object(eval_queue, "evaluate_job", fake_job):
+            eval_queue.drain(self.conn, worker_id="w", concurrency=2)
+
+        # "b" started when "a" finished rather than waiting for "slow"
+        self.assertEqual(order, ["a", "b", "slow"])
+
+if __name__ == "__main__":
+    unittest.main()
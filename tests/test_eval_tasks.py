@@ -0,0 +1,42 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import eval_tasks
+
+
+class EvalTaskTests(unittest.TestCase):
+    def test_reference_solutions_pass_their_validators(self):
+        for task in eval_tasks.list_tasks():
+            for args in task.cases():
+                with self.subTest(task=task.name, args=args):
+                    passed, _ = task.validate(args, task.reference(*args))
+                    self.assertTrue(passed)
+
+    def test_prompts_share_the_fallback_opening(self):
+        for task in eval_tasks.list_tasks():
+            self.assertTrue(task.prompt.startswith(eval_tasks.PROMPT_OPENING))
+            self.assertIn(f"def {task.entry_point}(", task.prompt)
+
+    def test_solve_grid_reference_and_validator(self):
+        self.assertEqual(eval_tasks.solve_grid_reference(eval_tasks.TEST_GRID), (60, 'DDXRR'))
+        passed, detail = eval_tasks.validate_solve_grid((eval_tasks.TEST_GRID,), [58, 'RRRDDD'])
+        self.assertFalse(passed)
+        self.assertEqual(detail['path_error'], "Move 3 must be diagonal (X) but was R")
+        passed, detail = eval_tasks.validate_solve_grid((eval_tasks.TEST_GRID,), 60)
+        self.assertFalse(passed)
+
+    def test_selected_tasks(self):
+        with mock.patch.dict(os.environ, {'MODELS_EVAL_TASKS': ''}):
+            self.assertEqual([t.name for t in eval_tasks.selected_tasks()], ['solve_grid'])
+        with mock.patch.dict(os.environ, {'MODELS_EVAL_TASKS': 'solve_grid, edit_distance,nope'}):
+            self.assertEqual([t.name for t in eval_tasks.selected_tasks()],
+                             ['solve_grid', 'edit_distance'])
+
+
+if __name__ == '__main__':
+    unittest.main()
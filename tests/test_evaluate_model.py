@@ -0,0 +1,441 @@
+import asyncio
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import evaluate_model
+import fallback_memory
+import latency_stats
+
+
+def scripted_post(*outcomes):
+    """Fake ``_post_and_extract_async`` returning ``outcomes`` in order."""
+    calls = []
+
+    async def fake(session, url, headers, body, provider, timeout=None, usage=None):
+        calls.append(body)
+        return outcomes[len(calls) - 1]
+
+    return fake, calls
+
+
+async def no_throttle(provider):
+    pass
+
+
+class CallModelTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = fallback_memory.FallbackStore(Path(tmp.name) / "fallback_tiers.json")
+        self.latency = latency_stats.LatencyStats(Path(tmp.name) / "latency_stats.json")
+        for patcher in (mock.patch.object(fallback_memory, "STORE", self.store),
+                        mock.patch.object(latency_stats, "STORE", self.latency)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def call(self, provider, *outcomes, model="m", **options):
+        fake, calls = scripted_post(*outcomes)
+        with mock.patch.object(evaluate_model, "_post_and_extract_async", fake), \
+                mock.patch.object(evaluate_model, "throttle", no_throttle):
+            result = await evaluate_model.call_model_async(
+                provider, model, evaluate_model.EVAL_PROMPT, session=object(), **options)
+        return result, calls
+
+    async def test_clean_success_has_no_meta(self):
+        result, calls = await self.call("openai", ("ok", 1.0, None, None))
+
+        self.assertEqual(result, ("ok", 1.0, None, None))
+        self.assertEqual(len(calls), 1)
+
+    async def test_non_anthropic_refusal_does_not_escalate(self):
+        result, calls = await self.call("openai", (None, 1.0, "refused", "refusal"))
+
+        self.assertEqual(result, (None, 1.0, "refused", None))
+        self.assertEqual(len(calls), 1)
+
+    async def test_anthropic_system_fallback(self):
+        result, calls = await self.call(
+            "anthropic",
+            (None, 1.0, "refused", "refusal"),
+            ("ok", 2.0, None, "end_turn"),
+        )
+
+        self.assertEqual(result, ("ok", 3.0, None, {"fallback_used": "anthropic_refusal_system"}))
+        self.assertEqual(calls[1]["system"], evaluate_model.ANTHROPIC_REFUSAL_FALLBACK_SYSTEM)
+
+    async def test_anthropic_reframe_fallback(self):
+        result, calls = await self.call(
+            "anthropic",
+            (None, 1.0, "refused", "refusal"),
+            (None, 1.0, "refused", "refusal"),
+            ("ok", 1.0, None, "end_turn"),
+        )
+
+        self.assertEqual(result[3], {"fallback_used": "anthropic_refusal_prompt_reframe"})
+        self.assertTrue(calls[2]["messages"][0]["content"].startswith("Implement the following"))
+
+    async def test_anthropic_fallback_failure_is_reported(self):
+        result, _ = await self.call(
+            "anthropic",
+            (None, 1.0, "refused", "refusal"),
+            (None, 1.0, "HTTP 500: boom", None),
+        )
+
+        self.assertEqual(result, (None, 2.0, "HTTP 500: boom",
+                                  {"fallback_used": "anthropic_refusal_system", "fallback_failed": True}))
+
+    async def test_remembered_tier_is_used_for_related_models(self):
+        await self.call(
+            "anthropic",
+            (None, 1.0, "refused", "refusal"),
+            (None, 1.0, "refused", "refusal"),
+            ("ok", 1.0, None, "end_turn"),
+            model="claude-opus-5",
+        )
+
+        result, calls = await self.call("anthropic", ("ok", 1.0, None, "end_turn"),
+                                        model="claude-opus-5-1-20261001")
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(calls[0]["messages"][0]["content"].startswith("Implement the following"))
+        self.assertEqual(result[3], {"fallback_used": "anthropic_refusal_prompt_reframe",
+                                     "fallback_skipped": 2})
+
+    async def test_stale_remembered_tier_retries_the_bare_prompt(self):
+        self.store.record("anthropic", "claude-opus-5", "anthropic_refusal_prompt_reframe")
+        self.store._load()["recorded"]["anthropic/claude-opus"] -= (fallback_memory.MAX_AGE_DAYS + 1) * 86400
+
+        result, calls = await self.call("anthropic", ("ok", 1.0, None, "end_turn"), model="claude-opus-6")
+
+        self.assertEqual((len(calls), result[3]), (1, None))
+        # The bare prompt answered, so the family is back at tier 0
+        self.assertIsNone(self.store.lookup("anthropic", "claude-opus-7"))
+
+    async def test_remembered_tier_still_escalates_on_refusal(self):
+        self.store.record("anthropic", "m", "anthropic_refusal_system")
+
+        result, calls = await self.call(
+            "anthropic",
+            (None, 1.0, "refused", "refusal"),
+            ("ok", 1.0, None, "end_turn"),
+        )
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(result[3]["fallback_used"], "anthropic_refusal_prompt_reframe")
+        self.assertEqual(self.store.lookup("anthropic", "m"), "anthropic_refusal_prompt_reframe")
+
+    async def test_single_tier_providers_are_not_remembered(self):
+        await self.call("openai", ("ok", 1.0, None, None))
+
+        self.assertFalse(self.store.path.exists())
+
+    async def test_answered_and_timed_out_calls_feed_latency_history(self):
+        await self.call("openai", ("ok", 4.0, None, None))
+        await self.call("openai", (None, 40.0, "Request timed out (40s)", None))
+        await self.call("openai", (None, 1.0, "HTTP 500: boom", None))
+
+        self.assertEqual(self.latency._load()["openai"], [4.0, 40.0])
+
+    async def test_reasoning_level_calls_leave_the_stores_alone(self):
+        await self.call("openai", ("ok", 90.0, None, None), reasoning="high")
+        await self.call("anthropic", (None, 1.0, "refused", "refusal"), ("ok", 2.0, None, "end_turn"),
+                        reasoning="high")
+
+        self.assertFalse(self.latency.path.exists())
+        self.assertFalse(self.store.path.exists())
+        self.assertEqual(evaluate_model.timeout_budget("openai", "m", "high")["read"],
+                         latency_stats.CEILING)
+
+
+class HedgeTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.latency = latency_stats.LatencyStats(Path(tmp.name) / "latency_stats.json")
+        self.latency._data = {"openai": [0.05] * latency_stats.MIN_SAMPLES}
+        for patcher in (mock.patch.object(evaluate_model, "HEDGE_PROVIDERS", {"openai"}),
+                        mock.patch.object(evaluate_model, "throttle", no_throttle),
+                        mock.patch.object(latency_stats, "STORE", self.latency),
+                        mock.patch.object(latency_stats.LatencyStats, "observe", lambda *a: None)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def call(self, *delays):
+        started, cancelled = [], []
+
+        async def fake(session, url, headers, body, provider, timeout=None, usage=None):
+            index = len(started)
+            started.append(index)
+            try:
+                await asyncio.sleep(delays[index])
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+            return f"answer {index}", delays[index], None, None
+
+        with mock.patch.object(evaluate_model, "_post_and_extract_async", fake):
+            result = await evaluate_model.call_model_async(
+                "openai", "m", evaluate_model.EVAL_PROMPT, session=object())
+        return result, started, cancelled
+
+    async def test_fast_original_is_not_hedged(self):
+        (text, _, _, meta), started, _ = await self.call(0.0)
+
+        self.assertEqual((text, meta, started), ("answer 0", None, [0]))
+
+    async def test_hedge_wins_and_original_is_cancelled(self):
+        (text, elapsed, _, meta), started, cancelled = await self.call(5.0, 0.0)
+
+        self.assertEqual(text, "answer 1")
+        self.assertEqual(cancelled, [0])
+        self.assertEqual(meta["hedge"]["winner"], "hedge")
+        self.assertEqual(meta["hedge"]["delay"], 0.05)
+        self.assertLess(elapsed, 1.0)
+
+    async def test_original_can_still_win_after_hedging(self):
+        (text, _, _, meta), _, cancelled = await self.call(0.1, 5.0)
+
+        self.assertEqual(text, "answer 0")
+        self.assertEqual(cancelled, [1])
+        self.assertEqual(meta["hedge"], {"delay": 0.05, "winner": "original"})
+
+    async def test_unlisted_provider_is_not_hedged(self):
+        with mock.patch.object(evaluate_model, "HEDGE_PROVIDERS", set()):
+            (text, _, _, meta), started, _ = await self.call(0.2, 0.0)
+
+        self.assertEqual((text, meta, started), ("answer 0", None, [0]))
+
+
+class FakeStreamResponse:
+    def __init__(self, lines, status=200):
+        self.status = status
+        self.lines = lines
+        self.read = 0
+        self.closed = False
+
+    @property
+    def content(self):
+        return self._iter()
+
+    async def _iter(self):
+        for line in self.lines:
+            self.read += 1
+            yield line
+
+    async def text(self):
+        return "error body"
+
+    def close(self):
+        self.closed = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.bodies = []
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        self.bodies.append(json)
+        return self.response
+
+
+def anthropic_events(*chunks):
+    lines = [b'event: message_start\n', b'data: {"type": "message_start"}\n', b'\n']
+    for chunk in chunks:
+        event = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": chunk}}
+        lines += [b'data: ' + json.dumps(event).encode() + b'\n', b'\n']
+    return lines
+
+
+class EarlyStopTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        store = fallback_memory.FallbackStore(Path(tmp.name) / "fallback_tiers.json")
+        latency = latency_stats.LatencyStats(Path(tmp.name) / "latency_stats.json")
+        for patcher in (mock.patch.object(evaluate_model, "EARLY_STOP", True),
+                        mock.patch.object(evaluate_model, "throttle", no_throttle),
+                        mock.patch.object(fallback_memory, "STORE", store),
+                        mock.patch.object(latency_stats, "STORE", latency)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def call(self, response, provider="openai"):
+        session = FakeSession(response)
+        result = await evaluate_model.call_model_async(
+            provider, "m", evaluate_model.EVAL_PROMPT, session=session, entry_point="solve_grid")
+        return result, session
+
+    def test_complete_solution_needs_closed_compiling_block(self):
+        self.assertFalse(evaluate_model.complete_solution("```python\ndef solve_grid(g):\n", "solve_grid"))
+        self.assertFalse(evaluate_model.complete_solution("```python\ndef solve_grid(g):\n```", "solve_grid"))
+        self.assertFalse(evaluate_model.complete_solution("```python\ndef other(g):\n    pass\n```", "solve_grid"))
+        self.assertTrue(evaluate_model.complete_solution("```python\ndef solve_grid(g):\n    pass\n```", "solve_grid"))
+
+    async def test_hangs_up_after_the_solution_block(self):
+        response = FakeStreamResponse(anthropic_events(
+            "Here:\n```python\ndef solve_grid(grid):\n", "    return 1, 'D'\n``", "`\n",
+            "Explanation that never needs to arrive.", "More."))
+
+        (text, _, error, meta), session = await self.call(response, provider="anthropic")
+
+        self.assertIsNone(error)
+        self.assertTrue(session.bodies[0]["stream"])
+        self.assertTrue(response.closed)
+        self.assertTrue(text.endswith("```\n"))
+        self.assertEqual(meta["early_stop"]["offset"], len(text))
+        self.assertLess(response.read, len(response.lines))
+
+    async def test_openai_stream_without_solution_reads_to_done(self):
+        deltas = [{"choices": [{"delta": {"content": part}}]} for part in ("no ", "code")]
+        lines = [b'data: ' + json.dumps(d).encode() + b'\n' for d in deltas] + [b'data: [DONE]\n']
+        response = FakeStreamResponse(lines)
+
+        (text, _, error, meta), _ = await self.call(response)
+
+        self.assertEqual((text, error, meta), ("no code", None, None))
+        self.assertFalse(response.closed)
+
+    async def test_stream_http_error(self):
+        (text, _, error, meta), _ = await self.call(FakeStreamResponse([], status=500))
+
+        self.assertIsNone(text)
+        self.assertEqual(error, "HTTP 500: error body")
+
+    async def test_first_evaluation_estimates_savings_from_latency_history(self):
+        latency_stats.STORE._data = {"openai": [30.0, 40.0, 50.0, 60.0, 70.0]}
+
+        async def fake_task(task, provider, model, session, reasoning):
+            results = evaluate_model.new_results(provider, model)
+            results.update(score=1.0, response_time=8.0, early_stop={'offset': 90})
+            return results
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(evaluate_model, "EVAL_DIR", Path(tmp)), \
+                mock.patch.object(evaluate_model, "evaluate_task_async", fake_task), \
+                mock.patch.dict('os.environ', {'MODELS_EVAL_TASKS': 'solve_grid'}):
+            results = await evaluate_model.evaluate_model_async("openai", "m", session=object())
+
+        self.assertEqual(results['early_stop'], {'offset': 90, 'estimated_baseline': 50.0, 'saved': 42.0})
+
+    def test_previous_response_time_prefers_carried_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(evaluate_model, "EVAL_DIR", Path(tmp)):
+            path = Path(tmp) / evaluate_model.eval_filename("m")
+            self.assertIsNone(evaluate_model.previous_response_time("m"))
+            path.write_text("Model: m\n\n=== TIMING ===\nResponse time: 40.0s\n")
+            self.assertEqual(evaluate_model.previous_response_time("m"), 40.0)
+            path.write_text("=== TIMING ===\nResponse time: 5.0s\nEarly stop: truncated at 90 chars\n"
+                            "Baseline response time: 40.0s\n")
+            self.assertEqual(evaluate_model.previous_response_time("m"), 40.0)
+
+
+GOOD = "def solve_grid(grid):\n    return 1, 'D'"
+BROKEN = "def solve_grid(grid):\n    return (1"
+
+
+class ExtractCodeTest(unittest.TestCase):
+    def test_direct_code(self):
+        self.assertEqual(evaluate_model.extract_code(GOOD), (GOOD, 'direct'))
+
+    def test_prefers_last_compiling_block(self):
+        draft = GOOD.replace('1', '2')
+        response = f"Draft:\n```python\n{draft}\n```\nFinal:\n```python\n{GOOD}\n```\n"
+        self.assertEqual(evaluate_model.extract_code(response), (GOOD, 'markdown_python'))
+
+    def test_compiling_block_beats_later_broken_block(self):
+        response = f"```py\n{GOOD}\n```\nor\n```python\n{BROKEN}\n```"
+        self.assertEqual(evaluate_model.extract_code(response), (GOOD, 'markdown_python'))
+
+    def test_generic_and_unterminated_blocks(self):
+        self.assertEqual(evaluate_model.extract_code(f"```\n{GOOD}\n```"), (GOOD, 'markdown_generic'))
+        self.assertEqual(evaluate_model.extract_code(f"Here:\n```python\n{GOOD}\n"),
+                         (GOOD, 'markdown_python'))
+
+    def test_broken_code_is_tagged(self):
+        self.assertEqual(evaluate_model.extract_code(f"```python\n{BROKEN}\n```"),
+                         (BROKEN, 'markdown_python_syntax_error'))
+        self.assertEqual(evaluate_model.extract_code("no code here"), (None, 'extraction_failed'))
+
+
+class ExecuteCodeTest(unittest.IsolatedAsyncioTestCase):
+    async def test_execute_code_returns_result(self):
+        code = "def solve_grid(grid):\n    print('noise')\n    return (1, 'X')\n"
+
+        usage = {}
+
+        result, error = await evaluate_model.execute_code_async(code, [[1]], usage=usage)
+
+        self.assertIsNone(error)
+        self.assertEqual(result, [1, "X"])
+        self.assertGreater(usage['peak_rss_mb'], 0)
+        self.assertGreaterEqual(usage['cpu_seconds'], 0)
+
+    async def test_execute_code_blocks_disallowed_imports(self):
+        code = "def solve_grid(grid):\n    import socket\n    return (1, 'X')\n"
+
+        result, error = await evaluate_model.execute_code_async(code, [[1]])
+
+        self.assertIsNone(result)
+        self.assertEqual(error, "import of 'socket' is not allowed in the sandbox")
+
+    async def test_execute_code_caps_memory_and_hides_environment(self):
+        code = "def solve_grid(grid):\n    return len(bytearray(2 << 30)), 'X'\n"
+        result, error = await evaluate_model.execute_code_async(code, [[1]])
+        self.assertEqual(error, "MemoryError")
+
+        code = "def solve_grid(grid):\n    return sys.modules['os'].environ.get('OPENAI_API_KEY'), 'X'\n"
+        with mock.patch.dict('os.environ', {'OPENAI_API_KEY': 'secret'}):
+            result, error = await evaluate_model.execute_code_async(code, [[1]])
+        self.assertEqual(result, [None, 'X'])
+
+    async def test_execute_code_times_out(self):
+        code = "def solve_grid(grid):\n    while True:\n        pass\n"
+
+        result, error = await evaluate_model.execute_code_async(code, [[1]], timeout=1)
+
+        self.assertIsNone(result)
+        self.assertEqual(error, "Execution timed out (1s)")
+
+
+class EvaluateModelTest(unittest.IsolatedAsyncioTestCase):
+    async def test_runs_every_selected_task(self):
+        solutions = {
+            'solve_grid': "```python\ndef solve_grid(grid):\n    return 60, 'DDXRR'\n```",
+            'edit_distance': "```python\ndef edit_distance(a, b):\n    return 3\n```",
+        }
+
+        async def fake_call(provider, model, prompt, session=None, **options):
+            name = 'solve_grid' if 'def solve_grid' in prompt else 'edit_distance'
+            return solutions[name], 1.0, None, None
+
+        with mock.patch.object(evaluate_model, 'call_model_async', fake_call), \
+                mock.patch.dict('os.environ', {'MODELS_EVAL_TASKS': 'solve_grid,edit_distance'}):
+            results = await evaluate_model.evaluate_model_async("p", "m", session=object())
+
+        self.assertTrue(results['path_valid'])
+        self.assertTrue(results['sum_matches'])
+        self.assertEqual(results['cases_passed'], 1)
+        self.assertEqual(results['cases_total'], 4)
+        self.assertEqual(len(results['perf']), 3)
+        other, = results['task_results']
+        self.assertEqual((other['task'], other['cases_passed'], other['cases_total']),
+                         ('edit_distance', 2, 5))
+        self.assertEqual(results['score'], round((0.25 + 0.4) / 2, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import latency_stats
+
+
+class LatencyStatsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "latency_stats.json"
+        self.stats = latency_stats.LatencyStats(self.path)
+
+    def test_no_history_uses_the_ceiling(self):
+        self.assertEqual(self.stats.timeout_for("openai", "gpt-5"),
+                         {"connect": latency_stats.CONNECT_TIMEOUT, "read": latency_stats.CEILING})
+
+    def test_budget_is_p99_times_factor_within_bounds(self):
+        for seconds in (20, 22, 25, 30, 41):
+            self.stats.observe("qwen", "qwen3-max", seconds)
+        self.assertEqual(self.stats.timeout_for("qwen", "qwen3-max-2026-01-01")["read"], 82)
+
+        for seconds in (1, 1, 2, 2, 3):
+            self.stats.observe("groq", "llama-4", seconds)
+        self.assertEqual(self.stats.timeout_for("groq", "llama-4")["read"], latency_stats.FLOOR)
+
+    def test_sparse_family_falls_back_to_provider_history(self):
+        for seconds in (10, 10, 10, 10, 10):
+            self.stats.observe("openai", "gpt-5", seconds)
+        self.stats.observe("openai", "o4", 100)
+
+        self.assertEqual(self.stats.quantile("openai", "o4", 99), 100)
+        self.assertIsNone(self.stats.quantile("anthropic", "claude-opus-5", 99))
+
+    def test_history_is_bounded_and_persisted(self):
+        for seconds in range(latency_stats.WINDOW + 10):
+            self.stats.observe("openai", "gpt-5", seconds)
+
+        reloaded = latency_stats.LatencyStats(self.path)
+        samples = reloaded.samples("openai", "gpt-5")
+        self.assertEqual(len(samples), latency_stats.WINDOW)
+        self.assertEqual(samples[0], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
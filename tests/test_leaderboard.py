@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import leaderboard
+
+
+def eval_text(model, provider, seconds, execution, extra=""):
+    return (f"Model: {model}\nProvider: {provider}\nEvaluated: 2026-05-01T00:00:00+00:00\n\n"
+            f"=== TIMING ===\nResponse time: {seconds}s\n\n{extra}"
+            f"=== EXECUTION ===\n{execution}\n\n"
+            "=== RAW RESPONSE ===\nPath valid: YES\nAPI Error: not a header\n")
+
+
+PASS = "Returned sum: 60\nCalculated sum: 60\nSum matches: YES\nPath valid: YES"
+FAIL = "Returned sum: 61\nCalculated sum: 60\nSum matches: NO\nPath valid: YES"
+
+
+class LeaderboardTests(unittest.TestCase):
+    def test_parse_eval_statuses(self):
+        row = leaderboard.parse_eval(eval_text("m", "gemini", 2.5, PASS))
+        self.assertEqual((row['model'], row['status'], row['response_time'], row['evaluated']),
+                         ("m", 'pass', 2.5, '2026-05-01'))
+        self.assertEqual(leaderboard.parse_eval(eval_text("m", "p", 1, FAIL))['status'], 'fail')
+        self.assertEqual(leaderboard.parse_eval(eval_text("m", "p", 0, "API Error: HTTP 404"))['status'],
+                         'api_error')
+        skipped = eval_text("m", "p", 0, "Skipped: model not evaluated",
+                            "=== SKIPPED ===\nReason: embedding model\n\n")
+        self.assertEqual(leaderboard.parse_eval(skipped)['status'], 'skipped')
+        tasks = eval_text("m", "p", 1, PASS + "\n\n=== TASKS ===\nsolve_grid: 3/4 cases (score 0.75)")
+        self.assertEqual(leaderboard.parse_eval(tasks)['score'], 0.75)
+
+    def test_ranking_correctness_then_latency(self):
+        rows = [leaderboard.parse_eval(eval_text(m, "gemini", t, body))
+                for m, t, body in [("slow", 9, PASS), ("wrong", 1, FAIL), ("fast", 2, PASS)]]
+        group = leaderboard.group_by_provider(rows)['gemini']
+        self.assertEqual([r['model'] for r in group], ["fast", "slow", "wrong"])
+        self.assertEqual([r['model'] for r in leaderboard.fastest_passing(rows, 1)], ["fast"])
+        markdown = leaderboard.render_markdown(rows, top=1)
+        self.assertIn("| 1 | fast | Gemini | ✅ pass | 2.0s |", markdown)
+
+    def test_rows_group_under_their_listing_provider(self):
+        rows = [leaderboard.parse_eval(eval_text(m, p, 1, PASS)) for m, p in [
+            ("gpt-4.1", "openai"), ("gpt-5.5", "openai_responses"), ("davinci-002", "openai_completion"),
+            ("nvidia/nemotron-3", "openrouter"), ("z-ai/glm-5.3", "openrouter")]]
+
+        groups = leaderboard.group_by_provider(rows)
+
+        self.assertEqual({name: [r['model'] for r in group] for name, group in groups.items()},
+                         {"nvidia": ["nvidia/nemotron-3"], "openai": ["davinci-002", "gpt-4.1", "gpt-5.5"],
+                          "zai": ["z-ai/glm-5.3"]})
+        self.assertIn("| nvidia/nemotron-3 | NVIDIA |", leaderboard.render_markdown(rows, top=5))
+
+    def test_collect_rows_only_reparses_changed_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            eval_dir = Path(tmp)
+            (eval_dir / "eval-a.txt").write_text(eval_text("a", "p", 1, PASS))
+            (eval_dir / "eval-b.txt").write_text(eval_text("b", "p", 1, FAIL))
+            rows, cache, parsed = leaderboard.collect_rows(eval_dir)
+            self.assertEqual(parsed, 2)
+
+            # Touched but identical content (e.g. fresh checkout): hash hit
+            os.utime(eval_dir / "eval-a.txt", ns=(1, 1))
+            (eval_dir / "eval-b.txt").write_text(eval_text("b", "p", 1, PASS))
+            rows, cache, parsed = leaderboard.collect_rows(eval_dir, cache)
+            self.assertEqual(parsed, 1)
+            self.assertEqual([r['status'] for r in rows], ['pass', 'pass'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import metrics
+from evaluate_model import eval_outcome
+
+
+class MetricsTests(unittest.TestCase):
+    def test_counter_and_gauge_render_with_labels(self):
+        counter = metrics.Counter('t_requests_total', "Requests")
+        counter.inc(provider='openai', code=200)
+        counter.inc(2, provider='openai', code=200)
+        counter.inc(provider='gem"ini', code=429)
+        gauge = metrics.Gauge('t_listed', "Listed")
+        gauge.set(12, provider='openai')
+
+        lines = counter.render() + gauge.render()
+        self.assertIn('# TYPE t_requests_total counter', lines)
+        self.assertIn('t_requests_total{code="200",provider="openai"} 3', lines)
+        self.assertIn('t_requests_total{code="429",provider="gem\\"ini"} 1', lines)
+        self.assertIn('t_listed{provider="openai"} 12', lines)
+
+    def test_histogram_buckets_are_cumulative(self):
+        hist = metrics.Histogram('t_seconds', "Latency", (1, 5))
+        for value in (0.5, 3, 30):
+            hist.observe(value, provider='x')
+
+        lines = hist.render()
+        self.assertIn('t_seconds_bucket{provider="x",le="1"} 1', lines)
+        self.assertIn('t_seconds_bucket{provider="x",le="5"} 2', lines)
+        self.assertIn('t_seconds_bucket{provider="x",le="+Inf"} 3', lines)
+        self.assertIn('t_seconds_sum{provider="x"} 33.5', lines)
+        self.assertIn('t_seconds_count{provider="x"} 3', lines)
+
+    def test_write_textfile_only_when_configured(self):
+        os.environ.pop('MODELS_METRICS_FILE', None)
+        self.assertIsNone(metrics.write_textfile())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'models.prom'
+            metrics.MODELS_ADDED.inc(1, provider='test')
+            self.assertEqual(metrics.write_textfile(path), Path(tmp) / 'models-update_models.prom')
+            metrics.write_textfile(path, job='backfill')
+            text = (Path(tmp) / 'models-update_models.prom').read_text()
+            self.assertEqual(sorted(os.listdir(tmp)),
+                             ['models-backfill.prom', 'models-update_models.prom'])
+        self.assertIn('models_added_total{provider="test",job="update_models"}', text)
+        self.assertIn('models_last_run_timestamp_seconds{job="update_models"}', text)
+
+    def test_eval_outcome(self):
+        self.assertEqual(eval_outcome({'skip_reason': 'embedding'}), 'skipped')
+        self.assertEqual(eval_outcome({'api_error': 'HTTP 500'}), 'api_error')
+        self.assertEqual(eval_outcome({'path_valid': True, 'sum_matches': True}), 'pass')
+        self.assertEqual(eval_outcome({'path_valid': True, 'sum_matches': False}), 'fail')
+
+
+if __name__ == '__main__':
+    unittest.main()
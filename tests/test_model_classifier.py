@@ -0,0 +1,42 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model_classifier import EVAL_CODING, EVAL_SKIP, classify_model
+
+
+class ClassifyModelTest(unittest.TestCase):
+    def test_name_rules_skip_non_chat_models(self):
+        for model in ("mistral-embed-dim128-2510", "grok-imagine-video", "models/embedding-001",
+                      "mistral-ocr-latest", "qwen3-tts-instruct-flash", "gpt-realtime-2",
+                      "models/veo-3.0-generate-001", "gpt-image-2"):
+            with self.subTest(model=model):
+                self.assertEqual(classify_model(model)[0], EVAL_SKIP)
+
+    def test_chat_models_are_routed_to_coding_eval(self):
+        for model in ("claude-opus-5", "models/gemini-3-pro-image", "z-ai/glm-5.3",
+                      "gpt-5.5", "mistral-medium-3.5", "voxtral-mini-2507"):
+            with self.subTest(model=model):
+                self.assertEqual(classify_model(model), (EVAL_CODING, "default: chat-capable"))
+
+    def test_metadata_overrides_name(self):
+        eval_type, reason = classify_model("mystery-model", {
+            "id": "mystery-model",
+            "output_modalities": ["image"],
+        })
+        self.assertEqual(eval_type, EVAL_SKIP)
+        self.assertIn("no text output", reason)
+
+        eval_type, reason = classify_model("models/new-thing", {
+            "id": "models/new-thing",
+            "capabilities": ["embedContent", "countTokens"],
+        })
+        self.assertEqual(eval_type, EVAL_SKIP)
+        self.assertIn("no generateContent", reason)
+
+
+if __name__ == "__main__":
+    unittest.main()
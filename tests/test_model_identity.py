@@ -0,0 +1,105 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import evaluate_model
+import leaderboard
+from model_identity import IdentityIndex, canonical_name, undated_name
+
+PASSING = (
+    "Model: {model}\nProvider: openrouter\nEvaluated: 2026-05-01T00:00:00+00:00\n\n"
+    "=== TIMING ===\nResponse time: 4.2s\n\n"
+    "=== EXECUTION ===\nSum matches: YES\nPath valid: YES\n\n"
+    "=== RAW RESPONSE ===\n{response}\n\n=== EXTRACTED CODE ===\ncode\n"
+)
+
+
+class CanonicalNameTests(unittest.TestCase):
+    def test_aliases_fold_together(self):
+        for alias in ('z-ai/glm-5.3', 'ZHIPU/GLM-5.3', 'glm-5-3', 'glm_5.3', 'glm-5.3-latest'):
+            with self.subTest(alias=alias):
+                self.assertEqual(canonical_name(alias), 'glm-5-3')
+        self.assertEqual(canonical_name('models/gemini-3.5-flash'), 'gemini-3-5-flash')
+
+    def test_snapshots_keep_their_date(self):
+        self.assertEqual(canonical_name('glm-5.3-2026-01-01'), 'glm-5-3-2026-01-01')
+        self.assertEqual(undated_name(canonical_name('glm-5.3-20260101')), 'glm-5-3')
+        self.assertNotEqual(canonical_name('gpt-4o-2024-05-13'), canonical_name('gpt-4o-2024-08-06'))
+
+    def test_distinct_models_stay_apart(self):
+        self.assertNotEqual(canonical_name('gpt-5.4-mini'), canonical_name('gpt-5.4'))
+        self.assertNotEqual(canonical_name('glm-5.3'), canonical_name('glm-5.3-air'))
+
+
+class IdentityIndexTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.eval_dir = Path(tmp.name)
+        (self.eval_dir / "eval-z-ai_glm-5.3.txt").write_text(
+            PASSING.format(model="z-ai/glm-5.3", response="same answer"))
+        (self.eval_dir / "eval-kimi-k3.txt").write_text(
+            PASSING.format(model="kimi-k3", response="same   answer"))
+
+    def test_representative_and_fingerprints(self):
+        index = IdentityIndex.build(self.eval_dir)
+        self.assertEqual(index.representative("ZHIPU/GLM-5.3"), ("z-ai/glm-5.3", "eval-z-ai_glm-5.3.txt"))
+        self.assertIsNone(index.representative("z-ai/glm-5.3"))
+        self.assertIsNone(index.representative("moonshot/kimi-k3-turbo"))
+
+        index = IdentityIndex.build(self.eval_dir, fingerprints=True)
+        self.assertEqual(index.group("kimi-k3"), index.group("glm-5.3"))
+
+    def test_claim_defers_later_aliases(self):
+        index = IdentityIndex.build(self.eval_dir)
+        self.assertTrue(index.claim("openai", "gpt-5.4-2026-03-05"))
+        self.assertFalse(index.claim("openai", "gpt-5.4"))
+        self.assertTrue(index.claim("openai", "gpt-5.4-mini"))
+        self.assertEqual(index.deferred, [("openai", "gpt-5.4")])
+
+    def test_snapshots_only_fold_into_their_undated_alias(self):
+        (self.eval_dir / "eval-gpt-4o-2024-05-13.txt").write_text(
+            PASSING.format(model="gpt-4o-2024-05-13", response="old"))
+        (self.eval_dir / "eval-gpt-4o-2024-08-06.txt").write_text(
+            PASSING.format(model="gpt-4o-2024-08-06", response="new"))
+        index = IdentityIndex.build(self.eval_dir)
+
+        self.assertIsNone(index.representative("gpt-4o-2024-11-20"))
+        self.assertEqual(index.representative("gpt-4o")[0], "gpt-4o-2024-08-06")
+        self.assertEqual(index.representative("gpt-4o-latest")[0], "gpt-4o-2024-08-06")
+
+        self.assertEqual(index.group("gpt-4o-2024-11-20"), index.group("gpt-4o"))
+
+    def test_new_snapshot_is_not_linked_to_its_undated_sibling(self):
+        (self.eval_dir / "eval-gpt-5.5.txt").write_text(PASSING.format(model="gpt-5.5", response="x"))
+        index = IdentityIndex.build(self.eval_dir)
+
+        self.assertIsNone(index.representative("gpt-5.5-2026-11-01"))
+        self.assertTrue(index.claim("openai", "gpt-5.5-2026-11-01"))
+        self.assertEqual(index.representative("gpt-5.5-latest")[0], "gpt-5.5")
+
+    def test_claim_keeps_distinct_snapshots(self):
+        index = IdentityIndex.build(self.eval_dir)
+        self.assertTrue(index.claim("openai", "gpt-4o-2024-08-06"))
+        self.assertTrue(index.claim("openai", "gpt-4o-2024-11-20"))
+        self.assertFalse(index.claim("openai", "gpt-4o-latest"))
+        self.assertEqual(index.deferred, [("openai", "gpt-4o-latest")])
+
+    def test_link_evaluation_copies_result(self):
+        with mock.patch.object(evaluate_model, 'EVAL_DIR', self.eval_dir):
+            path = evaluate_model.link_evaluation("qwen", "ZHIPU/GLM-5.3", "z-ai/glm-5.3",
+                                                  "eval-z-ai_glm-5.3.txt")
+        row = leaderboard.parse_eval(Path(path).read_text())
+        self.assertEqual((row['model'], row['provider'], row['status'], row['linked_to']),
+                         ("ZHIPU/GLM-5.3", "qwen", "pass", "z-ai/glm-5.3"))
+        # Linked files never become representatives themselves
+        index = IdentityIndex.build(self.eval_dir)
+        self.assertEqual(index.representatives['glm-5-3'][0], "z-ai/glm-5.3")
+
+
+if __name__ == '__main__':
+    unittest.main()
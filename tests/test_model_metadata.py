@@ -0,0 +1,58 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import model_metadata
+
+
+class NormalizeRecordTest(unittest.TestCase):
+    def test_normalize_record_openrouter(self):
+        record = model_metadata.normalize_record({
+            "id": "z-ai/glm-5.3",
+            "name": "Z.AI: GLM 5.3",
+            "created": 1780000000,
+            "context_length": 202752,
+            "architecture": {"input_modalities": ["text"], "output_modalities": ["text"]},
+            "pricing": {"prompt": "0.0000006", "completion": "0.0000022", "request": "0"},
+            "top_provider": {"max_completion_tokens": 131072},
+        }, "id")
+
+        self.assertEqual(record, {
+            "id": "z-ai/glm-5.3",
+            "name": "Z.AI: GLM 5.3",
+            "created": "2026-05-28",
+            "context_window": 202752,
+            "max_output_tokens": 131072,
+            "input_modalities": ["text"],
+            "output_modalities": ["text"],
+            "pricing": {"prompt": 0.0000006, "completion": 0.0000022, "request": 0.0},
+        })
+
+    def test_normalize_record_gemini_uses_name_as_id(self):
+        record = model_metadata.normalize_record({
+            "name": "models/embedding-001",
+            "displayName": "Embedding 001",
+            "inputTokenLimit": 2048,
+            "outputTokenLimit": 1,
+            "supportedGenerationMethods": ["embedContent"],
+        }, "name")
+
+        self.assertEqual(record, {
+            "id": "models/embedding-001",
+            "name": "Embedding 001",
+            "context_window": 2048,
+            "max_output_tokens": 1,
+            "capabilities": ["embedContent"],
+        })
+
+    def test_format_metadata_is_sorted_and_compact(self):
+        text = model_metadata.format_metadata({"b": {"id": "b"}, "a": {"id": "a", "created": "2026-01-01"}})
+
+        self.assertEqual(text, '{"created":"2026-01-01","id":"a"}\n{"id":"b"}\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pagination
+
+
+def fake_response(data):
+    response = mock.Mock(content=b"x" * 10)
+    response.json.return_value = data
+    return response
+
+
+class PaginationTest(unittest.TestCase):
+    def test_page_token_follows_next_token(self):
+        pages = {
+            None: {"models": [{"name": "a"}], "nextPageToken": "t1"},
+            "t1": {"models": [{"name": "b"}]},
+        }
+        calls = []
+
+        def get(url, params):
+            calls.append(dict(params))
+            return fake_response(pages[params.get("pageToken")])
+
+        result, size = pagination.fetch_pages(get, "u", {"strategy": "page_token", "page_size": 5})
+
+        self.assertEqual([p["models"][0]["name"] for p in result], ["a", "b"])
+        self.assertEqual(size, 20)
+        self.assertEqual(calls, [{"pageSize": 5}, {"pageSize": 5, "pageToken": "t1"}])
+
+    def test_after_id_stops_when_has_more_is_false(self):
+        pages = {
+            None: {"data": [{"id": "a"}], "has_more": True, "last_id": "a"},
+            "a": {"data": [{"id": "b"}], "has_more": False, "last_id": "b"},
+        }
+
+        def get(url, params):
+            return fake_response(pages[params.get("after_id")])
+
+        result, _ = pagination.fetch_pages(get, "u", {"strategy": "after_id"})
+
+        self.assertEqual(len(result), 2)
+
+    def test_offset_fetches_pages_concurrently_until_short_page(self):
+        lock = threading.Lock()
+        offsets = []
+
+        def get(url, params):
+            with lock:
+                offsets.append(params["offset"])
+            count = 2 if params["offset"] < 4 else 1
+            return fake_response({"data": [{"id": i} for i in range(count)]})
+
+        result, _ = pagination.fetch_pages(
+            get, "u", {"strategy": "offset", "page_size": 2, "concurrency": 3})
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(sorted(offsets), [0, 2, 4])
+
+    def test_runaway_cursor_raises(self):
+        def get(url, params):
+            return fake_response({"nextPageToken": "again"})
+
+        with self.assertRaises(RuntimeError):
+            pagination.fetch_pages(get, "u", {"strategy": "page_token", "max_pages": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import provider_registry
+
+
+class ProviderRegistryTest(unittest.TestCase):
+    def test_registry_is_loaded_once(self):
+        self.assertIs(provider_registry.load_registry(), provider_registry.load_registry())
+        provider = provider_registry.get_provider("grok")
+        self.assertIs(provider.chat_endpoint(), provider.chat_endpoint())
+
+    def test_list_only_providers_point_at_chat_provider(self):
+        nvidia = provider_registry.get_provider("nvidia")
+
+        self.assertIsNone(nvidia.chat_endpoint())
+        self.assertEqual(nvidia.list_config()["chat_provider"], "openrouter")
+        self.assertEqual(nvidia.list_config()["filter_prefix"], "nvidia/")
+
+    def test_auth_schemes(self):
+        with mock.patch.dict("os.environ", {"GEMINI_API_KEY": "g", "ANTHROPIC_API_KEY": "a"}):
+            gemini = provider_registry.get_provider("gemini")
+            anthropic = provider_registry.get_provider("anthropic")
+
+            self.assertEqual(gemini.auth_headers(), {})
+            self.assertEqual(
+                gemini.chat_endpoint()["url"]("models/gemini-3-pro"),
+                "https://generativelanguage.googleapis.com/v1beta/models/gemini-3-pro:generateContent?key=g",
+            )
+            self.assertEqual(anthropic.auth_headers(), {"anthropic-version": "2023-06-01", "x-api-key": "a"})
+
+    def test_multiple_api_keys_from_env_and_key_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".keys", delete=False) as f:
+            f.write("# spare keys\nk3\n\nk1\n")
+        self.addCleanup(Path(f.name).unlink)
+        qwen = provider_registry.get_provider("qwen")
+
+        with mock.patch.dict("os.environ", {"DASHSCOPE_API_KEY": "k1, k2",
+                                            "DASHSCOPE_API_KEY_FILE": f.name}):
+            self.assertEqual(qwen.api_keys(), ["k1", "k2", "k3"])
+            self.assertEqual(qwen.api_key(), "k1")
+            self.assertEqual(qwen.chat_endpoint()["headers"]("k3")["Authorization"], "Bearer k3")
+            self.assertEqual(qwen.chat_endpoint()["headers"]()["Authorization"], "Bearer k1")
+
+    def test_list_providers_follow_readme_order(self):
+        names = [p.display_name for p in provider_registry.list_providers()]
+
+        self.assertEqual(names[:3], ["OpenAI", "Anthropic", "Gemini"])
+        self.assertEqual(names[-2:], ["NVIDIA", "Z.AI"])
+
+
+if __name__ == "__main__":
+    unittest.main()
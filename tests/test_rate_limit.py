@@ -0,0 +1,78 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import rate_limit
+
+
+class KeyPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def test_no_keys_falls_back_to_the_provider_limiter(self):
+        pool = rate_limit.KeyPool("p", [], None)
+
+        self.assertIsNone(await pool.acquire())
+
+    async def test_requests_spread_across_keys(self):
+        pool = rate_limit.KeyPool("p", ["key-aaaa", "key-bbbb"], 600)
+
+        picked = [await pool.acquire() for _ in range(4)]
+
+        self.assertEqual(sorted(picked), ["key-aaaa", "key-aaaa", "key-bbbb", "key-bbbb"])
+        self.assertEqual([share for _, _, share, _ in pool.usage()], [0.5, 0.5])
+
+    async def test_rate_limited_key_cools_down(self):
+        pool = rate_limit.KeyPool("p", ["key-aaaa", "key-bbbb"], None)
+        pool.report("key-aaaa", "HTTP 429: slow down")
+        pool.report("key-bbbb", "HTTP 500: boom")
+
+        picked = {await pool.acquire() for _ in range(3)}
+
+        self.assertEqual(picked, {"key-bbbb"})
+        self.assertEqual([(label, limited) for label, _, _, limited in pool.usage()],
+                         [("...aaaa", 1), ("...bbbb", 0)])
+
+    async def test_all_keys_cooling_waits_for_the_first_to_recover(self):
+        pool = rate_limit.KeyPool("p", ["key-aaaa"], None)
+        pool.report("key-aaaa", "HTTP 429: slow down")
+        pool.keys[0].cooldown_until = time.monotonic() + 0.05
+
+        start = time.monotonic()
+        self.assertEqual(await pool.acquire(), "key-aaaa")
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    async def test_providers_sharing_an_env_var_share_one_pool(self):
+        env = {"OPENAI_API_KEY": "key-aaaa,key-bbbb", "OPENROUTER_API_KEY": "key-cccc"}
+        with mock.patch.dict("os.environ", env), \
+                mock.patch.object(rate_limit, "_pools", {}), \
+                mock.patch.object(rate_limit, "_provider_limiters", {}):
+            self.assertIs(rate_limit.pool_for("openai"), rate_limit.pool_for("openai_responses"))
+            rate_limit.report("openai_completion", "key-aaaa", "HTTP 429: slow down")
+            picked = {await rate_limit.throttle("openai_responses") for _ in range(2)}
+
+            # nvidia is held to its own 30/min inside OpenRouter's 60/min pool
+            self.assertEqual(rate_limit.pool_for("nvidia").limiter.interval, 1.0)
+            self.assertIsNone(rate_limit._provider_limiter("openrouter"))
+            self.assertEqual(rate_limit._provider_limiter("nvidia").interval, 2.0)
+
+        self.assertEqual(picked, {"key-bbbb"})
+
+    def test_usage_report_lists_multi_key_providers_only(self):
+        pools = {"a": rate_limit.KeyPool("a", ["key-1111", "key-2222"], None),
+                 "b": rate_limit.KeyPool("b", ["key-3333"], None)}
+        pools["a"].keys[0].requests = 3
+        pools["a"].keys[1].requests = 1
+
+        with mock.patch.object(rate_limit, "_pools", pools):
+            lines = rate_limit.key_usage_lines()
+
+        self.assertEqual(lines, ["API key usage for a:",
+                                 "  ...1111: 3 requests (75%), 0 rate-limited",
+                                 "  ...2222: 1 requests (25%), 0 rate-limited"])
+
+
+if __name__ == "__main__":
+    unittest.main()
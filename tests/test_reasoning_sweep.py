@@ -0,0 +1,78 @@
+import argparse
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import evaluate_model
+import reasoning_sweep
+
+
+class RequestBodyTest(unittest.TestCase):
+    def test_reasoning_level_per_format(self):
+        build = evaluate_model.build_request_body
+        prompt = evaluate_model.EVAL_PROMPT
+
+        self.assertEqual(build("openai", "o9", prompt, "low")["reasoning_effort"], "low")
+        self.assertEqual(build("openai_responses", "gpt-9", prompt, "high")["reasoning"], {"effort": "high"})
+        self.assertEqual(build("anthropic", "claude", prompt, "medium")["thinking"],
+                         {"type": "enabled", "budget_tokens": 8192})
+        self.assertEqual(build("gemini", "gemini-3", prompt, "low")["generationConfig"],
+                         {"thinkingConfig": {"thinkingBudget": 2048}})
+        self.assertNotIn("reasoning_effort", build("openai", "o9", prompt))
+
+    def test_anthropic_reframe_keeps_the_thinking_budget(self):
+        body = evaluate_model.build_request_body("anthropic", "claude", evaluate_model.EVAL_PROMPT, "low")
+
+        tiers = evaluate_model.fallback_tiers("anthropic", "claude", evaluate_model.EVAL_PROMPT, body)
+
+        self.assertEqual(tiers[-1][1]["thinking"], body["thinking"])
+
+    def test_extract_usage(self):
+        extract = evaluate_model.extract_usage
+        self.assertEqual(
+            extract("openai", {"usage": {"prompt_tokens": 10, "completion_tokens": 50,
+                                         "completion_tokens_details": {"reasoning_tokens": 30}}}),
+            {"input_tokens": 10, "output_tokens": 50, "reasoning_tokens": 30})
+        self.assertEqual(
+            extract("anthropic", {"usage": {"input_tokens": 10, "output_tokens": 50}}),
+            {"input_tokens": 10, "output_tokens": 50, "reasoning_tokens": None})
+        self.assertEqual(
+            extract("gemini", {"usageMetadata": {"promptTokenCount": 10, "candidatesTokenCount": 5,
+                                                 "thoughtsTokenCount": 40}}),
+            {"input_tokens": 10, "output_tokens": 5, "reasoning_tokens": 40})
+
+
+class SweepTest(unittest.IsolatedAsyncioTestCase):
+    def test_parse_levels(self):
+        self.assertEqual(reasoning_sweep.parse_levels("default, low,high"), [None, "low", "high"])
+        with self.assertRaises(argparse.ArgumentTypeError):
+            reasoning_sweep.parse_levels("max")
+
+    async def test_sweep_reports_every_level(self):
+        async def fake_evaluate(provider, model, session=None, reasoning=None):
+            results = evaluate_model.new_results(provider, model)
+            results['reasoning'] = reasoning
+            results['response_time'] = {None: 9.0, 'low': 3.0, 'high': 20.0}[reasoning]
+            passed = reasoning != 'low'
+            results.update(path_valid=passed, sum_matches=passed, score=1.0 if passed else 0.0,
+                           usage={'input_tokens': 100, 'output_tokens': 900, 'reasoning_tokens': None})
+            return results
+
+        with mock.patch.object(reasoning_sweep, "evaluate_model_async", fake_evaluate):
+            rows = await reasoning_sweep.sweep_async("anthropic", "claude-x", [None, "low", "high"],
+                                                     session=object())
+
+        report = reasoning_sweep.render_report("anthropic", "claude-x", rows)
+        self.assertEqual([level for level, _ in rows], [None, "low", "high"])
+        self.assertIn("| default | pass | 1.00 | 9.0s | 100 | 900 | – |", report)
+        self.assertIn("| low | fail | 0.00 | 3.0s |", report)
+        self.assertIn("Fastest passing level: default", report)
+        self.assertEqual(reasoning_sweep.report_filename("models/gemini-3"), "sweep-models_gemini-3.md")
+
+
+if __name__ == "__main__":
+    unittest.main()
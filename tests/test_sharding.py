@@ -0,0 +1,110 @@
+import argparse
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import eval_queue
+import sharding
+
+
+def eval_text(model, evaluated, body="Path valid: YES\nSum matches: YES\n", provider="openai"):
+    return f"Model: {model}\nProvider: {provider}\nEvaluated: {evaluated}\n\n{body}"
+
+
+class ShardTest(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(sharding.parse_shard("2/4"), (2, 4))
+        for bad in ("0/4", "5/4", "4", "a/b", "1/0"):
+            with self.subTest(bad=bad), self.assertRaises(argparse.ArgumentTypeError):
+                sharding.parse_shard(bad)
+
+    def test_shards_partition_jobs_stably(self):
+        keys = [f"openai/model-{i}" for i in range(200)]
+        shards = [[key for key in keys if sharding.in_shard(key, (i, 3))] for i in (1, 2, 3)]
+
+        self.assertEqual(sorted(sum(shards, [])), sorted(keys))
+        self.assertTrue(all(shards))
+        # SHA-1 based, so the assignment never changes between processes
+        self.assertEqual(sharding.shard_of("openai/gpt-5", 4), sharding.shard_of("openai/gpt-5", 4))
+        self.assertTrue(sharding.in_shard("anything", None))
+
+
+class MergeTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.local = self.root / "evals"
+        self.shard = self.root / "shard1"
+        self.local.mkdir()
+        self.shard.mkdir()
+
+    def test_merge_evals_resolves_conflicts(self):
+        (self.shard / "eval-new.txt").write_text(eval_text("new", "2026-10-02"))
+        # A real evaluation beats a linked placeholder, even an older one
+        (self.local / "eval-linked.txt").write_text(
+            eval_text("linked", "2026-10-03", "=== LINKED ===\nLinked to: other\n"))
+        (self.shard / "eval-linked.txt").write_text(eval_text("linked", "2026-10-01"))
+        # Otherwise the newer evaluation wins
+        (self.local / "eval-newer.txt").write_text(eval_text("newer", "2026-10-05"))
+        (self.shard / "eval-newer.txt").write_text(eval_text("newer", "2026-10-04"))
+
+        summary = sharding.merge_evals([self.shard], self.local)
+
+        self.assertEqual((summary["added"], summary["replaced"], summary["kept"]), (1, 1, 1))
+        self.assertEqual(sorted(summary["jobs"]), [("openai", "linked"), ("openai", "new")])
+        self.assertIn("2026-10-01", (self.local / "eval-linked.txt").read_text())
+        self.assertIn("2026-10-05", (self.local / "eval-newer.txt").read_text())
+
+    def test_openai_endpoint_evals_map_back_to_queued_jobs(self):
+        conn = eval_queue.connect(self.root / "queue.sqlite3")
+        self.addCleanup(conn.close)
+        eval_queue.enqueue(conn, [("openai", "gpt-9"), ("openai", "davinci-9")])
+        (self.shard / "eval-gpt-9.txt").write_text(
+            eval_text("gpt-9", "2026-10-02", provider="openai_responses"))
+        (self.shard / "eval-davinci-9.txt").write_text(
+            eval_text("davinci-9", "2026-10-02", provider="openai_completion"))
+
+        summary = sharding.merge_evals([self.shard], self.local)
+
+        self.assertEqual(sorted(summary["jobs"]), [("openai", "davinci-9"), ("openai", "gpt-9")])
+        self.assertEqual(eval_queue.mark_done(conn, summary["jobs"]), 2)
+
+    def test_merge_stores_folds_in_every_store(self):
+        (self.local / "latency_stats.json").write_text(json.dumps({"qwen": [1, 2, 3]}))
+        (self.shard / "latency_stats.json").write_text(json.dumps({"qwen": [2, 3, 9], "kimi": [4]}))
+        (self.shard / "fallback_tiers.json").write_text(
+            json.dumps({"models": {"anthropic/m": "anthropic_refusal_system"}, "families": {}}))
+        (self.local / "endpoint_formats.json").write_text(
+            json.dumps({"models": {"openai/gpt-8": "openai"}, "families": {"openai/gpt": "openai"}}))
+        (self.shard / "endpoint_formats.json").write_text(
+            json.dumps({"models": {"openai/gpt-9": "openai_responses"},
+                        "families": {"openai/gpt": "openai_responses"}}))
+
+        sharding.merge_stores([self.shard], self.local)
+
+        latency = json.loads((self.local / "latency_stats.json").read_text())
+        self.assertEqual(latency, {"qwen": [1, 2, 3, 9], "kimi": [4]})
+        tiers = json.loads((self.local / "fallback_tiers.json").read_text())
+        self.assertEqual(tiers["models"], {"anthropic/m": "anthropic_refusal_system"})
+        formats = json.loads((self.local / "endpoint_formats.json").read_text())
+        self.assertEqual(formats, {"models": {"openai/gpt-8": "openai", "openai/gpt-9": "openai_responses"},
+                                   "families": {"openai/gpt": "openai_responses"}})
+
+    def test_merged_jobs_are_marked_done_in_the_queue(self):
+        conn = eval_queue.connect(self.root / "queue.sqlite3")
+        self.addCleanup(conn.close)
+        eval_queue.enqueue(conn, [("openai", "a"), ("openai", "b"), ("openai", "c")])
+        eval_queue.lease(conn, "w", limit=1)
+
+        self.assertEqual(eval_queue.mark_done(conn, [("openai", "a"), ("openai", "b")]), 1)
+        self.assertEqual(eval_queue.counts(conn), {"leased": 1, "done": 1, "pending": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from static_checks import analyze
+
+
+class AnalyzeTests(unittest.TestCase):
+    def test_plain_solution_passes(self):
+        code = (
+            "def solve_grid(grid):\n"
+            "    for row in grid:\n"
+            "        for cell in row:\n"
+            "            pass\n"
+            "    return 0, ''\n"
+        )
+        report = analyze(code)
+        self.assertIsNone(report['fatal'])
+        self.assertEqual(report['loop_depth'], 2)
+
+    def test_missing_or_wrong_signature(self):
+        self.assertIn('not defined', analyze("def solve(grid):\n    pass\n")['fatal'])
+        self.assertIn('requires 2', analyze("def solve_grid(grid, n):\n    pass\n")['fatal'])
+        self.assertIsNone(analyze("def solve_grid(grid, memo=None):\n    pass\n")['fatal'])
+
+    def test_forbidden_imports_and_calls(self):
+        self.assertEqual(analyze("import requests\ndef solve_grid(g):\n    pass\n")['fatal'],
+                         "forbidden import: requests")
+        self.assertEqual(analyze("from urllib.request import urlopen\ndef solve_grid(g):\n    pass\n")['fatal'],
+                         "forbidden import: urllib.request")
+        self.assertEqual(analyze("def solve_grid(g):\n    return input()\n")['fatal'],
+                         "forbidden call: input()")
+
+    def test_infinite_loop_detection(self):
+        hopeless = "def solve_grid(g):\n    while True:\n        for x in g:\n            break\n"
+        self.assertEqual(analyze(hopeless)['fatal'], "infinite loop at line 2")
+        escapes = "def solve_grid(g):\n    while True:\n        if g:\n            return 1, ''\n"
+        self.assertIsNone(analyze(escapes)['fatal'])
+
+    def test_recursion_is_reported(self):
+        code = ("def solve_grid(g):\n    return walk(0)\n"
+                "def walk(i):\n    return walk(i + 1) if i < 3 else i\n")
+        report = analyze(code)
+        self.assertIsNone(report['fatal'])
+        self.assertEqual(report['recursive'], ['walk'])
+
+
+if __name__ == '__main__':
+    unittest.main()
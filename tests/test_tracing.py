@@ -0,0 +1,50 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import tracing
+
+
+class TracingTests(unittest.TestCase):
+    def setUp(self):
+        tracing._events.clear()
+
+    def test_span_is_noop_when_disabled(self):
+        with mock.patch.dict(os.environ, {}, clear=False):
+            os.environ.pop('MODELS_TRACE_FILE', None)
+            with tracing.span('fetch.request', url='x'):
+                pass
+            self.assertEqual(tracing._events, [])
+            self.assertIsNone(tracing.finish())
+
+    def test_finish_writes_chrome_trace_and_summary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.json')
+            with mock.patch.dict(os.environ, {'MODELS_TRACE_FILE': path}):
+                with tracing.span('git.pull'):
+                    pass
+                for _ in range(2):
+                    with tracing.span('eval.api_call', model='m'):
+                        pass
+                rows = {row[0]: row for row in tracing.summarize()}
+                self.assertEqual(rows['eval.api_call'][1], 2)
+                with mock.patch('builtins.print'):
+                    self.assertEqual(tracing.finish(), path)
+
+            with open(path) as f:
+                trace = json.load(f)
+        events = trace['traceEvents']
+        self.assertEqual([e['name'] for e in events], ['git.pull', 'eval.api_call', 'eval.api_call'])
+        self.assertEqual(events[1]['cat'], 'eval')
+        self.assertEqual(events[1]['args'], {'model': 'm'})
+        self.assertEqual(tracing._events, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
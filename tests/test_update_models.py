@@ -0,0 +1,88 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import update_models
+
+
+class WriteModelsFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(update_models, "MODELS_DIR", Path(self.tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_write_models_file_skips_identical_content(self):
+        self.assertTrue(update_models.write_models_file("x.txt", ["a", "b"]))
+        self.assertFalse(update_models.write_models_file("x.txt", ["a", "b"]))
+        self.assertEqual((Path(self.tmp.name) / "x.txt").read_text(), "a\nb\n")
+
+    def test_write_models_file_leaves_no_temp_files(self):
+        update_models.write_models_file("x.txt", ["a"])
+        update_models.write_models_file("x.txt", ["a", "c"])
+        self.assertEqual(sorted(p.name for p in Path(self.tmp.name).iterdir()), ["x.txt"])
+
+
+class FetchModelsTest(unittest.TestCase):
+    def test_fetch_models_reports_latency_and_payload_size(self):
+        response = mock.Mock(content=b'{"data": [{"id": "b"}, {"id": "a"}]}')
+        response.json.return_value = {"data": [{"id": "b"}, {"id": "a"}]}
+        config = {
+            "url": "https://example.invalid/models",
+            "headers": lambda: {},
+            "json_path": ["data", "id"],
+            "output_file": "x.txt",
+        }
+        stats = {}
+
+        with mock.patch.object(update_models.requests, "get", return_value=response):
+            models = update_models.fetch_models("example", config, stats)
+
+        self.assertEqual(models, ["a", "b"])
+        self.assertEqual(stats["payload_bytes"], len(response.content))
+        self.assertGreaterEqual(stats["fetch_seconds"], 0)
+
+
+class QueueNewModelsTest(unittest.TestCase):
+    def test_linking_can_be_turned_off(self):
+        with mock.patch.object(update_models, "LINK_ALIASES", False), \
+                mock.patch.object(update_models.IdentityIndex, "build") as build, \
+                mock.patch.object(update_models, "read_metadata_file", return_value={}), \
+                mock.patch.object(update_models, "plan_evaluations", return_value=[]) as plan, \
+                mock.patch.object(update_models.eval_queue, "enqueue"):
+            identity = update_models.queue_new_models({"openai": {"gpt-4o-2024-11-20"}}, mock.Mock())
+
+        build.assert_not_called()
+        self.assertIsNone(identity)
+        self.assertIsNone(plan.call_args.args[4])
+
+
+class BuildCommitMessageTest(unittest.TestCase):
+    def test_build_commit_message_lists_adds_and_removes_per_provider(self):
+        message = update_models.build_commit_message({
+            "openai": {"added": ["gpt-new"], "removed": ["gpt-old", "gpt-older"]},
+            "grok": {"added": ["grok-5"], "removed": []},
+        })
+
+        self.assertEqual(
+            message,
+            "Update model lists (openai +1/-2, grok +1/-0)\n"
+            "\n"
+            "openai:\n"
+            "  + gpt-new\n"
+            "  - gpt-old\n"
+            "  - gpt-older\n"
+            "\n"
+            "grok:\n"
+            "  + grok-5\n"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Opt-in span tracing for the update/evaluation pipeline.
+
+Set ``MODELS_TRACE_FILE`` (e.g. in ``.env``) to a path and every ``span``
+is recorded; ``finish()`` then writes a Chrome trace (open it in
+chrome://tracing or https://ui.perfetto.dev) and prints a per-span summary
+table. With the variable unset, ``span`` is a no-op.
+
+Spans from concurrent asyncio tasks are given their own lanes (``tid``) so
+overlapping evaluations render side by side rather than mis-nested.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_events = []
+_lanes = {}
+_origin = time.perf_counter()
+
+
+def enabled() -> bool:
+    return bool(os.getenv('MODELS_TRACE_FILE'))
+
+
+def _lane() -> int:
+    """Small integer lane for the current asyncio task or thread."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    key = ('task', id(task)) if task else ('thread', threading.get_ident())
+    return _lanes.setdefault(key, len(_lanes) + 1)
+
+
+@contextmanager
+def span(name: str, **args):
+    """Record the wall time of the enclosed block as a trace event."""
+    if not enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        _events.append({
+            'name': name,
+            'cat': name.split('.', 1)[0],
+            'ph': 'X',
+            'ts': round((start - _origin) * 1e6),
+            'dur': round((end - start) * 1e6),
+            'pid': os.getpid(),
+            'tid': _lane(),
+            'args': {k: str(v) for k, v in args.items()},
+        })
+
+
+def summarize(events=None) -> list:
+    """Aggregate events into ``[(name, count, total_s, mean_s, max_s), ...]``."""
+    totals = {}
+    for event in _events if events is None else events:
+        durations = totals.setdefault(event['name'], [])
+        durations.append(event['dur'] / 1e6)
+    rows = [(name, len(d), sum(d), sum(d) / len(d), max(d)) for name, d in totals.items()]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def format_summary(rows) -> str:
+    lines = [f"{'span':<28} {'count':>6} {'total s':>9} {'mean s':>8} {'max s':>8}"]
+    for name, count, total, mean, longest in rows:
+        lines.append(f"{name:<28} {count:>6} {total:>9.3f} {mean:>8.3f} {longest:>8.3f}")
+    return '\n'.join(lines)
+
+
+def finish():
+    """Write the Chrome trace and print the summary; no-op when disabled."""
+    if not enabled() or not _events:
+        return None
+    path = os.getenv('MODELS_TRACE_FILE')
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': _events, 'displayTimeUnit': 'ms'}, f)
+    print(f"\nTrace written to {path} ({len(_events)} spans)")
+    print(format_summary(summarize()))
+    _events.clear()
+    return path
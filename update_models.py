@@ -6,11 +6,25 @@ When new models are detected, runs an evaluation prompt on them.
 """
 
 import os
+import json
+import time
 import subprocess
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from dotenv import load_dotenv
-from evaluate_model import run_evaluation
+from atomic_file import atomic_write
+import eval_queue
+from evaluate_model import link_evaluation, skip_evaluation
+from model_classifier import EVAL_SKIP, classify_model
+from model_identity import IdentityIndex, link_deferred
+from model_metadata import format_metadata, metadata_file_for, normalize_record, read_metadata_file
+from pagination import fetch_pages
+from provider_registry import list_providers
+import metrics
+import tracing
+from tracing import span
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,89 +32,16 @@ load_dotenv()
 # Get the models directory (current directory)
 MODELS_DIR = Path(__file__).parent
 
-# Provider configurations
-PROVIDERS = {
-    'openai': {
-        'url': 'https://api.openai.com/v1/models',
-        'headers': lambda: {'Authorization': f"Bearer {os.getenv('OPENAI_API_KEY')}"},
-        'json_path': ['data', 'id'],
-        'output_file': 'openai.txt'
-    },
-    'anthropic': {
-        'url': 'https://api.anthropic.com/v1/models',
-        'headers': lambda: {
-            'x-api-key': os.getenv('ANTHROPIC_API_KEY'),
-            'anthropic-version': '2023-06-01'
-        },
-        'json_path': ['data', 'id'],
-        'output_file': 'anthropic.txt'
-    },
-    'gemini': {
-        'url': f"https://generativelanguage.googleapis.com/v1beta/models?key={os.getenv('GEMINI_API_KEY')}",
-        'headers': lambda: {},
-        'json_path': ['models', 'name'],
-        'output_file': 'gemini.txt'
-    },
-    'grok': {
-        'urls': [
-            'https://api.x.ai/v1/language-models',
-            'https://api.x.ai/v1/embedding-models',
-            'https://api.x.ai/v1/image-generation-models',
-            'https://api.x.ai/v1/video-generation-models'
-        ],
-        'headers': lambda: {'Authorization': f"Bearer {os.getenv('GROK_API_KEY')}"},
-        'json_path': ['models', 'id'],
-        'output_file': 'grok.txt'
-    },
-    'mistral': {
-        'url': 'https://api.mistral.ai/v1/models',
-        'headers': lambda: {'Authorization': f"Bearer {os.getenv('MISTRAL_API_KEY')}"},
-        'json_path': ['data', 'id'],
-        'output_file': 'mistral.txt'
-    },
-    'deepseek': {
-        'url': 'https://api.deepseek.com/models',
-        'headers': lambda: {'Authorization': f"Bearer {os.getenv('DEEPSEEK_API_KEY')}"},
-        'json_path': ['data', 'id'],
-        'output_file': 'deepseek.txt'
-    },
-    'kimi': {
-        'url': 'https://api.moonshot.ai/v1/models',
-        'headers': lambda: {'Authorization': f"Bearer {os.getenv('MOONSHOT_API_KEY')}"},
-        'json_path': ['data', 'id'],
-        'output_file': 'kimi.txt'
-    },
-    'meta': {
-        'url': 'https://api.meta.ai/v1/models',
-        'headers': lambda: {'Authorization': f"Bearer {os.getenv('MODEL_API_KEY')}"},
-        'json_path': ['data', 'id'],
-        'output_file': 'meta.txt'
-    },
-    'qwen': {
-        'url': 'https://dashscope-intl.aliyuncs.com/compatible-mode/v1/models',
-        'headers': lambda: {'Authorization': f"Bearer {os.getenv('DASHSCOPE_API_KEY')}"},
-        'json_path': ['data', 'id'],
-        'output_file': 'qwen.txt'
-    },
-    'nvidia': {
-        'url': 'https://openrouter.ai/api/v1/models',
-        'headers': lambda: {'Authorization': f"Bearer {os.getenv('OPENROUTER_API_KEY')}"},
-        'json_path': ['data', 'id'],
-        'filter_prefix': 'nvidia/',
-        'exclude_variant_suffix': True,
-        'output_file': 'nvidia.txt',
-        'chat_provider': 'openrouter'
-    },
-    'zai': {
-        'url': 'https://openrouter.ai/api/v1/models',
-        'headers': lambda: {'Authorization': f"Bearer {os.getenv('OPENROUTER_API_KEY')}"},
-        'json_path': ['data', 'id'],
-        'filter_prefix': 'z-ai/',
-        'exclude_variant_suffix': True,
-        'output_file': 'zai.txt',
-        'chat_provider': 'openrouter'
-    }
-}
+# Machine-readable summary of the last run (adds/removes, fetch stats)
+CHANGESET_FILE = 'changeset.json'
+
+# Opt-in: also capture normalized per-model metadata (<provider>.meta.jsonl)
+WRITE_METADATA = os.getenv('MODELS_WRITE_METADATA', '').lower() in ('1', 'true', 'yes')
+# Link new aliases of already evaluated models instead of evaluating them
+LINK_ALIASES = os.getenv('MODELS_LINK_ALIASES', 'true').lower() in ('1', 'true', 'yes')
+
+# Provider model-list configurations, derived from providers.json
+PROVIDERS = {provider.name: provider.list_config() for provider in list_providers()}
 
 def is_fine_tuned_model(model_name):
     """Check if a model is a fine-tuned model."""
@@ -127,28 +68,84 @@ def extract_from_json(data, path):
         return extract_from_json(data[path[0]], path[1:])
     return []
 
-def fetch_models(provider_name, config):
-    """Fetch models for a given provider."""
+def extract_records(data, path):
+    """Return the raw objects that ``extract_from_json(data, path)`` reads from.
+
+    Only objects carrying the ``path[-1]`` field are returned, so the result
+    lines up one-to-one with the extracted values.
+    """
+    for key in path[:-1]:
+        if not isinstance(data, dict) or key not in data:
+            return []
+        data = data[key]
+    if not isinstance(data, list):
+        return []
+    return [item for item in data if isinstance(item, dict) and path[-1] in item]
+
+def fetch_models(provider_name, config, stats=None, metadata=None):
+    """Fetch models for a given provider.
+
+    Each URL is paged with the entry's ``pagination`` strategy (see
+    ``pagination.py``); multiple URLs are fetched concurrently.
+
+    When ``stats`` is a dict it is filled with ``fetch_seconds`` (wall time
+    across all URLs), ``payload_bytes`` (total response body size) and
+    ``page_count``.
+    When ``metadata`` is a dict it is filled with ``{model_id: record}`` in
+    the normalized schema from ``model_metadata.normalize_record``.
+    """
     print(f"Fetching models for {provider_name}...")
 
+    if stats is None:
+        stats = {}
+    stats['fetch_seconds'] = 0.0
+    stats['payload_bytes'] = 0
+    stats['page_count'] = 0
+    start_time = time.time()
+
     try:
         headers = config['headers']()
+        auth_params = config['params']() if 'params' in config else {}
 
         # Support both single 'url' and multiple 'urls'
         urls = config.get('urls', [config['url']] if 'url' in config else [])
         all_models = []
 
-        for url in urls:
+        def get(url, params):
             try:
-                response = requests.get(url, headers=headers, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                models = extract_from_json(data, config['json_path'])
-                if models:
-                    all_models.extend(models)
-            except requests.exceptions.RequestException as e:
-                print(f"  Warning: Error fetching from {url}: {e}")
-                continue
+                response = requests.get(url, headers=headers, params={**auth_params, **params}, timeout=30)
+            except requests.exceptions.RequestException:
+                metrics.HTTP_RESPONSES.inc(phase='fetch', provider=provider_name, code='error')
+                raise
+            metrics.HTTP_RESPONSES.inc(phase='fetch', provider=provider_name, code=response.status_code)
+            return response
+
+        with ThreadPoolExecutor(max_workers=max(len(urls), 1)) as executor:
+            futures = [(url, executor.submit(fetch_pages, get, url, config.get('pagination')))
+                       for url in urls]
+
+            for url, future in futures:
+                try:
+                    pages, payload_bytes = future.result()
+                except (requests.exceptions.RequestException, RuntimeError) as e:
+                    print(f"  Warning: Error fetching from {url}: {e}")
+                    continue
+
+                stats['payload_bytes'] += payload_bytes
+                stats['page_count'] += len(pages)
+                with span('fetch.extract', provider=provider_name):
+                    for data in pages:
+                        models = extract_from_json(data, config['json_path'])
+                        if models:
+                            all_models.extend(models)
+                        if metadata is not None:
+                            for item in extract_records(data, config['json_path']):
+                                record = normalize_record(item, config['json_path'][-1])
+                                metadata.setdefault(record['id'], record)
+
+        stats['fetch_seconds'] = round(time.time() - start_time, 3)
+        metrics.FETCH_SECONDS.observe(stats['fetch_seconds'], provider=provider_name)
+        print(f"  Fetched {stats['page_count']} page(s) in {stats['fetch_seconds']}s")
 
         if not all_models:
             print(f"  Warning: No models found for {provider_name}")
@@ -177,6 +174,8 @@ def fetch_models(provider_name, config):
         return all_models
 
     except Exception as e:
+        stats['fetch_seconds'] = round(time.time() - start_time, 3)
+        metrics.FETCH_SECONDS.observe(stats['fetch_seconds'], provider=provider_name)
         print(f"  Unexpected error for {provider_name}: {e}")
         return []
 
@@ -189,34 +188,117 @@ def read_existing_models(output_file):
         return set(line.strip() for line in f if line.strip())
 
 
+def format_models(models):
+    """Render a model list in the on-disk ``.txt`` format."""
+    return ''.join(f"{model}\n" for model in models)
+
+
 def write_models_file(output_file, models):
-    """Write models to a file."""
-    file_path = MODELS_DIR / output_file
-    with open(file_path, 'w') as f:
-        for model in models:
-            f.write(f"{model}\n")
+    """Atomically write models to a file.
+
+    Returns False when the sorted content is byte-identical to what is
+    already on disk, in which case the file is not rewritten.
+    """
+    if not atomic_write(MODELS_DIR / output_file, format_models(models).encode()):
+        print(f"  {output_file} unchanged")
+        return False
     print(f"  Written to {output_file}")
+    return True
+
+
+def write_changeset(changeset):
+    """Write the run's changeset JSON and return its path.
+
+    The file describes the latest run for local consumers (alerting, the
+    README generator); it is git-ignored and never committed, so it is
+    current even on runs that change no model list.
+
+    Schema::
+
+        {
+          "generated_at": "<iso timestamp>",
+          "providers": {
+            "<provider>": {
+              "output_file": "openai.txt",
+              "added": [...], "removed": [...],
+              "model_count": 123,
+              "fetch_seconds": 0.42, "payload_bytes": 18231, "page_count": 1
+            }
+          }
+        }
+    """
+    file_path = MODELS_DIR / CHANGESET_FILE
+    atomic_write(file_path, (json.dumps(changeset, indent=2) + '\n').encode())
+    print(f"Changeset written to {CHANGESET_FILE}")
+    return file_path
+
+def write_metadata(output_file, models, metadata):
+    """Write metadata records for ``models`` next to ``output_file``.
+
+    Returns the metadata path when the file changed, else None.
+    """
+    file_path = MODELS_DIR / metadata_file_for(output_file)
+    records = {m: metadata[m] for m in models if m in metadata}
+    if not atomic_write(file_path, format_metadata(records).encode()):
+        return None
+    print(f"  Written to {file_path.name}")
+    return file_path
+
+
+def build_commit_message(changes):
+    """Build a structured commit message from per-provider model changes.
 
-def git_commit_if_changed(file_path):
-    """Add and commit file if it has content."""
+    ``changes`` maps provider name to ``{'added': [...], 'removed': [...]}``.
+    The subject summarises counts; the body lists every model touched.
+    """
+    summary = ', '.join(
+        f"{provider} +{len(change['added'])}/-{len(change['removed'])}"
+        for provider, change in changes.items()
+    )
+    lines = [f"Update model lists ({summary})"]
+    for provider, change in changes.items():
+        lines.append("")
+        lines.append(f"{provider}:")
+        lines.extend(f"  + {model}" for model in sorted(change['added']))
+        lines.extend(f"  - {model}" for model in sorted(change['removed']))
+    return '\n'.join(lines) + '\n'
+
+
+def run_git(args, check=True):
+    """Run a git subcommand in the models directory (traced as ``git.<cmd>``)."""
+    with span(f"git.{args[0]}"):
+        return subprocess.run(['git', *args], check=check, cwd=MODELS_DIR)
+
+
+def git_commit_changes(file_paths, message):
+    """Stage the given files and record them in a single commit."""
+    if not file_paths:
+        print("No model list changes to commit")
+        return
     try:
-        # Check if file has content
-        if os.path.getsize(file_path) > 0:
-            subprocess.run(['git', 'add', file_path], check=True, cwd=MODELS_DIR)
-            subprocess.run(['git', 'commit', '-am', 'update'], check=False, cwd=MODELS_DIR)
+        run_git(['add', '--', *map(str, file_paths)])
+        run_git(['commit', '-m', message], check=False)
     except Exception as e:
         print(f"  Git error: {e}")
 
-def evaluate_new_models(provider_name, new_models, chat_provider=None):
-    """Evaluate newly detected models.
+def plan_evaluations(provider_name, new_models, chat_provider=None, metadata=None, identity=None):
+    """Route newly detected models and return the ``(provider, model)`` jobs to run.
 
     ``chat_provider`` is the key used to look up the chat endpoint in
     ``evaluate_model.get_chat_endpoint``. Defaults to ``provider_name`` for
     providers whose model-list and chat endpoints share a name; entries that
     proxy through OpenRouter set it explicitly (e.g. ``chat_provider='openrouter'``).
+
+    Each model is first routed through ``model_classifier.classify_model``
+    (using ``metadata`` records when captured); non-chat models are not
+    called and get an eval file recording the skip reason instead.
+
+    With an ``identity`` index (``model_identity.IdentityIndex``), aliases
+    of an already evaluated model are linked to its result, and only one
+    alias per group is evaluated; the rest are deferred on the index.
     """
     if not new_models:
-        return
+        return []
 
     chat_provider = chat_provider or provider_name
 
@@ -224,11 +306,61 @@ def evaluate_new_models(provider_name, new_models, chat_provider=None):
     for model in sorted(new_models):
         print(f"    - {model}")
 
+    metadata = metadata or {}
+    jobs = []
     for model in sorted(new_models):
         try:
-            run_evaluation(chat_provider, model)
+            eval_type, reason = classify_model(model, metadata.get(model))
+            if eval_type == EVAL_SKIP:
+                skip_evaluation(chat_provider, model, reason)
+                continue
+            if identity is not None:
+                found = identity.representative(model)
+                if found:
+                    link_evaluation(chat_provider, model, *found)
+                    continue
+                if not identity.claim(chat_provider, model):
+                    continue
+            jobs.append((chat_provider, model))
         except Exception as e:
             print(f"    Error evaluating {model}: {e}")
+    return jobs
+
+
+def queue_new_models(all_new_models, conn):
+    """Queue new models from every provider in the persistent ``eval_queue``.
+
+    ``all_new_models`` maps provider name to its set of new model IDs. This
+    runs before the updated model lists are committed: once a model is in
+    its ``.txt`` file it is no longer new, so a run that crashed between
+    the two would otherwise never evaluate it.
+    Aliases of already evaluated models (see ``model_identity``) are linked
+    rather than queued, unless ``MODELS_LINK_ALIASES`` is off.
+    Returns the identity index (None when linking is off).
+    """
+    identity = IdentityIndex.build() if LINK_ALIASES else None
+    jobs = []
+    for provider_name, new_models in all_new_models.items():
+        config = PROVIDERS[provider_name]
+        jobs.extend(plan_evaluations(provider_name, new_models, config.get('chat_provider'),
+                                     read_metadata_file(config['output_file']), identity))
+    eval_queue.enqueue(conn, jobs)
+    return identity
+
+
+def evaluate_new_models(conn, identity=None):
+    """Drain the evaluation queue, including jobs left by a crashed run.
+
+    Aliases deferred while queueing (see ``queue_new_models``) are linked
+    afterwards. Returns the number of jobs that were drained.
+    """
+    before = eval_queue.counts(conn)
+    pending = before.get('pending', 0) + before.get('leased', 0)
+    if pending:
+        print(f"Draining {pending} queued evaluation(s)...")
+        print(f"Queue: {eval_queue.drain(conn)}")
+    link_deferred(identity, conn)
+    return pending
 
 
 def main():
@@ -238,12 +370,19 @@ def main():
     # Pull latest changes
     print("Pulling latest changes...")
     try:
-        subprocess.run(['git', 'pull'], check=True, cwd=MODELS_DIR)
+        run_git(['pull'])
     except Exception as e:
         print(f"Git pull error: {e}")
 
     # Track all new models for evaluation
     all_new_models = {}
+    # Per-provider changes and the files they touched, committed together
+    changes = {}
+    changed_files = []
+    changeset = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'providers': {},
+    }
 
     # Process each provider
     for provider_name, config in PROVIDERS.items():
@@ -251,52 +390,82 @@ def main():
         existing_models = read_existing_models(config['output_file'])
 
         # Fetch current models
-        models = fetch_models(provider_name, config)
+        stats = {}
+        metadata = {} if WRITE_METADATA else None
+        models = fetch_models(provider_name, config, stats, metadata)
+        entry = {
+            'output_file': config['output_file'],
+            'added': [],
+            'removed': [],
+            'model_count': len(models),
+            **stats,
+        }
+        changeset['providers'][provider_name] = entry
         if models:
-            # Detect new models
+            # Detect new and removed models
             new_models = set(models) - existing_models
+            removed_models = existing_models - set(models)
+            entry['added'] = sorted(new_models)
+            entry['removed'] = sorted(removed_models)
+            metrics.MODELS_LISTED.set(len(models), provider=provider_name)
+            metrics.MODELS_ADDED.inc(len(new_models), provider=provider_name)
+            metrics.MODELS_REMOVED.inc(len(removed_models), provider=provider_name)
             if new_models:
                 all_new_models[provider_name] = new_models
 
-            write_models_file(config['output_file'], models)
-            git_commit_if_changed(MODELS_DIR / config['output_file'])
-
-    # Evaluate new models
-    if all_new_models:
-        print("\n" + "=" * 50)
-        print("EVALUATING NEW MODELS")
-        print("=" * 50)
-        for provider_name, new_models in all_new_models.items():
-            chat_provider = PROVIDERS[provider_name].get('chat_provider')
-            evaluate_new_models(provider_name, new_models, chat_provider)
-
+            if write_models_file(config['output_file'], models):
+                changed_files.append(MODELS_DIR / config['output_file'])
+                changes[provider_name] = {
+                    'added': entry['added'],
+                    'removed': entry['removed'],
+                }
+
+            if metadata:
+                metadata_path = write_metadata(config['output_file'], models, metadata)
+                if metadata_path:
+                    changed_files.append(metadata_path)
+
+    write_changeset(changeset)
+
+    # Queue before committing the lists, so a crash cannot lose new models
+    conn = eval_queue.connect()
+    identity = queue_new_models(all_new_models, conn)
+
+    # One commit for the whole run instead of one per provider
+    if changed_files:
+        git_commit_changes(changed_files, build_commit_message(changes))
+
+    # Evaluate new models, plus anything left queued by an earlier run
+    print("\n" + "=" * 50)
+    print("EVALUATING NEW MODELS")
+    print("=" * 50)
+    if evaluate_new_models(conn, identity) or all_new_models:
         # Commit evaluation results
         print("\nCommitting evaluation results...")
         try:
             evals_dir = MODELS_DIR / "evals"
             if evals_dir.exists():
-                subprocess.run(['git', 'add', 'evals/'], check=True, cwd=MODELS_DIR)
-                subprocess.run(
-                    ['git', 'commit', '-m', 'Add model evaluation results'],
-                    check=False, cwd=MODELS_DIR
-                )
+                run_git(['add', 'evals/'])
+                run_git(['commit', '-m', 'Add model evaluation results'], check=False)
         except Exception as e:
             print(f"  Git error committing evals: {e}")
 
     # Reset any uncommitted changes
     print("\nResetting uncommitted changes...")
     try:
-        subprocess.run(['git', 'reset', '--hard'], check=True, cwd=MODELS_DIR)
+        run_git(['reset', '--hard'])
     except Exception as e:
         print(f"Git reset error: {e}")
 
     # Push changes
     print("Pushing changes...")
     try:
-        subprocess.run(['git', 'push'], check=True, cwd=MODELS_DIR)
+        run_git(['push'])
     except Exception as e:
         print(f"Git push error: {e}")
 
+    tracing.finish()
+    metrics.write_textfile()
     print("\nDone!")
 
 if __name__ == "__main__":